@@ -8,6 +8,7 @@ from src import (
     ConfigurationManager,
     UpdateManager,
     PopupManager,
+    DatabaseManager,
 )
 from PyQt6.QtWidgets import QApplication
 
@@ -34,6 +35,7 @@ def app():
 
     # Start the event loop and prevent the application from closing when the main window is closed
     app.setQuitOnLastWindowClosed(False)
+    app.aboutToQuit.connect(DatabaseManager.close_connections)
     app.exec()
 
 
@@ -0,0 +1,178 @@
+import threading
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+
+
+class ChangeEvent:
+    """Base class of the changes published on the ChangeBus"""
+
+    __slots__ = ()
+
+    def merge(self, other: "ChangeEvent") -> bool:
+        """Fold a following event into this one, returns False when they cannot be combined"""
+        return False
+
+
+class SnippetsInserted(ChangeEvent):
+    """
+    Snippets were created.
+
+    Attributes:
+        snippets (list): The Snippet listing rows of the new snippets, with their archived flag.
+    """
+
+    __slots__ = ("snippets",)
+
+    def __init__(self, snippets):
+        self.snippets = list(snippets)
+
+    @property
+    def snippet_ids(self) -> list:
+        return [snippet.id for snippet in self.snippets]
+
+    def merge(self, other):
+        if type(other) is not SnippetsInserted:
+            return False
+        self.snippets.extend(other.snippets)
+        return True
+
+
+class SnippetsUpdated(ChangeEvent):
+    """
+    Snippets were edited.
+
+    Attributes:
+        snippets (list): The Snippet listing rows of the snippets after the change.
+        fields (frozenset): The lower case names of the columns that were written.
+    """
+
+    __slots__ = ("snippets", "fields")
+
+    def __init__(self, snippets, fields):
+        self.snippets = list(snippets)
+        self.fields = frozenset(field.lower() for field in fields)
+
+    @property
+    def snippet_ids(self) -> list:
+        return [snippet.id for snippet in self.snippets]
+
+    def merge(self, other):
+        if type(other) is not SnippetsUpdated or other.fields != self.fields:
+            return False
+        self.snippets.extend(other.snippets)
+        return True
+
+
+class SnippetsDeleted(ChangeEvent):
+    """
+    Snippets were deleted.
+
+    Attributes:
+        snippet_ids (list): The ids of the deleted snippets.
+    """
+
+    __slots__ = ("snippet_ids",)
+
+    def __init__(self, snippet_ids):
+        self.snippet_ids = list(snippet_ids)
+
+    def merge(self, other):
+        if type(other) is not SnippetsDeleted:
+            return False
+        self.snippet_ids.extend(other.snippet_ids)
+        return True
+
+
+class SnippetsArchived(ChangeEvent):
+    """
+    Snippets were archived or restored.
+
+    Attributes:
+        snippet_ids (list): The ids of the snippets whose flag changed.
+        archived (bool): The new archived flag.
+    """
+
+    __slots__ = ("snippet_ids", "archived")
+
+    def __init__(self, snippet_ids, archived):
+        self.snippet_ids = list(snippet_ids)
+        self.archived = bool(archived)
+
+    def merge(self, other):
+        if type(other) is not SnippetsArchived or other.archived != self.archived:
+            return False
+        self.snippet_ids.extend(other.snippet_ids)
+        return True
+
+
+class TypeAdded(ChangeEvent):
+    """
+    The first snippet of a type appeared in the active or the archived snippets.
+
+    Attributes:
+        snippet_type (str): The snippet type.
+        archived (bool): Whether the type was added to the archived snippets.
+    """
+
+    __slots__ = ("snippet_type", "archived")
+
+    def __init__(self, snippet_type, archived):
+        self.snippet_type = snippet_type
+        self.archived = bool(archived)
+
+
+class TypeRemoved(ChangeEvent):
+    """
+    The last snippet of a type left the active or the archived snippets.
+
+    Attributes:
+        snippet_type (str): The snippet type.
+        archived (bool): Whether the type was removed from the archived snippets.
+    """
+
+    __slots__ = ("snippet_type", "archived")
+
+    def __init__(self, snippet_type, archived):
+        self.snippet_type = snippet_type
+        self.archived = bool(archived)
+
+
+class ChangeBus(QObject):
+    """
+    Delivers change events to the thread that owns the bus, in batches.
+
+    Events may be published from any thread, normally once the write that caused them has
+    committed. Everything published before the owning event loop gets back to the bus is
+    coalesced, adjacent events of the same kind are merged, and delivered as one list.
+    """
+
+    changed = pyqtSignal(list)
+    _flush_requested = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flush_requested.connect(
+            self.flush, Qt.ConnectionType.QueuedConnection
+        )
+
+    def publish(self, *events: ChangeEvent) -> None:
+        """Queue events for the next batch"""
+        with self._lock:
+            schedule = not self._pending
+            self._pending.extend(events)
+        if schedule and events:
+            self._flush_requested.emit()
+
+    def flush(self) -> None:
+        """Deliver the queued events now"""
+        with self._lock:
+            events, self._pending = self._pending, []
+        if not events:
+            return
+
+        batch = [events[0]]
+        for event in events[1:]:
+            if not batch[-1].merge(event):
+                batch.append(event)
+        self.changed.emit(batch)
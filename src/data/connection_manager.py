@@ -0,0 +1,146 @@
+from contextlib import contextmanager
+from pathlib import Path
+import sqlite3
+import threading
+import logging
+
+
+class ConnectionManager:
+    """
+    Owns the long-lived SQLite connections for a single database file.
+
+    A single writer connection is shared by every thread and serialized with a lock,
+    while each thread lazily receives its own reader connection. The database is put
+    in WAL mode so readers never block on the writer.
+    """
+
+    PRAGMAS = {
+        "synchronous": "NORMAL",
+        "cache_size": -8000,  # ~8MB page cache per connection
+        "mmap_size": 67108864,  # 64MB memory mapped I/O
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+    }
+    CACHED_STATEMENTS = 256
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._write_lock = threading.RLock()
+        self._writer = None
+        self._write_depth = 0
+        self._after_commit = []
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, db_path: Path) -> "ConnectionManager":
+        """Return the shared manager for the database path, creating it on first use."""
+        key = str(Path(db_path).resolve())
+        with cls._instances_lock:
+            manager = cls._instances.get(key)
+            if manager is None:
+                manager = cls(db_path)
+                cls._instances[key] = manager
+            return manager
+
+    @classmethod
+    def close_all(cls) -> None:
+        """
+        Close every connection of every manager, used on application shutdown. The
+        managers stay registered and reconnect on their next use, so the ones held by
+        DatabaseManager instances remain the shared manager of their path.
+        """
+        with cls._instances_lock:
+            managers = list(cls._instances.values())
+        for manager in managers:
+            manager.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection with the tuned pragmas applied"""
+        try:
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                cached_statements=self.CACHED_STATEMENTS,
+            )
+        except sqlite3.Error as e:
+            logging.error(f"Database connection failed: {e}")
+            raise
+
+        conn.execute("PRAGMA journal_mode = WAL")
+        for pragma, value in self.PRAGMAS.items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        return conn
+
+    @contextmanager
+    def writer(self):
+        """
+        Yield the shared writer connection inside a transaction.
+
+        The transaction is committed when the block exits and rolled back on error.
+        Nested use on the same thread joins the outer transaction.
+        """
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+            conn = self._writer
+            if self._write_depth:
+                self._write_depth += 1
+                try:
+                    yield conn
+                finally:
+                    self._write_depth -= 1
+                return
+
+            self._write_depth = 1
+            try:
+                with conn:
+                    yield conn
+            except BaseException:
+                self._after_commit.clear()
+                raise
+            finally:
+                self._write_depth = 0
+            callbacks, self._after_commit = self._after_commit, []
+
+        for callback in callbacks:
+            callback()
+
+    def after_commit(self, callback) -> None:
+        """
+        Run callback once the current write transaction commits, or right away outside one.
+        Callbacks of a transaction that rolls back are dropped.
+        """
+        with self._write_lock:
+            if self._write_depth:
+                self._after_commit.append(callback)
+                return
+        callback()
+
+    @contextmanager
+    def reader(self):
+        """Yield the calling thread's reader connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        yield conn
+
+    def close(self) -> None:
+        """Close the writer and every reader connection that was handed out"""
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+        self._local = threading.local()
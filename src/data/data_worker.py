@@ -0,0 +1,132 @@
+from contextlib import contextmanager
+from itertools import count
+import threading
+import logging
+import queue
+import sqlite3
+from PyQt6.QtCore import QObject, pyqtSignal
+from .database_manager import DatabaseManager
+
+
+class DataWorker(QObject):
+    """
+    Runs data access calls on a dedicated thread so SQLite never blocks the Qt event loop.
+
+    Requests are queued and executed in order on the worker thread, which uses its own reader
+    connection from the ConnectionManager. Results are delivered back on the GUI thread through
+    Qt signals tagged with the request id. Requests submitted on a channel supersede the earlier
+    requests of that channel, whose results are dropped (or never run if still queued). A
+    superseded request that is already running is interrupted through sqlite's progress handler.
+    """
+
+    # Number of SQLite virtual machine instructions between cancellation checks
+    PROGRESS_INTERVAL = 1000
+
+    request_finished = pyqtSignal(int, object)
+    request_failed = pyqtSignal(int, object)
+
+    def __init__(self):
+        super().__init__()
+        self._requests = queue.SimpleQueue()
+        self._ids = count(1)
+        self._callbacks = {}  # {request_id: (channel, callback, error_callback)}
+        self._latest = {}  # {channel: latest request_id}
+
+        self.request_finished.connect(self._deliver)
+        self.request_failed.connect(self._deliver_error)
+
+        self._thread = threading.Thread(
+            target=self._run, name="AcornDataWorker", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self, func, *args, callback=None, error_callback=None, channel=None, **kwargs
+    ) -> int:
+        """
+        Queue a call to run on the worker thread.
+
+        Args:
+            func: The data access callable to run.
+            callback: Called on the GUI thread with the result.
+            error_callback: Called on the GUI thread with the raised exception.
+            channel (str): Requests on the same channel supersede each other.
+
+        Returns:
+            int: The request id.
+        """
+        request_id = next(self._ids)
+        self._callbacks[request_id] = (channel, callback, error_callback)
+        if channel is not None:
+            self._latest[channel] = request_id
+        self._requests.put((request_id, channel, func, args, kwargs))
+        return request_id
+
+    def is_stale(self, request_id: int, channel: str) -> bool:
+        """Check whether a newer request has been submitted on the channel"""
+        return channel is not None and self._latest.get(channel) != request_id
+
+    def cancel(self, channel: str) -> None:
+        """Drop the pending request of a channel"""
+        self._latest.pop(channel, None)
+
+    def shutdown(self) -> None:
+        """Stop the worker thread after the already queued requests"""
+        if self._thread.is_alive():
+            self._requests.put(None)
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while (request := self._requests.get()) is not None:
+            request_id, channel, func, args, kwargs = request
+            if self.is_stale(request_id, channel):
+                self.request_finished.emit(request_id, None)
+                continue
+            try:
+                with self._interruptible(request_id, channel):
+                    result = func(*args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if self.is_stale(request_id, channel):
+                    self.request_finished.emit(request_id, None)
+                    continue
+                logging.exception(f"Data request {request_id} failed")
+                self.request_failed.emit(request_id, e)
+            except Exception as e:
+                logging.exception(f"Data request {request_id} failed")
+                self.request_failed.emit(request_id, e)
+            else:
+                self.request_finished.emit(request_id, result)
+
+    @contextmanager
+    def _interruptible(self, request_id: int, channel: str):
+        """Abort reads of the request once a newer request arrives on its channel"""
+        if channel is None:
+            yield
+            return
+
+        with DatabaseManager().connections.reader() as conn:
+            conn.set_progress_handler(
+                lambda: self.is_stale(request_id, channel), self.PROGRESS_INTERVAL
+            )
+            try:
+                yield
+            finally:
+                conn.set_progress_handler(None, 0)
+
+    def _deliver(self, request_id: int, result) -> None:
+        channel, callback, _ = self._callbacks.pop(request_id, (None, None, None))
+        if self.is_stale(request_id, channel):
+            return
+        if channel is not None:
+            del self._latest[channel]
+        if callback:
+            callback(result)
+
+    def _deliver_error(self, request_id: int, error) -> None:
+        channel, _, error_callback = self._callbacks.pop(request_id, (None, None, None))
+        if self.is_stale(request_id, channel):
+            return
+        if channel is not None:
+            del self._latest[channel]
+        if error_callback:
+            error_callback(error)
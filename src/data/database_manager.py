@@ -1,47 +1,38 @@
 from pathlib import Path
+from typing import Any, Callable, Iterator, List, TYPE_CHECKING
 import sqlite3
-import polars as pl
 from .query_manager import QueryManager
+from .connection_manager import ConnectionManager
 from src.utils.utils import UtilityManager
 import logging
-import arrow
 
+if TYPE_CHECKING:
+    import polars as pl
 
-class DatabaseManager:
-    def establish_connection(self) -> sqlite3.Connection:
-        """Establish a connection to the database and create if not exists"""
-        db_path = self.get_db_path()
 
-        try:
-            # Create the database file if it doesn't exist
-            if not db_path.exists():
-                db_path.parent.mkdir(parents=True, exist_ok=True)
-                logging.info(f"Database file created at {db_path}")
+class DatabaseManager:
+    FETCH_BATCH_SIZE = 256
+    _connections = None
 
-            return sqlite3.connect(db_path)
-        except sqlite3.Error as e:
-            logging.error(f"Database connection failed: {e}")
-            raise
+    @property
+    def connections(self) -> ConnectionManager:
+        """The shared connection manager for the vault database, looked up once"""
+        if self._connections is None:
+            self._connections = ConnectionManager.for_path(self.get_db_path())
+        return self._connections
 
     def read_database(
         self, table_name, columns, conditions=None, group=None, order=None, params=None
-    ) -> pl.DataFrame:
-        """Read data from the database"""
-        with self.establish_connection() as conn:
+    ) -> "pl.DataFrame":
+        """Read data from the database into a DataFrame, for callers that want columnar data"""
+        import polars as pl
+
+        with self.connections.reader() as conn:
             c = conn.cursor()
-            if params:
-                c.execute(
-                    QueryManager.create_query(
-                        columns, table_name, conditions, group, order
-                    ),
-                    params,
-                )
-            else:
-                c.execute(
-                    QueryManager.create_query(
-                        columns, table_name, conditions, group, order
-                    )
-                )
+            c.execute(
+                QueryManager.create_query(columns, table_name, conditions, group, order),
+                params or (),
+            )
 
             # Adjust columns when using '*'
             if columns == "*":
@@ -51,77 +42,140 @@ class DatabaseManager:
 
             return pl.DataFrame(c.fetchall(), schema=columns, orient="row")
 
-    def update_database(self, table_name, columns, values, conditions=None) -> None:
-        """Update data in the database"""
-        with self.establish_connection() as conn:
+    def stream_query(
+        self,
+        query: str,
+        params=None,
+        row_factory: Callable = None,
+        batch_size: int = FETCH_BATCH_SIZE,
+    ) -> Iterator:
+        """
+        Stream the rows of a prepared query straight from the cursor.
+
+        Args:
+            query (str): The SQL query to execute.
+            params: Parameters bound to the query.
+            row_factory (Callable): sqlite3 style row factory such as sqlite3.Row or dict_factory.
+                Rows are plain tuples when not given.
+            batch_size (int): Number of rows pulled from sqlite per fetchmany call.
+
+        Yields:
+            One row per result, built by the row factory.
+        """
+        with self.connections.reader() as conn:
             c = conn.cursor()
+            c.row_factory = row_factory
+            c.execute(query, params or ())
+            while rows := c.fetchmany(batch_size):
+                yield from rows
+
+    def stream_rows(
+        self,
+        table_name,
+        columns,
+        conditions=None,
+        group=None,
+        order=None,
+        params=None,
+        row_factory: Callable = None,
+        batch_size: int = FETCH_BATCH_SIZE,
+    ) -> Iterator:
+        """Stream rows from a table, see stream_query for the row factory and batching"""
+        yield from self.stream_query(
+            QueryManager.create_query(columns, table_name, conditions, group, order),
+            params,
+            row_factory,
+            batch_size,
+        )
+
+    def read_rows(
+        self,
+        table_name,
+        columns,
+        conditions=None,
+        group=None,
+        order=None,
+        params=None,
+        row_factory: Callable = None,
+    ) -> List:
+        """Read rows from a table as dicts, or through the given row factory"""
+        return list(
+            self.stream_rows(
+                table_name,
+                columns,
+                conditions,
+                group,
+                order,
+                params,
+                row_factory or self.dict_factory,
+            )
+        )
+
+    def query_rows(self, query: str, params=None, row_factory: Callable = None) -> List:
+        """Read the rows of a prepared query as dicts, or through the given row factory"""
+        return list(self.stream_query(query, params, row_factory or self.dict_factory))
+
+    def read_value(
+        self, table_name, column, conditions=None, params=None, default=None
+    ) -> Any:
+        """Read a single value from the first matching row, or the default when there is none"""
+        for row in self.stream_rows(
+            table_name, column, conditions, params=params, batch_size=1
+        ):
+            return row[0]
+        return default
 
-            c.execute(
+    @staticmethod
+    def dict_factory(cursor: sqlite3.Cursor, row: tuple) -> dict:
+        """Row factory building a dict keyed by column name"""
+        return {column[0]: value for column, value in zip(cursor.description, row)}
+
+    def update_database(
+        self, table_name, columns, values, conditions=None, params=None
+    ) -> None:
+        """Update data in the database"""
+        values = values if isinstance(columns, (list, tuple)) else (values,)
+        with self.connections.writer() as conn:
+            conn.execute(
                 QueryManager.update_query(table_name, columns, conditions),
-                values if isinstance(columns, (list, tuple)) else (values,),
+                tuple(values) + tuple(params or ()),
             )
-            conn.commit()
 
-    def insert_data(self, table_name, columns, values) -> None:
-        """Insert data into the database"""
-        with self.establish_connection() as conn:
-            c = conn.cursor()
-            c.execute(QueryManager.insert_query(table_name, columns), values)
-            conn.commit()
+    def after_commit(self, callback) -> None:
+        """Run callback once the current write transaction commits, or right away outside one"""
+        self.connections.after_commit(callback)
+
+    def insert_data(self, table_name, columns, values) -> int:
+        """Insert data into the database, returning the rowid of the new row"""
+        with self.connections.writer() as conn:
+            return conn.execute(
+                QueryManager.insert_query(table_name, columns), values
+            ).lastrowid
 
     def create_table(self, table_name, columns) -> None:
         """Create a new table in the database"""
-        with self.establish_connection() as conn:
-            c = conn.cursor()
-            c.execute(QueryManager.create_table(table_name, columns))
+        with self.connections.writer() as conn:
+            conn.execute(QueryManager.create_table(table_name, columns))
 
-    def delete_data(self, table_name, conditions) -> None:
+    def delete_data(self, table_name, conditions, params=None) -> None:
         """Delete data from the database"""
-        with self.establish_connection() as conn:
-            c = conn.cursor()
-            c.execute(QueryManager.delete_data(table_name, conditions))
-            conn.commit()
-
-    def archive_snippet_type(self, snippet_type: str) -> None:
-        with self.establish_connection() as conn:
-            c = conn.cursor()
-            c.execute(QueryManager.archive_snippet_type(snippet_type))
-
-    def ensure_column_exists(
-        self, table_name: str, column_name: str, column_type: str
-    ) -> None:
-        """Ensure a specific column exists in the table, add it if missing."""
-        with self.establish_connection() as conn:
-            c = conn.cursor()
-
-            c.execute(f"PRAGMA table_info({table_name})")
-            existing_columns = [column[1] for column in c.fetchall()]
-
-            if column_name not in existing_columns:
-                # print(f"Adding missing column '{column_name}' to '{table_name}'")
-                c.execute(
-                    f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}"
-                )
-                conn.commit()
-            else:
-                pass
-                # print(f"Column '{column_name}' already exists in '{table_name}'")
-
-    def ensure_release_table(self, table_name: str, **kwargs) -> None:
-        current_version = kwargs.get("current_version", "")
-
-        with self.establish_connection() as conn:
-            c = conn.cursor()
-            try:
-                c.execute(f"SELECT * FROM {table_name}")
-            except sqlite3.OperationalError:
-                self.create_table("release", "release TEXT, lst_updt_ts DATE")
-                self.insert_data(
-                    "release",
-                    ["release", "lst_updt_ts"],
-                    (current_version, arrow.now().format("YYYY-MM-DD")),
-                )
-                return
+        with self.connections.writer() as conn:
+            conn.execute(QueryManager.delete_data(table_name, conditions), params or ())
+
+    def get_schema_version(self) -> int:
+        """Read the schema version stored in the database header"""
+        with self.connections.reader() as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def has_search_index(self) -> bool:
+        """Check whether the FTS5 search index exists in the database"""
+        with self.connections.reader() as conn:
+            return (
+                conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'snippets_fts'"
+                ).fetchone()
+                is not None
+            )
 
     @staticmethod
     def get_db_path() -> Path:
@@ -134,9 +188,14 @@ class DatabaseManager:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit - close connections or handle cleanup here if needed"""
+        """Context manager exit - connections are pooled and closed on application quit"""
         pass
 
+    @staticmethod
+    def close_connections() -> None:
+        """Close all pooled connections, called when the application quits"""
+        ConnectionManager.close_all()
+
 
 if __name__ == "__main__":
     db = DatabaseManager()
@@ -0,0 +1,342 @@
+import sqlite3
+import logging
+import arrow
+from .database_manager import DatabaseManager
+from .query_manager import QueryManager
+
+
+class MigrationManager:
+    """
+    Brings the database schema up to date using ordered migrations tracked by PRAGMA user_version.
+
+    Each migration runs in its own transaction together with the version bump, so a failed
+    migration leaves the database at the previous version. When the schema is current,
+    startup costs a single user_version read.
+    """
+
+    def __init__(self, db: DatabaseManager, current_version: str = ""):
+        self.db = db
+        self.current_version = current_version
+        self.migrations = [
+            (1, "Create the base tables and defaults", self._create_base_tables),
+            (2, "Store archived as a flag with timestamps", self._normalize_snippets),
+            (3, "Index snippets by archived status and type", self._create_indexes),
+            (4, "Create the full-text search index", self._create_search_index),
+            (5, "Move snippet types to their own table", self._normalize_snippet_types),
+            (6, "Track snippet usage and rank by frecency", self._create_usage_tracking),
+            (7, "Store casefolded keys for sorting and matching", self._create_search_keys),
+            (8, "Index description keys for prefix matching", self._index_description_keys),
+        ]
+
+    @property
+    def latest_version(self) -> int:
+        return self.migrations[-1][0]
+
+    def migrate(self) -> int:
+        """
+        Apply every migration newer than the version stored in the database.
+
+        Returns:
+            int: The schema version after migrating.
+        """
+
+        version = self.db.get_schema_version()
+        if version >= self.latest_version:
+            return version
+
+        for migration_version, description, migration in self.migrations:
+            if migration_version <= version:
+                continue
+
+            logging.info(f"Migrating database to v{migration_version}: {description}")
+            with self.db.connections.writer() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                migration(conn)
+                conn.execute(f"PRAGMA user_version = {migration_version}")
+            version = migration_version
+
+        return version
+
+    @staticmethod
+    def _columns(conn: sqlite3.Connection, table_name: str) -> list:
+        return [column[1] for column in conn.execute(f"PRAGMA table_info({table_name})")]
+
+    @staticmethod
+    def _is_empty(conn: sqlite3.Connection, table_name: str) -> bool:
+        return conn.execute(f"SELECT 1 FROM {table_name} LIMIT 1").fetchone() is None
+
+    def _create_base_tables(self, conn: sqlite3.Connection) -> None:
+        """Create the original tables, backfilling columns that older releases did not have"""
+        conn.execute(
+            QueryManager.create_table(
+                "snippets",
+                "id INTEGER PRIMARY KEY, name TEXT NOT NULL, type TEXT NOT NULL, description TEXT NOT NULL, content TEXT NOT NULL, extension TEXT, archived TEXT",
+            )
+        )
+        for column in ("extension", "archived"):
+            if column not in self._columns(conn, "snippets"):
+                conn.execute(f"ALTER TABLE snippets ADD COLUMN {column} TEXT")
+
+        conn.execute(QueryManager.hotkey_table_query())
+        conn.execute(
+            QueryManager.create_table(
+                "default_theme", "id INTEGER PRIMARY KEY, theme TEXT NOT NULL"
+            )
+        )
+        conn.execute(QueryManager.create_table("release", "release TEXT, lst_updt_ts DATE"))
+
+        if self._is_empty(conn, "default_theme"):
+            conn.execute(QueryManager.insert_query("default_theme", ["theme"]), ("Matcha",))
+        if self._is_empty(conn, "hotkeys"):
+            conn.execute(
+                QueryManager.insert_query("hotkeys", ["hotkey"]), ("<alt>+<shift>+p",)
+            )
+        if self._is_empty(conn, "release"):
+            conn.execute(
+                QueryManager.insert_query("release", ["release", "lst_updt_ts"]),
+                (self.current_version, arrow.now().format("YYYY-MM-DD")),
+            )
+
+    def _normalize_snippets(self, conn: sqlite3.Connection) -> None:
+        """Rebuild snippets with an integer archived flag and created/updated timestamps"""
+        conn.execute(
+            QueryManager.create_table(
+                "snippets_migrated",
+                """
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                type TEXT NOT NULL,
+                description TEXT NOT NULL,
+                content TEXT NOT NULL,
+                extension TEXT,
+                archived INTEGER NOT NULL DEFAULT 0 CHECK (archived IN (0, 1)),
+                created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                """,
+            )
+        )
+        conn.execute(
+            """
+            INSERT INTO snippets_migrated (id, name, type, description, content, extension, archived)
+            SELECT id, name, type, description, content, extension,
+                   CASE WHEN archived = 'Y' THEN 1 ELSE 0 END
+            FROM snippets
+            """
+        )
+        conn.execute("DROP TABLE snippets")
+        conn.execute("ALTER TABLE snippets_migrated RENAME TO snippets")
+
+    def _create_indexes(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_snippets_archived_type_name "
+            "ON snippets (archived, type, name)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_snippets_active_type_name "
+            "ON snippets (type, name) WHERE archived = 0"
+        )
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS snippets_touch_updated_at
+            AFTER UPDATE ON snippets WHEN new.updated_at IS old.updated_at BEGIN
+                UPDATE snippets SET updated_at = CURRENT_TIMESTAMP WHERE id = new.id;
+            END
+            """
+        )
+
+    def _create_search_index(self, conn: sqlite3.Connection) -> None:
+        """Create and build the FTS5 index, searches fall back to scanning if FTS5 is unavailable"""
+        conn.execute("SAVEPOINT search_index")
+        try:
+            for query in QueryManager.search_index_queries():
+                conn.execute(query)
+            conn.execute("INSERT INTO snippets_fts(snippets_fts) VALUES ('rebuild')")
+            conn.execute("RELEASE search_index")
+        except sqlite3.OperationalError as e:
+            conn.execute("ROLLBACK TO search_index")
+            conn.execute("RELEASE search_index")
+            logging.warning(f"Full-text search index unavailable: {e}")
+
+    def _normalize_snippet_types(self, conn: sqlite3.Connection) -> None:
+        """
+        Give every (type, archived) pair a snippet_types row and rebuild snippets referencing
+        it by type_id. Ids are kept, so the full-text index stays valid, only its triggers are
+        recreated along with the new table. The triggers keep the snippet counts of the
+        types, a type row is deleted once its last snippet is gone.
+        """
+        has_search_index = (
+            conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'snippets_fts'"
+            ).fetchone()
+            is not None
+        )
+
+        conn.execute(
+            QueryManager.create_table(
+                "snippet_types",
+                """
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                archived INTEGER NOT NULL DEFAULT 0 CHECK (archived IN (0, 1)),
+                display_order INTEGER NOT NULL DEFAULT 0,
+                snippet_count INTEGER NOT NULL DEFAULT 0,
+                UNIQUE (name, archived)
+                """,
+            )
+        )
+        conn.execute(
+            """
+            INSERT INTO snippet_types (name, archived, snippet_count)
+            SELECT type, archived, COUNT(*) FROM snippets GROUP BY type, archived
+            """
+        )
+
+        conn.execute(
+            QueryManager.create_table(
+                "snippets_migrated",
+                """
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                type_id INTEGER NOT NULL REFERENCES snippet_types (id),
+                description TEXT NOT NULL,
+                content TEXT NOT NULL,
+                extension TEXT,
+                created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                """,
+            )
+        )
+        conn.execute(
+            """
+            INSERT INTO snippets_migrated
+                (id, name, type_id, description, content, extension, created_at, updated_at)
+            SELECT s.id, s.name, t.id, s.description, s.content, s.extension,
+                   s.created_at, s.updated_at
+            FROM snippets s
+            JOIN snippet_types t ON t.name = s.type AND t.archived = s.archived
+            """
+        )
+        conn.execute("DROP TABLE snippets")
+        conn.execute("ALTER TABLE snippets_migrated RENAME TO snippets")
+
+        conn.execute("CREATE INDEX idx_snippets_type_name ON snippets (type_id, name)")
+        conn.execute(
+            """
+            CREATE TRIGGER snippets_touch_updated_at
+            AFTER UPDATE ON snippets WHEN new.updated_at IS old.updated_at BEGIN
+                UPDATE snippets SET updated_at = CURRENT_TIMESTAMP WHERE id = new.id;
+            END
+            """
+        )
+        conn.execute(
+            """
+            CREATE TRIGGER snippets_count_insert AFTER INSERT ON snippets BEGIN
+                UPDATE snippet_types SET snippet_count = snippet_count + 1
+                WHERE id = new.type_id;
+            END
+            """
+        )
+        conn.execute(
+            """
+            CREATE TRIGGER snippets_count_delete AFTER DELETE ON snippets BEGIN
+                UPDATE snippet_types SET snippet_count = snippet_count - 1
+                WHERE id = old.type_id;
+            END
+            """
+        )
+        conn.execute(
+            """
+            CREATE TRIGGER snippets_count_update
+            AFTER UPDATE OF type_id ON snippets WHEN new.type_id != old.type_id BEGIN
+                UPDATE snippet_types SET snippet_count = snippet_count + 1
+                WHERE id = new.type_id;
+                UPDATE snippet_types SET snippet_count = snippet_count - 1
+                WHERE id = old.type_id;
+            END
+            """
+        )
+        conn.execute(
+            """
+            CREATE TRIGGER snippet_types_drop_empty
+            AFTER UPDATE OF snippet_count ON snippet_types WHEN new.snippet_count <= 0 BEGIN
+                DELETE FROM snippet_types WHERE id = new.id;
+            END
+            """
+        )
+        if has_search_index:
+            for query in QueryManager.search_index_queries():
+                conn.execute(query)
+
+    def _create_usage_tracking(self, conn: sqlite3.Connection) -> None:
+        """
+        Add the usage table and the frecency column. updated_at is only touched by edits
+        from now on, so recording usage does not count as a change. The type listing index
+        is dropped, the search keys replace it with one ranked by frecency.
+        """
+        conn.execute(
+            QueryManager.create_table(
+                "snippet_usage",
+                """
+                snippet_id INTEGER PRIMARY KEY REFERENCES snippets (id) ON DELETE CASCADE,
+                use_count INTEGER NOT NULL DEFAULT 0,
+                last_used_at REAL NOT NULL
+                """,
+            )
+        )
+        conn.execute("ALTER TABLE snippets ADD COLUMN frecency REAL")
+        conn.execute("DROP INDEX idx_snippets_type_name")
+        conn.execute("DROP TRIGGER snippets_touch_updated_at")
+        conn.execute(
+            """
+            CREATE TRIGGER snippets_touch_updated_at
+            AFTER UPDATE OF name, type_id, description, content, extension ON snippets
+            WHEN new.updated_at IS old.updated_at BEGIN
+                UPDATE snippets SET updated_at = CURRENT_TIMESTAMP WHERE id = new.id;
+            END
+            """
+        )
+
+    def _create_search_keys(self, conn: sqlite3.Connection) -> None:
+        """
+        Add casefolded copies of the snippet names and descriptions and of the type names,
+        which the snippet manager keeps up to date on write. Type listings are read in the
+        order of the rank index, most used first, the default extension of a type is the
+        first entry of the extension index and name prefixes are matched with LIKE on the
+        NOCASE name key index.
+        """
+        conn.create_function(
+            "search_key", 1, QueryManager.search_key, deterministic=True
+        )
+        conn.execute("ALTER TABLE snippets ADD COLUMN name_key TEXT COLLATE NOCASE")
+        conn.execute(
+            "ALTER TABLE snippets ADD COLUMN description_key TEXT COLLATE NOCASE"
+        )
+        conn.execute("ALTER TABLE snippet_types ADD COLUMN name_key TEXT COLLATE NOCASE")
+        conn.execute(
+            """
+            UPDATE snippets
+            SET name_key = search_key(name), description_key = search_key(description)
+            """
+        )
+        conn.execute("UPDATE snippet_types SET name_key = search_key(name)")
+
+        # Vaults migrated by earlier builds of the usage tracking have a rank index by name
+        conn.execute("DROP INDEX IF EXISTS idx_snippets_type_rank")
+        conn.execute(
+            "CREATE INDEX idx_snippets_type_rank_key "
+            "ON snippets (type_id, frecency DESC, name_key)"
+        )
+        conn.execute(
+            "CREATE INDEX idx_snippets_type_extension ON snippets (type_id, extension)"
+        )
+        conn.execute("CREATE INDEX idx_snippets_name_key ON snippets (name_key)")
+        conn.execute(
+            "CREATE INDEX idx_snippet_types_order "
+            "ON snippet_types (archived, display_order, name_key)"
+        )
+
+    def _index_description_keys(self, conn: sqlite3.Connection) -> None:
+        """Index the description keys, short searches match their prefixes like the names"""
+        conn.execute(
+            "CREATE INDEX idx_snippets_description_key ON snippets (description_key)"
+        )
@@ -6,6 +6,18 @@ class QueryManager:
     Class to manage queries to the database.
     """
 
+    @staticmethod
+    def search_key(text: str) -> str:
+        """The casefolded key stored next to a name or description for ordering and matching"""
+        return text.casefold() if text is not None else None
+
+    @staticmethod
+    def like_prefix(text: str) -> str:
+        """LIKE pattern matching values that start with text, escaped with a backslash"""
+        for char in ("\\", "%", "_"):
+            text = text.replace(char, "\\" + char)
+        return text + "%"
+
     @staticmethod
     def create_table(table_name: str, table_columns: str) -> str:
         """
@@ -90,21 +102,38 @@ class QueryManager:
 
         return query
 
-    @staticmethod
-    def snippet_table_query() -> str:
-        """Query to create the snippets table in the database"""
+    # Snippets joined with their type, aliased s and t by every query reading through it
+    SNIPPET_SOURCE = "snippets s JOIN snippet_types t ON t.id = s.type_id"
 
-        return QueryManager.create_table(
-            "snippets",
-            """
-            id INTEGER PRIMARY KEY,
-            name TEXT NOT NULL,
-            type TEXT NOT NULL,
-            description TEXT NOT NULL,
-            content TEXT NOT NULL
-            """,
+    @staticmethod
+    def prefix_match_source() -> str:
+        """
+        SNIPPET_SOURCE limited to the snippets whose name or description key matches a LIKE
+        prefix pattern, bound twice. Each prefix is looked up in its own key index and the
+        CROSS JOIN keeps the planner from scanning the snippets of a type instead.
+        """
+        return (
+            "(SELECT id FROM snippets WHERE name_key LIKE ? ESCAPE '\\' "
+            "UNION SELECT id FROM snippets WHERE description_key LIKE ? ESCAPE '\\') m "
+            "CROSS JOIN snippets s ON s.id = m.id "
+            "JOIN snippet_types t ON t.id = s.type_id"
         )
 
+    @staticmethod
+    def record_usage() -> str:
+        """Query adding to the usage of a snippet, bound to its id, the uses and the time"""
+        return """
+        INSERT INTO snippet_usage (snippet_id, use_count, last_used_at) VALUES (?, ?, ?)
+        ON CONFLICT (snippet_id) DO UPDATE SET
+            use_count = use_count + excluded.use_count,
+            last_used_at = max(last_used_at, excluded.last_used_at)
+        """
+
+    @staticmethod
+    def frecency_of_ids() -> str:
+        """Query selecting the id and frecency of existing snippets, bound to a JSON array of ids"""
+        return f"SELECT id, frecency FROM snippets WHERE {QueryManager.ids_condition()}"
+
     @staticmethod
     def hotkey_table_query() -> str:
         """Query to create the hotkeys table in the database"""
@@ -118,14 +147,191 @@ class QueryManager:
         )
 
     @staticmethod
-    def archive_snippet_type(snippet_type: str) -> str:
-        """Query to archive snippets of a specific type"""
+    def add_snippet_type() -> str:
+        """
+        Query creating a type row unless it exists, bound to the name, the archived flag and
+        the search key of the name
+        """
+        return """
+        INSERT INTO snippet_types (name, archived, name_key) VALUES (?, ?, ?)
+        ON CONFLICT (name, archived) DO NOTHING
+        """
+
+    @staticmethod
+    def default_extension() -> str:
+        """
+        Query selecting the first extension of a type, bound to its name and archived flag.
+        MIN is answered from the extension index.
+        """
+        return """
+        SELECT MIN(s.extension) FROM snippets s
+        WHERE s.type_id = (SELECT id FROM snippet_types WHERE name = ? AND archived = ?)
+        """
+
+    @staticmethod
+    def snippet_type_id() -> str:
+        """Query selecting the id of a type row, bound to the name and the archived flag"""
+        return "SELECT id FROM snippet_types WHERE name = ? AND archived = ?"
+
+    @staticmethod
+    def type_exists() -> str:
+        """Query selecting a row when a type has snippets, bound to the type and the archived flag"""
+        return (
+            "SELECT 1 FROM snippet_types "
+            "WHERE name = ? AND archived = ? AND snippet_count > 0"
+        )
+
+    @staticmethod
+    def snippet_ids_of_type() -> str:
+        """Query selecting the snippet ids of a type row, bound to its id"""
+        return "SELECT id FROM snippets WHERE type_id = ?"
+
+    @staticmethod
+    def move_snippets_of_type() -> str:
+        """Query moving every snippet of a type row to another, bound to the new and old ids"""
+        return "UPDATE snippets SET type_id = ? WHERE type_id = ?"
+
+    @staticmethod
+    def move_snippets_to_archived() -> str:
+        """
+        Query moving a set of snippets to the row of their type with the given archived flag,
+        bound to the flag, the flag again and a JSON array of ids. The rows must exist.
+        """
+        return f"""
+        UPDATE snippets SET type_id = (
+            SELECT target.id FROM snippet_types target
+            JOIN snippet_types current ON current.name = target.name
+            WHERE current.id = snippets.type_id AND target.archived = ?
+        )
+        WHERE type_id IN (SELECT id FROM snippet_types WHERE archived != ?)
+        AND {QueryManager.ids_condition()}
+        """
+
+    @staticmethod
+    def retype_snippets() -> str:
+        """
+        Query moving a set of snippets to another type, keeping their archived flag, bound to
+        the type name and a JSON array of ids. The rows of the type must exist.
+        """
+        return f"""
+        UPDATE snippets SET type_id = (
+            SELECT target.id FROM snippet_types target
+            JOIN snippet_types current ON current.archived = target.archived
+            WHERE current.id = snippets.type_id AND target.name = ?
+        )
+        WHERE {QueryManager.ids_condition()}
+        """
+
+    @staticmethod
+    def ids_condition(column: str = "id") -> str:
+        """Condition matching a set of ids, bound to a single JSON array parameter"""
+        return f"{column} IN (SELECT value FROM json_each(?))"
+
+    @staticmethod
+    def max_snippet_id() -> str:
+        """Query selecting the highest snippet id, 0 for an empty table"""
+        return "SELECT COALESCE(MAX(id), 0) FROM snippets"
+
+    @staticmethod
+    def snippets_after_id(columns: str) -> str:
+        """Query selecting the snippets inserted after an id, bound to that id"""
+        return (
+            f"SELECT {columns} FROM {QueryManager.SNIPPET_SOURCE} "
+            "WHERE s.id > ? ORDER BY s.id"
+        )
+
+    @staticmethod
+    def listing_after(has_frecency: bool) -> str:
+        """
+        Keyset condition selecting the snippets listed after a row, in the order frecency
+        descending with unused snippets last, then name key and id. Bound to the row's
+        frecency twice, name key and id, or only to its name key and id for an unused row.
+        """
+
+        if not has_frecency:
+            return "s.frecency IS NULL AND (s.name_key, s.id) > (?, ?)"
+        return (
+            "(s.frecency < ? OR s.frecency IS NULL "
+            "OR (s.frecency = ? AND (s.name_key, s.id) > (?, ?)))"
+        )
+
+    @staticmethod
+    def listing_columns() -> str:
+        """Columns of SNIPPET_SOURCE needed to list a snippet without loading its content"""
+        return (
+            "s.id, s.name, s.description, t.name AS type, "
+            "s.extension, length(s.content) AS content_length, s.frecency"
+        )
+
+    @staticmethod
+    def snippet_columns() -> str:
+        """Every column of a snippet in SNIPPET_SOURCE, with the type and its archived flag"""
+        return (
+            "s.id, s.name, t.name AS type, s.description, s.content, s.extension, "
+            "t.archived, s.frecency, s.created_at, s.updated_at"
+        )
+
+    @staticmethod
+    def search_index_queries() -> List[str]:
+        """
+        Queries to create the FTS5 index over the snippets table and the triggers that keep it in sync.
+        The trigram tokenizer keeps substring matching behaviour for searches of three or more characters.
+        """
+
+        return [
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS snippets_fts USING fts5(
+                name, description, content,
+                content='snippets', content_rowid='id', tokenize='trigram'
+            )
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS snippets_fts_insert AFTER INSERT ON snippets BEGIN
+                INSERT INTO snippets_fts(rowid, name, description, content)
+                VALUES (new.id, new.name, new.description, new.content);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS snippets_fts_delete AFTER DELETE ON snippets BEGIN
+                INSERT INTO snippets_fts(snippets_fts, rowid, name, description, content)
+                VALUES ('delete', old.id, old.name, old.description, old.content);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS snippets_fts_update
+            AFTER UPDATE OF name, description, content ON snippets BEGIN
+                INSERT INTO snippets_fts(snippets_fts, rowid, name, description, content)
+                VALUES ('delete', old.id, old.name, old.description, old.content);
+                INSERT INTO snippets_fts(rowid, name, description, content)
+                VALUES (new.id, new.name, new.description, new.content);
+            END
+            """,
+        ]
+
+    @staticmethod
+    def search_query(columns: str, archived_condition: str, after: bool = False) -> str:
+        """
+        Query to search the FTS5 index, ranked by bm25 and boosted by frecency, bound to the
+        frecency below which snippets get no boost, the MATCH expression, the score and id
+        of the last row of the previous page when after is set, and the page size.
+        Name hits weigh more than description hits, which weigh more than content hits, and
+        every doubling of recent usage above the floor is worth one bm25 unit.
+        """
+
+        keyset = "WHERE (score, id) > (?, ?)" if after else ""
         return f"""
-        UPDATE snippets
-        SET archived = 'Y'
-        WHERE type = '{snippet_type}'
-        AND archived IS NULL
-        OR archived = 'N'
+        SELECT * FROM (
+            SELECT {columns},
+                bm25(snippets_fts, 10.0, 5.0, 1.0)
+                    - COALESCE(max(s.frecency - ?, 0), 0) AS score
+            FROM snippets_fts
+            JOIN snippets s ON s.id = snippets_fts.rowid
+            JOIN snippet_types t ON t.id = s.type_id
+            WHERE snippets_fts MATCH ? AND {archived_condition}
+        )
+        {keyset}
+        ORDER BY score, id
+        LIMIT ?
         """
 
     @staticmethod
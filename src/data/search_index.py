@@ -0,0 +1,274 @@
+from array import array
+from bisect import bisect_right
+import heapq
+import threading
+import re
+
+
+class FuzzySearchIndex:
+    """
+    In-memory index of casefolded snippet names, descriptions and types for fuzzy matching.
+
+    All keys live in one joined string, with parallel arrays holding each entry's start offset,
+    snippet id, archived flag and a bitmask of the characters it contains. The masks discard
+    most entries before any string work, and only the best candidates get the full fzf style
+    score. Changed snippets are appended and their old entry tombstoned, the joined string is
+    extended lazily before the next search and compacted once most entries are tombstones.
+    """
+
+    ENTRY_SEPARATOR = "\x1e"
+    FIELD_SEPARATOR = "\x1f"
+    BOUNDARY_CHARS = frozenset(" _-./\\:()[]" + FIELD_SEPARATOR)
+
+    SCORE_MATCH = 16
+    BONUS_BOUNDARY = 8
+    BONUS_CONSECUTIVE = 4
+    BONUS_FIRST_CHAR = 8
+    BONUS_NAME = 32
+    PENALTY_GAP_START = 3
+    PENALTY_GAP_EXTENSION = 1
+    # How many candidates per requested result get the full score
+    RESCORE_FACTOR = 4
+    CHAR_BITS = {
+        char: 1 << bit
+        for bit, char in enumerate("abcdefghijklmnopqrstuvwxyz0123456789")
+    }
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._text = self.ENTRY_SEPARATOR
+        self._offsets = array("q")
+        self._ids = array("q")
+        self._archived = bytearray()
+        self._masks = array("Q")
+        self._positions = {}  # {snippet_id: entry index}
+        self._pending = []  # keys appended since the joined string was last built
+        self._tombstones = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    @classmethod
+    def make_key(cls, name: str, description: str, snippet_type: str) -> str:
+        """Build the casefolded search key of a snippet"""
+        return cls.FIELD_SEPARATOR.join(
+            (name or "", description or "", snippet_type or "")
+        ).casefold().replace(cls.ENTRY_SEPARATOR, " ")
+
+    def load(self, rows) -> None:
+        """Replace the index with (id, name, description, type, archived) rows"""
+        with self._lock:
+            self._reset()
+            for snippet_id, name, description, snippet_type, archived in rows:
+                self._append(
+                    snippet_id, self.make_key(name, description, snippet_type), archived
+                )
+
+    def upsert(
+        self,
+        snippet_id: int,
+        name: str,
+        description: str,
+        snippet_type: str,
+        archived: int = None,
+    ) -> None:
+        """Add or replace the entry of a snippet, keeping its archived flag unless one is given"""
+        with self._lock:
+            position = self._positions.get(snippet_id)
+            if archived is None:
+                archived = self._archived[position] if position is not None else 0
+            self.remove(snippet_id)
+            self._append(
+                snippet_id, self.make_key(name, description, snippet_type), archived
+            )
+
+    def remove(self, snippet_id: int) -> None:
+        """Tombstone the entry of a snippet"""
+        with self._lock:
+            position = self._positions.pop(snippet_id, None)
+            if position is not None:
+                self._ids[position] = -1
+                self._tombstones += 1
+
+    def set_archived(self, snippet_ids, archived: int) -> None:
+        """Update the archived flag of the given snippets in place"""
+        with self._lock:
+            for snippet_id in snippet_ids:
+                position = self._positions.get(snippet_id)
+                if position is not None:
+                    self._archived[position] = archived
+
+    def search(self, query: str, archived: bool = False, limit: int = None) -> list:
+        """
+        Find the snippets whose key contains the query as a subsequence.
+
+        Args:
+            query (str): The fuzzy query, whitespace is ignored.
+            archived (bool): Search archived snippets instead of active ones.
+            limit (int): Maximum number of results.
+
+        Returns:
+            list: Snippet ids, best match first.
+        """
+
+        pattern = "".join(query.casefold().split())
+        if not pattern:
+            return []
+
+        required = self.char_mask(pattern)
+        wanted = 1 if archived else 0
+        # Each character is reached by skipping anything that is not it, so the match is the
+        # greedy leftmost subsequence and never backtracks
+        matcher = re.compile(
+            re.escape(pattern[0])
+            + "".join(
+                f"[^{self.ENTRY_SEPARATOR}{re.escape(char)}]*+{re.escape(char)}"
+                for char in pattern[1:]
+            )
+        )
+
+        with self._lock:
+            self._flush()
+            text, offsets, ids, flags = self._text, self._offsets, self._ids, self._archived
+            search = matcher.search
+
+            # The character masks rule out most entries without touching their text, the rest
+            # are ranked cheaply by the span of their greedy match before the full scoring.
+            candidates = []
+            for position, mask in enumerate(self._masks):
+                if mask & required != required or flags[position] != wanted:
+                    continue
+                if ids[position] < 0:
+                    continue
+                start = offsets[position]
+                match = search(text, start, text.index(self.ENTRY_SEPARATOR, start))
+                if match:
+                    candidates.append((match.end() - match.start(), position))
+
+            if limit is not None and len(candidates) > limit * self.RESCORE_FACTOR:
+                candidates = heapq.nsmallest(limit * self.RESCORE_FACTOR, candidates)
+
+            scored = sorted(
+                (-self.score(self._entry_key(position), pattern), ids[position])
+                for _, position in candidates
+            )
+
+        return [snippet_id for _, snippet_id in scored[:limit]]
+
+    @classmethod
+    def char_mask(cls, text: str) -> int:
+        """64 bit mask of the characters in text, letters and digits get a bit each"""
+        bits = cls.CHAR_BITS
+        mask = 0
+        for char in set(text):
+            mask |= bits.get(char) or 1 << (36 + ord(char) % 28)
+        return mask
+
+    @classmethod
+    def score(cls, key: str, pattern: str) -> int:
+        """
+        Score a subsequence match of pattern in key, fzf style.
+
+        The match is found greedily left to right and then tightened right to left, matched
+        characters earn more after word boundaries and when consecutive, gaps cost a penalty,
+        and matches contained in the name earn a bonus.
+        """
+
+        end = cls._match_end(key, pattern)
+        if end < 0:
+            return 0
+
+        # Walk backwards from the end to find the tightest start
+        index = len(pattern) - 1
+        start = end
+        while index >= 0:
+            if key[start] == pattern[index]:
+                index -= 1
+                if index < 0:
+                    break
+            start -= 1
+
+        score = 0
+        index = 0
+        consecutive = False
+        in_gap = False
+        for position in range(start, end + 1):
+            if index < len(pattern) and key[position] == pattern[index]:
+                score += cls.SCORE_MATCH
+                previous = key[position - 1] if position else cls.FIELD_SEPARATOR
+                if previous in cls.BOUNDARY_CHARS:
+                    score += cls.BONUS_BOUNDARY
+                if consecutive:
+                    score += cls.BONUS_CONSECUTIVE
+                if position == 0:
+                    score += cls.BONUS_FIRST_CHAR
+                consecutive, in_gap = True, False
+                index += 1
+            else:
+                score -= cls.PENALTY_GAP_EXTENSION if in_gap else cls.PENALTY_GAP_START
+                consecutive, in_gap = False, True
+
+        name_end = key.find(cls.FIELD_SEPARATOR)
+        if name_end < 0 or end < name_end:
+            score += cls.BONUS_NAME
+        return score
+
+    @staticmethod
+    def _match_end(key: str, pattern: str) -> int:
+        """Position of the last character of the leftmost greedy subsequence match, -1 if none"""
+        position = -1
+        for char in pattern:
+            position = key.find(char, position + 1)
+            if position < 0:
+                return -1
+        return position
+
+    def _entry_key(self, position: int) -> str:
+        start = self._offsets[position]
+        end = self._text.find(self.ENTRY_SEPARATOR, start)
+        return self._text[start:end]
+
+    def _append(self, snippet_id: int, key: str, archived: int) -> None:
+        self._positions[snippet_id] = len(self._ids)
+        self._ids.append(snippet_id)
+        self._archived.append(1 if archived else 0)
+        self._masks.append(self.char_mask(key))
+        self._offsets.append(-1)  # Resolved when the pending keys are joined
+        self._pending.append(key)
+
+    def _flush(self) -> None:
+        """Join pending keys onto the text, compacting first when most entries are tombstones"""
+        if self._tombstones and self._tombstones * 2 > len(self._ids):
+            self._compact()
+        if not self._pending:
+            return
+
+        first = len(self._ids) - len(self._pending)
+        offset = len(self._text)
+        for index, key in enumerate(self._pending):
+            self._offsets[first + index] = offset
+            offset += len(key) + 1
+        self._text += self.ENTRY_SEPARATOR.join(self._pending) + self.ENTRY_SEPARATOR
+        self._pending = []
+
+    def _compact(self) -> None:
+        first_pending = len(self._ids) - len(self._pending)
+        live = [
+            (
+                snippet_id,
+                (
+                    self._pending[position - first_pending]
+                    if position >= first_pending
+                    else self._entry_key(position)
+                ),
+                self._archived[position],
+            )
+            for position, snippet_id in enumerate(self._ids)
+            if snippet_id >= 0
+        ]
+        self._reset()
+        for snippet_id, key, archived in live:
+            self._append(snippet_id, key, archived)
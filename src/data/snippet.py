@@ -0,0 +1,83 @@
+from collections.abc import Mapping
+import sys
+
+
+class Snippet(Mapping):
+    """
+    A snippet row read from the database.
+
+    Snippets are slotted records instead of dicts, so a row holds its values without a key
+    table of its own, and the type and extension strings, which repeat across most rows,
+    are interned to share one string object per value. Columns a query did not select are
+    left unset.
+
+    Rows are read as attributes. A Snippet also reads as a mapping of its set columns,
+    snippet["name"] and "content" in snippet work as they did on the listing dicts.
+    """
+
+    __slots__ = (
+        "id",
+        "name",
+        "type",
+        "description",
+        "extension",
+        "content_length",
+        "frecency",
+        "archived",
+        "content",
+        "created_at",
+        "updated_at",
+    )
+    FIELDS = frozenset(__slots__)
+    INTERNED = frozenset(("type", "extension"))
+
+    # (cursor description, [(column index, slot setter, interned)]) of the last query read
+    _columns = (None, ())
+
+    def __init__(self, **columns):
+        for field, value in columns.items():
+            if field in self.INTERNED and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, field, value)
+
+    @classmethod
+    def row_factory(cls, cursor, row: tuple) -> "Snippet":
+        """sqlite3 row factory, columns that are not snippet fields are skipped"""
+        description, columns = cls._columns
+        if description is not cursor.description:
+            description = cursor.description
+            columns = [
+                (index, getattr(cls, column[0]).__set__, column[0] in cls.INTERNED)
+                for index, column in enumerate(description)
+                if column[0] in cls.FIELDS
+            ]
+            cls._columns = (description, columns)
+
+        snippet = cls.__new__(cls)
+        for index, setter, interned in columns:
+            value = row[index]
+            if interned and type(value) is str:
+                value = sys.intern(value)
+            setter(snippet, value)
+        return snippet
+
+    def replace(self, **columns) -> "Snippet":
+        """A copy of the snippet with the given columns set"""
+        return Snippet(**{**dict(self), **columns})
+
+    def __getitem__(self, field: str):
+        if field not in self.FIELDS:
+            raise KeyError(field)
+        try:
+            return getattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
+
+    def __iter__(self):
+        return (field for field in self.__slots__ if hasattr(self, field))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"Snippet({dict(self)!r})"
@@ -0,0 +1,354 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+import logging
+import json
+import os
+import csv
+import re
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .query_manager import QueryManager
+
+
+IMPORT_COLUMNS = ("name", "type", "description", "content", "extension")
+
+
+def _field(record: dict, *names, default=""):
+    """Get the first of the given fields from a record, regardless of the key casing used"""
+    fields = {str(key).lower(): value for key, value in record.items()}
+    for name in names:
+        value = fields.get(name)
+        if value not in (None, ""):
+            return value
+    return default
+
+
+class SnippetReader(ABC):
+    """
+    Base class of the import readers. A reader turns one file into snippet dicts with the
+    IMPORT_COLUMNS keys, lazily, so files are never held in memory as snippets.
+
+    Subclasses list the file suffixes they handle and implement read, a reader without
+    it cannot be created.
+    """
+
+    suffixes = ()
+
+    def __init__(self, extension_map: dict):
+        self.extension_map = extension_map
+
+    @abstractmethod
+    def read(self, path: Path):
+        """Yield the snippet dicts of the file or directory at path"""
+
+    def extension_for(self, language: str) -> str:
+        """The file extension of a language or type name, empty when unknown"""
+        return self.extension_map.get(str(language).lower(), "")
+
+    def snippet(self, name, snippet_type, description, content, extension=None) -> dict:
+        return {
+            "name": str(name),
+            "type": str(snippet_type),
+            "description": str(description or ""),
+            "content": str(content or ""),
+            "extension": extension or self.extension_for(snippet_type),
+        }
+
+
+class VSCodeSnippetReader(SnippetReader):
+    """
+    Reads VS Code snippet files, global .code-snippets files with a scope per snippet or
+    language files such as python.json. The language becomes the snippet type.
+    """
+
+    suffixes = (".code-snippets",)
+    # Strings are matched first so comment markers and commas inside them are kept
+    JSONC_PATTERN = re.compile(
+        r'("[^"\\]*(?:\\.[^"\\]*)*")|//[^\n]*|/\*.*?\*/|,(?=\s*[}\]])', re.DOTALL
+    )
+
+    @classmethod
+    def load_jsonc(cls, text: str):
+        """Parse JSON with the comments and trailing commas VS Code allows"""
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return json.loads(
+                cls.JSONC_PATTERN.sub(lambda match: match.group(1) or "", text)
+            )
+
+    @staticmethod
+    def prefix_of(snippet: dict) -> str:
+        prefix = snippet.get("prefix", "")
+        return ", ".join(prefix) if isinstance(prefix, list) else prefix
+
+    def read(self, path: Path):
+        snippets = self.load_jsonc(path.read_text(encoding="utf-8-sig"))
+        file_language = path.stem.lower() if path.suffix == ".json" else ""
+
+        for name, snippet in snippets.items():
+            if not isinstance(snippet, dict) or "body" not in snippet:
+                continue
+            scope = str(snippet.get("scope") or file_language)
+            language = scope.split(",")[0].strip() or "snippets"
+            body = snippet["body"]
+            yield self.snippet(
+                name,
+                language,
+                snippet.get("description") or self.prefix_of(snippet),
+                "\n".join(body) if isinstance(body, list) else body,
+                self.extension_for(language),
+            )
+
+
+class JsonSnippetReader(SnippetReader):
+    """
+    Reads a JSON array of snippet objects, or an object holding one under "snippets", and
+    JSON lines files with one snippet object per line. Files in the VS Code snippet format
+    are handed to the VSCodeSnippetReader.
+
+    JSON lines files and files holding a bare array are streamed, an element at a time,
+    and the array must be strict JSON. Objects, like the VS Code files, are loaded whole.
+    """
+
+    suffixes = (".json", ".jsonl")
+    READ_SIZE = 64 * 1024  # characters read at a time while streaming an array
+    WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+    def read(self, path: Path):
+        with open(path, encoding="utf-8-sig") as file:
+            if path.suffix == ".jsonl":
+                records = (json.loads(line) for line in file if line.strip())
+                yield from self.snippets_from(records)
+                return
+            if file.read(1024).lstrip().startswith("["):
+                file.seek(0)
+                yield from self.snippets_from(self.stream_array(file))
+                return
+
+        data = VSCodeSnippetReader.load_jsonc(path.read_text(encoding="utf-8-sig"))
+
+        if isinstance(data, dict) and isinstance(data.get("snippets"), list):
+            data = data["snippets"]
+        if isinstance(data, dict):
+            yield from VSCodeSnippetReader(self.extension_map).read(path)
+            return
+        yield from self.snippets_from(data)
+
+    @classmethod
+    def stream_array(cls, file):
+        """Yield the elements of the JSON array in a text file, reading it in chunks"""
+        decoder = json.JSONDecoder()
+        buffer, position = "", 0
+
+        def next_character():
+            nonlocal buffer, position
+            while True:
+                position = cls.WHITESPACE.match(buffer, position).end()
+                if position < len(buffer):
+                    return buffer[position]
+                buffer, position = file.read(cls.READ_SIZE), 0
+                if not buffer:
+                    return ""
+
+        if next_character() != "[":
+            raise json.JSONDecodeError("Expecting '['", buffer, position)
+        position += 1
+        if next_character() == "]":
+            return
+
+        while True:
+            next_character()
+            read_size = cls.READ_SIZE
+            # An element cut off by the end of the buffer is decoded again with more text,
+            # read in growing chunks so a large element is not decoded many times
+            while True:
+                try:
+                    element, end = decoder.raw_decode(buffer, position)
+                    error = None
+                except json.JSONDecodeError as e:
+                    error = e
+                if error is None and end < len(buffer):
+                    break
+                chunk = file.read(read_size)
+                if not chunk:
+                    if error is not None:
+                        raise error
+                    break
+                buffer, position = buffer[position:] + chunk, 0
+                read_size *= 2
+
+            yield element
+            position = end
+            separator = next_character()
+            if separator == "]":
+                return
+            if separator != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, position)
+            position += 1
+
+    def snippets_from(self, records):
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            yield self.snippet(
+                _field(record, "name"),
+                _field(record, "type", "language", default="Imported"),
+                _field(record, "description"),
+                _field(record, "content", "body", "code"),
+                _field(record, "extension", default=None),
+            )
+
+
+class CsvSnippetReader(JsonSnippetReader):
+    """Reads a CSV file with a header row naming the snippet columns"""
+
+    suffixes = (".csv",)
+
+    def read(self, path: Path):
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            yield from self.snippets_from(csv.DictReader(file))
+
+
+class DirectorySnippetReader(SnippetReader):
+    """
+    Reads every file of a directory tree whose extension is in the extension map, one
+    snippet per file. Files in a sub folder take the folder's name as their type, files
+    at the top level the language of their extension.
+
+    The tree is walked a directory at a time, in name order within each directory, so
+    the first snippets are read before the rest of the tree is listed.
+    """
+
+    MAX_FILE_SIZE = 1024 * 1024
+
+    def read(self, path: Path):
+        languages = {
+            extension: language
+            for language, extension in self.extension_map.items()
+            if extension
+        }
+
+        for file in self.files(path):
+            language = languages.get(file.suffix.lower())
+            if language is None or not file.is_file():
+                continue
+            if file.stat().st_size > self.MAX_FILE_SIZE:
+                logging.warning(f"Skipping {file}, it is too large to import")
+                continue
+
+            relative = file.relative_to(path)
+            try:
+                content = file.read_text(encoding="utf-8")
+            except (UnicodeDecodeError, OSError) as e:
+                logging.warning(f"Skipping {file}: {e}")
+                continue
+
+            yield self.snippet(
+                file.stem,
+                relative.parts[0] if len(relative.parts) > 1 else language,
+                relative.as_posix(),
+                content,
+                file.suffix.lower(),
+            )
+
+    @staticmethod
+    def files(path: Path):
+        """Lazily list the files of a directory tree, each directory sorted on its own"""
+        for root, directories, files in os.walk(path):
+            directories.sort()  # os.walk descends in the order left in the list
+            for name in sorted(files):
+                yield Path(root, name)
+
+
+class SnippetImporter(QObject):
+    """
+    Streams snippets from files into the database.
+
+    Snippets are read lazily and inserted with executemany, in chunks that each commit on
+    their own and publish their change events as they do, so the UI fills in while the
+    import runs.
+    """
+
+    progress = pyqtSignal(int)  # number of snippets imported so far
+
+    CHUNK_SIZE = 2000
+    readers = [VSCodeSnippetReader, JsonSnippetReader, CsvSnippetReader]
+
+    def __init__(self, snippet_manager, parent=None):
+        super().__init__(parent)
+        self.snippet_manager = snippet_manager
+
+    @classmethod
+    def register_reader(cls, reader) -> None:
+        """Add a SnippetReader subclass, it takes precedence for the suffixes it lists"""
+        cls.readers = [reader] + cls.readers
+
+    @classmethod
+    def file_filter(cls) -> str:
+        """File dialog filter matching every supported file"""
+        suffixes = " ".join(
+            f"*{suffix}" for reader in cls.readers for suffix in reader.suffixes
+        )
+        return f"Snippet files ({suffixes})"
+
+    def reader_for(self, path: Path) -> SnippetReader:
+        if path.is_dir():
+            return DirectorySnippetReader(self.snippet_manager.extension_map)
+        for reader in self.readers:
+            if path.suffix.lower() in reader.suffixes:
+                return reader(self.snippet_manager.extension_map)
+        raise ValueError(f"Unsupported snippet file: {path.name}")
+
+    def read(self, path) -> iter:
+        """Lazily read the snippets of a file or directory"""
+        path = Path(path)
+        return self.reader_for(path).read(path)
+
+    def import_path(self, path) -> int:
+        """
+        Import the snippets of a file or a directory tree.
+
+        Args:
+            path (str | Path): The file or directory to import.
+
+        Returns:
+            int: The number of snippets imported.
+        """
+
+        return self.import_snippets(self.read(path))
+
+    def import_snippets(self, snippets) -> int:
+        """
+        Insert snippet dicts with the IMPORT_COLUMNS keys, CHUNK_SIZE rows per transaction.
+        Types are matched to the existing ones regardless of case, so an imported "sql"
+        goes to the user's "SQL", and new types keep the casing of their first snippet.
+
+        Args:
+            snippets (Iterable[dict]): The snippets to insert.
+
+        Returns:
+            int: The number of snippets inserted.
+        """
+
+        types = {
+            QueryManager.search_key(name): name
+            for name in self.snippet_manager.get_snippet_types()
+        }
+
+        def row(snippet):
+            snippet_type = types.setdefault(
+                QueryManager.search_key(snippet["type"]), snippet["type"]
+            )
+            return tuple(
+                snippet_type if column == "type" else snippet[column]
+                for column in IMPORT_COLUMNS
+            )
+
+        return self.snippet_manager.insert_snippets(
+            (row(snippet) for snippet in snippets),
+            IMPORT_COLUMNS,
+            chunk_size=self.CHUNK_SIZE,
+            progress=self.progress.emit,
+        )
@@ -1,7 +1,23 @@
 from typing import List
+from collections import OrderedDict
+from itertools import islice
+import threading
+import json
 from .database_manager import DatabaseManager
+from .query_manager import QueryManager
+from .search_index import FuzzySearchIndex
+from .usage_tracker import UsageTracker
+from .snippet import Snippet
+from .change_bus import (
+    ChangeBus,
+    SnippetsInserted,
+    SnippetsUpdated,
+    SnippetsDeleted,
+    SnippetsArchived,
+    TypeAdded,
+    TypeRemoved,
+)
 from pathlib import Path
-import polars as pl
 from PyQt6.QtCore import (
     QObject,
     pyqtSignal,
@@ -13,6 +29,15 @@ class SnippetManager(QObject):
 
     snippet_updated = pyqtSignal(int, str)
 
+    MIN_INDEXED_QUERY = 3
+    CONTENT_CACHE_SIZE = 16
+    FUZZY_RESULT_LIMIT = 200
+    # Listings show the most used snippets first, read in the order of the rank index
+    LISTING_ORDER = "s.frecency DESC, s.name_key, s.id"
+    PAGE_SIZE = 50
+    # Columns stored with a casefolded copy, see QueryManager.search_key
+    KEYED_COLUMNS = ("name", "description")
+
     def __init__(self):
         super().__init__()
         # self.file_watcher = QFileSystemWatcher()
@@ -20,7 +45,22 @@ class SnippetManager(QObject):
         # self.temp_files = {}  # {snippet_id: (file_path, process_id)}
         # self.vscode_path = self._find_vscode()
         self.db = DatabaseManager()
-        self.db_release = self.db.read_database("release", "release")
+        self.db_release = self.db.read_value("release", "release")
+        self.search_index = self.db.has_search_index()
+        # Listings keyed by ("snippets", type, archived, columns) and ("types", archived).
+        # Cached lists are shared with callers and must not be mutated.
+        self._cache = {}
+        self._content_cache = OrderedDict()
+        # Reads may run on the data worker thread, loads that started before an
+        # invalidation (older generation) are not stored.
+        self._cache_lock = threading.RLock()
+        self._cache_generation = 0
+        # Built on the first fuzzy search, then kept in step with every write
+        self._fuzzy_index = None
+        # Batched change events, delivered on the thread that created the manager
+        self.changes = ChangeBus(self)
+        # Copies and edits are buffered in memory and written by flush_usage
+        self.usage = UsageTracker(self.db)
         self.extension_map = {
             "": "",
             "python": ".py",
@@ -45,39 +85,347 @@ class SnippetManager(QObject):
         }
 
     def archive_snippet_type(self, snippet_type: str) -> None:
-        self.db.archive_snippet_type(snippet_type)
+        with self.db.connections.writer() as conn:
+            active_id = self._type_id(conn, snippet_type, False)
+            if active_id is None:
+                return
+            snippet_ids = [
+                row[0]
+                for row in conn.execute(QueryManager.snippet_ids_of_type(), (active_id,))
+            ]
+            archived_id = self._type_id(conn, snippet_type, True)
+            if archived_id is None:
+                # The snippets follow their type row, only that row changes
+                conn.execute(
+                    QueryManager.update_query("snippet_types", "archived", "id = ?"),
+                    (1, active_id),
+                )
+            else:
+                conn.execute(
+                    QueryManager.move_snippets_of_type(), (archived_id, active_id)
+                )
+
+        events = [SnippetsArchived(snippet_ids, True), TypeRemoved(snippet_type, False)]
+        if archived_id is None:
+            events.append(TypeAdded(snippet_type, True))
+        self._after_write([snippet_type], events)
+
+    def rename_snippet_type(
+        self, snippet_type: str, new_name: str, archived: bool = False
+    ) -> int:
+        """
+        Renames a type, merging it into the type called new_name when that one exists.
+
+        Args:
+            snippet_type (str): The type to rename.
+            new_name (str): The new name of the type.
+            archived (bool): Rename the type of the archived snippets instead.
+
+        Returns:
+            int: The number of snippets whose type changed.
+        """
+
+        new_name = new_name.strip()
+        if not new_name or new_name == snippet_type:
+            return 0
+
+        with self.db.connections.writer() as conn:
+            type_id = self._type_id(conn, snippet_type, archived)
+            if type_id is None:
+                return 0
+            snippet_ids = json.dumps(
+                [
+                    row[0]
+                    for row in conn.execute(QueryManager.snippet_ids_of_type(), (type_id,))
+                ]
+            )
+            target_id = self._type_id(conn, new_name, archived)
+            if target_id is None:
+                conn.execute(
+                    QueryManager.update_query(
+                        "snippet_types", ["name", "name_key"], "id = ?"
+                    ),
+                    (new_name, QueryManager.search_key(new_name), type_id),
+                )
+            else:
+                conn.execute(QueryManager.move_snippets_of_type(), (target_id, type_id))
+            renamed = self._rows_of_ids(conn, snippet_ids)
+
+        events = [SnippetsUpdated(renamed, ["type"]), TypeRemoved(snippet_type, archived)]
+        if target_id is None:
+            events.insert(0, TypeAdded(new_name, archived))
+        self._after_write({snippet_type, new_name}, events)
+        return len(renamed)
 
-    def perform_search(self, query: str, archived_status: bool = False) -> List:
+    def perform_search(
+        self, query: str, archived_status: bool = False, fuzzy: bool = False
+    ) -> List:
         """
         Performs the search operation on the snippets based on the query provided.
+        Searches run against the FTS5 index and are ranked by bm25, with name matches first.
 
         Args:
-            query (str): The search query.
+            query (str): The search query. A '*' extends the search to the snippet content.
+            fuzzy (bool): Rank fuzzy subsequence matches of name, description and type instead.
 
         Returns:
             List: A list of snippets that match the search query. If the query is empty, returns all snippets.
         """
 
+        return self.search_page(query, archived_status, fuzzy, page_size=None)[0]
+
+    def search_page(
+        self,
+        query: str,
+        archived_status: bool = False,
+        fuzzy: bool = False,
+        cursor: tuple = None,
+        page_size: int = PAGE_SIZE,
+    ) -> tuple:
+        """
+        Reads one page of the results of perform_search. Pages continue from a keyset
+        cursor, so later pages cost the same as the first and never skip or repeat a row.
+
+        Args:
+            query (str): The search query, see perform_search.
+            cursor (tuple): The cursor returned with the previous page, None for the first page.
+            page_size (int): The number of snippets per page, None for every result at once.
+
+        Returns:
+            tuple: The snippets of the page and the cursor of the next page, None after the last one.
+        """
+
+        search_content = "*" in query
+        query = query.replace("*", "", 1) if search_content else query
+
         if not query:  # Blank search essentially
-            return [snippet for snippet in self.get_snippets(archived=archived_status)]
-        if "*" in query:  # Wildcard search
-            query = query.replace("*", "", 1)
-            return [
-                snippet
-                for snippet in self.get_snippets(archived=archived_status)
-                if query.lower() in snippet["description"].lower()
-                or query.lower() in snippet["name"].lower()
-                or query.lower() in snippet["content"].lower()
-            ]
+            return self.list_page(
+                archived=archived_status, cursor=cursor, page_size=page_size
+            )
+
+        if fuzzy:
+            # The cursor holds the ranked ids that are still to be listed
+            if cursor is None:
+                cursor = self.fuzzy_index.search(
+                    query, archived_status, limit=self.FUZZY_RESULT_LIMIT
+                )
+            page_size = page_size or len(cursor)
+            return (
+                self.get_snippets_by_ids(list(cursor[:page_size])),
+                tuple(cursor[page_size:]) or None,
+            )
+
+        archived_condition = self._archived_condition(archived_status)
 
-        # All normal search results
+        # The trigram tokenizer cannot match terms shorter than three characters
+        if len(query) < self.MIN_INDEXED_QUERY or not self.search_index:
+            key = QueryManager.search_key(query)
+            if len(query) < self.MIN_INDEXED_QUERY and not search_content:
+                # Names and descriptions starting with the query, looked up in the NOCASE
+                # key indexes
+                pattern = QueryManager.like_prefix(key)
+                return self._listing_page(
+                    [archived_condition],
+                    [pattern, pattern],
+                    cursor,
+                    page_size,
+                    source=QueryManager.prefix_match_source(),
+                )
+            if len(query) < self.MIN_INDEXED_QUERY:
+                # Content has no key index, every snippet is scanned
+                pattern = QueryManager.like_prefix(key)
+                matches = [
+                    "s.name_key LIKE ? ESCAPE '\\'",
+                    "s.description_key LIKE ? ESCAPE '\\'",
+                ]
+                params = [pattern, pattern]
+            else:
+                matches = ["instr(s.name_key, ?) > 0", "instr(s.description_key, ?) > 0"]
+                params = [key, key]
+            if search_content:
+                matches.append("instr(lower(s.content), ?) > 0")
+                params.append(query.lower())
+            return self._listing_page(
+                [f"({' OR '.join(matches)})", archived_condition],
+                params,
+                cursor,
+                page_size,
+            )
+
+        phrase = '"' + query.replace('"', '""') + '"'
+        match = phrase if search_content else "{name description} : " + phrase
+
+        # Snippets used less than once recently get no boost. The floor is kept in the
+        # cursor so every page is ranked alike.
+        floor = UsageTracker.key_at(-1) if cursor is None else cursor[0]
+        rows = self.db.query_rows(
+            QueryManager.search_query(
+                QueryManager.listing_columns(),
+                archived_condition,
+                after=cursor is not None,
+            ),
+            (floor, match, *(cursor[1:] if cursor else ()), self._limit(page_size)),
+            row_factory=self._keyed_row,
+        )
+        return self._page(rows, page_size, lambda snippet, score: (floor, score, snippet.id))
+
+    def list_page(
+        self,
+        snippet_type: str = None,
+        archived: bool = False,
+        cursor: tuple = None,
+        page_size: int = PAGE_SIZE,
+    ) -> tuple:
+        """
+        Reads one page of list_snippets, continuing from a keyset cursor. The first page
+        of each type is cached.
+
+        Args:
+            snippet_type (str): The snippet type to filter by, every type when None.
+            cursor (tuple): The cursor returned with the previous page, None for the first page.
+            page_size (int): The number of snippets per page, None for every snippet at once.
+
+        Returns:
+            tuple: The snippets of the page and the cursor of the next page, None after the last one.
+        """
+
+        cache_key = ("page", snippet_type, archived, page_size)
+        if cursor is None:
+            with self._cache_lock:
+                if cache_key in self._cache:
+                    return self._cache[cache_key]
+                generation = self._cache_generation
+
+        conditions = [self._archived_condition(archived)]
+        params = []
+        if snippet_type:
+            conditions.append("t.name = ?")
+            params.append(snippet_type)
+        page = self._listing_page(conditions, params, cursor, page_size)
+
+        if cursor is None:
+            self._store_cached(cache_key, page, generation)
+        return page
+
+    def _listing_page(
+        self,
+        conditions: List[str],
+        params: List,
+        cursor: tuple,
+        page_size: int,
+        source: str = QueryManager.SNIPPET_SOURCE,
+    ) -> tuple:
+        """
+        Reads the page of source rows after cursor in LISTING_ORDER, params bind the
+        placeholders of source first, then those of conditions.
+        """
+        if cursor is not None:
+            frecency, name_key, snippet_id = cursor
+            conditions = conditions + [QueryManager.listing_after(frecency is not None)]
+            if frecency is not None:
+                params = params + [frecency, frecency]
+            params = params + [name_key, snippet_id]
+        rows = self.db.query_rows(
+            f"SELECT {QueryManager.listing_columns()}, s.name_key "
+            f"FROM {source} "
+            f"WHERE {' AND '.join(conditions)} "
+            f"ORDER BY {self.LISTING_ORDER} LIMIT ?",
+            params + [self._limit(page_size)],
+            row_factory=self._keyed_row,
+        )
+        return self._page(
+            rows,
+            page_size,
+            lambda snippet, name_key: (snippet.frecency, name_key, snippet.id),
+        )
+
+    @staticmethod
+    def _limit(page_size: int) -> int:
+        """LIMIT of a page query, one row more than the page to tell whether another follows"""
+        return -1 if page_size is None else page_size + 1
+
+    @staticmethod
+    def _keyed_row(cursor, row: tuple) -> tuple:
+        """Row factory of the page queries, the snippet and the sort key selected last"""
+        return Snippet.row_factory(cursor, row), row[-1]
+
+    @staticmethod
+    def _page(rows: List, page_size: int, cursor_of) -> tuple:
+        """
+        Split the rows read with _limit into the page and the cursor of the next one.
+        cursor_of returns the keyset of a snippet from the snippet and its sort key.
+        """
+        snippets = [snippet for snippet, _ in rows]
+        if page_size is None or len(rows) <= page_size:
+            return snippets, None
+        return snippets[:page_size], cursor_of(*rows[page_size - 1])
+
+    @property
+    def fuzzy_index(self) -> FuzzySearchIndex:
+        """The in-memory fuzzy search index, loaded from the database on first use"""
+        with self._cache_lock:
+            if self._fuzzy_index is None:
+                index = FuzzySearchIndex()
+                index.load(
+                    self.db.stream_rows(
+                        QueryManager.SNIPPET_SOURCE,
+                        "s.id, s.name, s.description, t.name, t.archived",
+                    )
+                )
+                self._fuzzy_index = index
+            return self._fuzzy_index
+
+    def get_snippets_by_ids(self, snippet_ids: List[int]) -> List:
+        """
+        Lists the given snippets without their content, in the order of the ids.
+
+        Args:
+            snippet_ids (List[int]): The ids of the snippets.
+
+        Returns:
+            List: Snippets as returned by list_snippets.
+        """
+
+        if not snippet_ids:
+            return []
+
+        rows = self.db.read_rows(
+            QueryManager.SNIPPET_SOURCE,
+            QueryManager.listing_columns(),
+            QueryManager.ids_condition("s.id"),
+            params=(json.dumps(snippet_ids),),
+            row_factory=Snippet.row_factory,
+        )
+        by_id = {row.id: row for row in rows}
+        return [by_id[snippet_id] for snippet_id in snippet_ids if snippet_id in by_id]
+
+    @staticmethod
+    def refine_search(search_results: List, query: str) -> List:
+        """
+        Narrows the results of a name/description search to a longer query starting with the same text,
+        keeping their ranking without going back to the database.
+
+        Args:
+            search_results (List): The results of the previous search.
+            query (str): The extended search query.
+
+        Returns:
+            List: The snippets still matching the query.
+        """
+
+        query = query.casefold()
         return [
             snippet
-            for snippet in self.get_snippets(archived=archived_status)
-            if query.lower() in snippet["description"].lower()
-            or query.lower() in snippet["name"].lower()
+            for snippet in search_results
+            if query in snippet.name.casefold()
+            or query in snippet.description.casefold()
         ]
 
+    @staticmethod
+    def _archived_condition(archived: bool) -> str:
+        """Build the WHERE clause fragment filtering SNIPPET_SOURCE on the archived status"""
+        return f"t.archived = {1 if archived else 0}"
+
     def get_snippet_types(self, archived: bool = False) -> List:
         """
         Gets the unique snippet types from the database.
@@ -86,31 +434,31 @@ class SnippetManager(QObject):
             List: A sorted list of unique snippet types.
         """
 
-        if archived:
-            snippet_types: pl.DataFrame = self.db.read_database(
-                table_name="snippets",
-                columns="type",
-                group="type",
-                conditions="archived = 'Y'",
-            )
-            results = sorted(snippet_types["type"], key=str.casefold)
-        else:
-            snippet_types: pl.DataFrame = self.db.read_database(
-                table_name="snippets",
-                columns="type",
-                group="type",
-                conditions="(archived = 'N' OR archived IS NULL)",
+        cache_key = ("types", archived)
+        with self._cache_lock:
+            if cache_key in self._cache:
+                return self._cache[cache_key]
+            generation = self._cache_generation
+
+        results = [
+            row[0]
+            for row in self.db.stream_rows(
+                table_name="snippet_types",
+                columns="name",
+                conditions=f"archived = {1 if archived else 0} AND snippet_count > 0",
+                order="display_order, name_key",
             )
-            results = sorted(snippet_types["type"], key=str.casefold)
+        ]
 
+        self._store_cached(cache_key, results, generation)
         return results
 
     def check_archive_status(self, snippet_type: str) -> bool:
         if snippet_type:
-            archived_status: pl.DataFrame = self.db.read_database(
-                "snippets", "archived", "type = ?", params=(snippet_type[0],)
+            archived_status = self.db.read_value(
+                "snippet_types", "archived", "name = ?", params=(snippet_type[0],)
             )
-            if archived_status.is_empty() or archived_status["archived"][0] == "N":
+            if archived_status is None or archived_status == 0:
                 return True
             return False
         return True
@@ -123,41 +471,313 @@ class SnippetManager(QObject):
 
         Args:
             snippet_type (str): The snippet type to filter by.
+            columns (str): Columns of QueryManager.SNIPPET_SOURCE, every snippet column for "*".
 
         Returns:
-            List: A list of dictionaries containing the snippets.
+            List: The snippets, as Snippet records holding the selected columns.
         """
 
-        if snippet_type and not archived:
-            results = self.db.read_database(
-                "snippets",
-                f"{columns}",
-                conditions="type = ? AND (archived = 'N' OR archived IS NULL)",
-                params=(snippet_type,),
-            ).to_dicts()
-        elif snippet_type and archived:
-            results = self.db.read_database(
-                "snippets",
-                f"{columns}",
-                conditions="type = ? AND archived = 'Y'",
+        cache_key = ("snippets", snippet_type, archived, columns)
+        with self._cache_lock:
+            if cache_key in self._cache:
+                return self._cache[cache_key]
+            generation = self._cache_generation
+
+        source = QueryManager.SNIPPET_SOURCE
+        selected = QueryManager.snippet_columns() if columns == "*" else columns
+        conditions = self._archived_condition(archived)
+        if snippet_type:
+            results = self.db.read_rows(
+                source,
+                selected,
+                conditions=f"t.name = ? AND {conditions}",
+                order=self.LISTING_ORDER,
                 params=(snippet_type,),
-            ).to_dicts()
-        elif not snippet_type and archived:
-            results = self.db.read_database(
-                "snippets",
-                f"{columns}",
-                conditions="archived = 'Y'",
-            ).to_dicts()
+                row_factory=Snippet.row_factory,
+            )
         else:
-            results = self.db.read_database(
-                "snippets",
-                f"{columns}",
-                conditions="(archived = 'N' OR archived IS NULL)",
-            ).to_dicts()
+            results = self.db.read_rows(
+                source,
+                selected,
+                conditions=conditions,
+                order=self.LISTING_ORDER,
+                row_factory=Snippet.row_factory,
+            )
 
+        self._store_cached(cache_key, results, generation)
         return results
 
-    def save_snippet(self, new_snippet: dict) -> None:
+    def invalidate_cache(self, snippet_types=None) -> None:
+        """
+        Drops cached listings affected by a change to the given snippet types.
+        Listings across all types and the type lists are always dropped, passing None clears everything.
+
+        Args:
+            snippet_types (Iterable[str]): The snippet types that were changed.
+        """
+
+        with self._cache_lock:
+            self._cache_generation += 1
+            if snippet_types is None:
+                self._cache.clear()
+                return
+
+            snippet_types = set(snippet_types)
+            for key in list(self._cache):
+                if key[0] == "types" or key[1] is None or key[1] in snippet_types:
+                    del self._cache[key]
+
+    def default_extension(self, snippet_type: str, archived: bool = False) -> str:
+        """
+        The extension new snippets of a type start with, the first one of the type.
+
+        Args:
+            snippet_type (str): The snippet type.
+            archived (bool): Look at the archived snippets of the type instead.
+
+        Returns:
+            str: The extension, or None when the type has no snippets with one.
+        """
+
+        return self.db.query_rows(
+            QueryManager.default_extension(),
+            (snippet_type, 1 if archived else 0),
+            row_factory=lambda cursor, row: row[0],
+        )[0]
+
+    def record_usage(self, snippet_id: int, kind: str = "copy") -> None:
+        """
+        Buffers a use of a snippet in memory, it counts towards the frecency ranking once
+        flush_usage writes it.
+
+        Args:
+            snippet_id (int): The id of the snippet.
+            kind (str): "copy" or "edit", edits weigh less than copies.
+        """
+
+        self.usage.record(snippet_id, kind)
+
+    def flush_usage(self) -> int:
+        """
+        Writes the buffered usage in one transaction and drops the cached listings, so the
+        next listing comes back in the new order. Rows already listed are not reordered.
+
+        Returns:
+            int: The number of snippets whose usage was written.
+        """
+
+        flushed = self.usage.flush()
+        if flushed:
+            self.invalidate_cache()
+        return len(flushed)
+
+    def has_snippets(self, archived: bool = False) -> bool:
+        """Check whether any snippet is active, or archived, from the type rows alone"""
+        return (
+            self.db.read_value(
+                "snippet_types",
+                "1",
+                f"archived = {1 if archived else 0} AND snippet_count > 0",
+            )
+            is not None
+        )
+
+    @staticmethod
+    def _has_type(conn, snippet_type: str, archived: bool) -> bool:
+        """Check, on the connection of the current write, whether a type has snippets"""
+        return (
+            conn.execute(
+                QueryManager.type_exists(), (snippet_type, 1 if archived else 0)
+            ).fetchone()
+            is not None
+        )
+
+    @staticmethod
+    def _type_id(conn, snippet_type: str, archived: bool, create: bool = False) -> int:
+        """The id of the row of a type, None when there is none and create is not set"""
+        params = (snippet_type, 1 if archived else 0)
+        if create:
+            conn.execute(
+                QueryManager.add_snippet_type(),
+                params + (QueryManager.search_key(snippet_type),),
+            )
+        row = conn.execute(QueryManager.snippet_type_id(), params).fetchone()
+        return row[0] if row else None
+
+    def _snippet_values(self, conn, snippet: dict, current: Snippet = None) -> tuple:
+        """
+        Map the fields of a snippet dict to snippets columns, the type name and archived flag
+        are replaced by the type_id of their row, which is created when needed.
+
+        Args:
+            conn (sqlite3.Connection): The connection of the current write.
+            snippet (dict): The fields to write, keyed by column name in any casing.
+            current (Snippet): The snippet being updated, as returned by get_snippet.
+
+        Returns:
+            tuple: The columns, their values, and the type and archived flag written.
+        """
+
+        fields = {key.lower(): value for key, value in snippet.items()}
+        fields.pop("id", None)
+        for column in self.KEYED_COLUMNS:
+            if column in fields:
+                fields[f"{column}_key"] = QueryManager.search_key(fields[column])
+        snippet_type = fields.pop("type", current.type if current else None)
+        archived = bool(fields.pop("archived", current.archived if current else 0))
+        if current is None or (snippet_type, archived) != (
+            current.type,
+            bool(current.archived),
+        ):
+            fields["type_id"] = self._type_id(conn, snippet_type, archived, create=True)
+        return list(fields), tuple(fields.values()), snippet_type, archived
+
+    def _after_write(self, snippet_types, events, content_ids=()) -> None:
+        """
+        Once the write commits, drop the cached listings of the changed types and the
+        cached content of the changed snippets, bring the fuzzy index up to date and
+        publish the change events.
+
+        Args:
+            snippet_types (Iterable[str]): The snippet types that were changed, None for all.
+            events (List[ChangeEvent]): The changes, in the order they happened.
+            content_ids (Iterable[int]): The snippets whose content may have changed.
+        """
+
+        def apply():
+            self.invalidate_cache(snippet_types)
+            with self._cache_lock:
+                for snippet_id in content_ids:
+                    self._content_cache.pop(snippet_id, None)
+            if self._fuzzy_index is not None:
+                self._apply_to_index(self._fuzzy_index, events)
+            self.changes.publish(*events)
+
+        self.db.after_commit(apply)
+
+    @staticmethod
+    def _apply_to_index(index: FuzzySearchIndex, events) -> None:
+        for event in events:
+            if isinstance(event, (SnippetsInserted, SnippetsUpdated)):
+                for snippet in event.snippets:
+                    index.upsert(
+                        snippet.id,
+                        snippet.name,
+                        snippet.description,
+                        snippet.type,
+                        snippet.archived,
+                    )
+            elif isinstance(event, SnippetsDeleted):
+                for snippet_id in event.snippet_ids:
+                    index.remove(snippet_id)
+            elif isinstance(event, SnippetsArchived):
+                index.set_archived(event.snippet_ids, 1 if event.archived else 0)
+
+    def _store_cached(self, cache_key: tuple, results, generation: int) -> None:
+        """Cache results unless the cache was invalidated while they were loading"""
+        with self._cache_lock:
+            if generation == self._cache_generation:
+                self._cache[cache_key] = results
+
+    def list_snippets(self, snippet_type: str = None, archived: bool = False) -> List:
+        """
+        Lists snippets without their content, which can be fetched with get_snippet_content.
+
+        Args:
+            snippet_type (str): The snippet type to filter by.
+
+        Returns:
+            List: Snippets with id, name, description, type, extension, content_length and frecency.
+        """
+
+        return self.get_snippets(
+            snippet_type, columns=QueryManager.listing_columns(), archived=archived
+        )
+
+    def get_snippet_content(self, snippet_id: int) -> str:
+        """
+        Gets the content of a single snippet, keeping the most recently used bodies in memory.
+
+        Args:
+            snippet_id (int): The id of the snippet.
+
+        Returns:
+            str: The snippet content, or an empty string if the snippet no longer exists.
+        """
+
+        with self._cache_lock:
+            if snippet_id in self._content_cache:
+                self._content_cache.move_to_end(snippet_id)
+                return self._content_cache[snippet_id]
+            generation = self._cache_generation
+
+        content = self.db.read_value(
+            "snippets", "content", "id = ?", params=(snippet_id,), default=""
+        )
+        with self._cache_lock:
+            if generation == self._cache_generation:
+                self._content_cache[snippet_id] = content
+                if len(self._content_cache) > self.CONTENT_CACHE_SIZE:
+                    self._content_cache.popitem(last=False)
+        return content
+
+    def get_content_preview(self, snippet_id: int, length: int) -> str:
+        """
+        Gets the start of a snippet's content, such as for a tooltip. Only the preview is
+        read from the database, and bodies read this way are not kept in the content cache.
+
+        Args:
+            snippet_id (int): The id of the snippet.
+            length (int): The number of characters to read at most.
+
+        Returns:
+            str: The first length characters of the content, or an empty string if the
+                snippet no longer exists.
+        """
+
+        with self._cache_lock:
+            content = self._content_cache.get(snippet_id)
+        if content is not None:
+            return content[:length]
+        return self.db.read_value(
+            "snippets",
+            "substr(content, 1, ?)",
+            "id = ?",
+            params=(length, snippet_id),
+            default="",
+        )
+
+    def get_snippet(self, snippet_id: int, conn=None) -> Snippet:
+        """
+        Lists a single snippet without its content.
+
+        Args:
+            snippet_id (int): The id of the snippet.
+            conn (sqlite3.Connection): Read through this connection, to see the current write.
+
+        Returns:
+            Snippet: The listing columns and the archived flag, or None if the snippet does not exist.
+        """
+
+        columns = f"{QueryManager.listing_columns()}, t.archived"
+        if conn is None:
+            rows = self.db.read_rows(
+                QueryManager.SNIPPET_SOURCE,
+                columns,
+                "s.id = ?",
+                params=(snippet_id,),
+                row_factory=Snippet.row_factory,
+            )
+            return rows[0] if rows else None
+
+        cursor = conn.execute(
+            f"SELECT {columns} FROM {QueryManager.SNIPPET_SOURCE} WHERE s.id = ?",
+            (snippet_id,),
+        )
+        row = cursor.fetchone()
+        return Snippet.row_factory(cursor, row) if row else None
+
+    def save_snippet(self, new_snippet: dict) -> Snippet:
         """
         Saves the created snippet to the database.
         values contain: name, type, description, content, file extension
@@ -166,35 +786,137 @@ class SnippetManager(QObject):
             new_snippet (dict): A dictionary containing the snippet details.
 
         Returns:
-            None
+            Snippet: The saved snippet as returned by get_snippet.
+        """
+
+        with self.db.connections.writer() as conn:
+            columns, values, snippet_type, archived = self._snippet_values(
+                conn, new_snippet
+            )
+            type_added = not self._has_type(conn, snippet_type, archived)
+            snippet_id = self.db.insert_data("snippets", columns, values)
+            snippet = self.get_snippet(snippet_id, conn)
+
+        events = [TypeAdded(snippet_type, archived)] if type_added else []
+        events.append(SnippetsInserted([snippet]))
+        self._after_write([snippet_type], events)
+        return snippet
+
+    def insert_snippets(
+        self, rows, columns, chunk_size: int = 2000, progress=None
+    ) -> int:
+        """
+        Bulk insert snippets with executemany, committing every chunk_size rows. Each chunk
+        publishes its change events when it commits, so only one chunk is held in memory.
+
+        Args:
+            rows (Iterable[tuple]): Values in the order of columns, consumed lazily.
+            columns (Sequence[str]): The snippet columns the values are for.
+            chunk_size (int): Rows inserted per transaction.
+            progress (Callable[[int], None]): Called with the running total after each chunk.
+
+        Returns:
+            int: The number of snippets inserted.
         """
 
-        columns: list[str] = list(new_snippet.keys())
-        values: tuple[str] = tuple(new_snippet.values())
+        # The type names are swapped for the ids of their rows chunk by chunk, and the
+        # search keys of the keyed columns are appended to each row
+        columns = [column.lower() for column in columns]
+        type_column = columns.index("type")
+        columns[type_column] = "type_id"
+        keyed = [columns.index(column) for column in self.KEYED_COLUMNS if column in columns]
+        insert = QueryManager.insert_query(
+            "snippets", columns + [f"{columns[index]}_key" for index in keyed]
+        )
+        existing_types = set(self.get_snippet_types())
+        rows = iter(rows)
 
-        self.db.insert_data("snippets", columns, values)
+        inserted = 0
+        while chunk := list(islice(rows, chunk_size)):
+            with self.db.connections.writer() as conn:
+                type_ids = {
+                    snippet_type: self._type_id(conn, snippet_type, False, create=True)
+                    for snippet_type in {row[type_column] for row in chunk}
+                }
+                last_id = conn.execute(QueryManager.max_snippet_id()).fetchone()[0]
+                conn.executemany(
+                    insert,
+                    (
+                        row[:type_column]
+                        + (type_ids[row[type_column]],)
+                        + row[type_column + 1 :]
+                        + tuple(QueryManager.search_key(row[index]) for index in keyed)
+                        for row in chunk
+                    ),
+                )
+                cursor = conn.execute(
+                    QueryManager.snippets_after_id(
+                        f"{QueryManager.listing_columns()}, t.archived"
+                    ),
+                    (last_id,),
+                )
+                snippets = [
+                    Snippet.row_factory(cursor, row) for row in cursor.fetchall()
+                ]
+
+                new_types = type_ids.keys() - existing_types
+                existing_types |= new_types
+                self._after_write(
+                    None,
+                    [
+                        TypeAdded(snippet_type, False)
+                        for snippet_type in sorted(new_types, key=str.casefold)
+                    ]
+                    + [SnippetsInserted(snippets)],
+                )
+            inserted += len(snippets)
+            if progress:
+                progress(inserted)
+
+        return inserted
 
     def update_existing_snippet(
-        self, new_snippet: dict, existing_snippet: dict
-    ) -> None:
+        self, new_snippet: dict, existing_snippet: Snippet
+    ) -> Snippet:
         """
         Updates an existing snippet in the database.
 
         Args:
             new_snippet (dict): A dictionary containing the updated snippet details.
-            existing_snippet (dict): A dictionary containing the existing snippet details.
+            existing_snippet (Snippet): The snippet being edited.
 
         Returns:
-            None
+            Snippet: The updated snippet as returned by get_snippet.
         """
 
-        columns: list[str] = [key for key in new_snippet.keys() if key != "id"]
-        values: tuple[str] = tuple(new_snippet[key] for key in columns)
-        condition: str = f"id = {existing_snippet['id']}"
+        fields: list[str] = [key for key in new_snippet.keys() if key != "id"]
+        snippet_id = existing_snippet.id
+
+        with self.db.connections.writer() as conn:
+            previous = self.get_snippet(snippet_id, conn)
+            if previous is None:
+                return None
+            columns, values, new_type, archived = self._snippet_values(
+                conn, new_snippet, previous
+            )
+            old_type, was_archived = previous.type, bool(previous.archived)
+            type_added = not self._has_type(conn, new_type, archived)
+            if columns:
+                self.db.update_database(
+                    "snippets", columns, values, "id = ?", params=(snippet_id,)
+                )
+            snippet = self.get_snippet(snippet_id, conn)
+
+            events = [SnippetsUpdated([snippet], fields)]
+            if type_added:
+                events.insert(0, TypeAdded(new_type, archived))
+            if not self._has_type(conn, old_type, was_archived):
+                events.append(TypeRemoved(old_type, was_archived))
 
-        self.db.update_database("snippets", columns, values, condition)
+        self._after_write({old_type, new_type}, events, content_ids=[snippet_id])
+        return snippet
 
-    def delete_snippet(self, snippet_id: int) -> None:
+    def delete_snippet(self, snippet_id: int) -> Snippet:
         """
         Deletes a snippet from the database using the snippet id.
 
@@ -202,10 +924,189 @@ class SnippetManager(QObject):
             snippet_id (int): The id of the snippet to delete.
 
         Returns:
-            None
+            Snippet: The deleted snippet as returned by get_snippet beforehand.
+        """
+
+        with self.db.connections.writer() as conn:
+            snippet = self.get_snippet(snippet_id, conn)
+            if snippet is None:
+                return None
+            self.db.delete_data("snippets", "id = ?", params=(snippet_id,))
+            type_removed = not self._has_type(conn, snippet.type, snippet.archived)
+
+        events = [SnippetsDeleted([snippet_id])]
+        if type_removed:
+            events.append(TypeRemoved(snippet.type, snippet.archived))
+        self._after_write([snippet.type], events, content_ids=[snippet_id])
+        return snippet
+
+    def delete_snippets(self, snippet_ids) -> int:
+        """
+        Deletes a set of snippets with a single statement.
+
+        Args:
+            snippet_ids (Iterable[int]): The ids of the snippets to delete.
+
+        Returns:
+            int: The number of snippets deleted.
+        """
+
+        ids = json.dumps(list(snippet_ids))
+        with self.db.connections.writer() as conn:
+            deleted = self._rows_of_ids(conn, ids)
+            if not deleted:
+                return 0
+            conn.execute(
+                QueryManager.delete_data("snippets", QueryManager.ids_condition()), (ids,)
+            )
+            removed = self._missing_types(conn, deleted)
+
+        deleted_ids = [row.id for row in deleted]
+        self._after_write(
+            {row.type for row in deleted},
+            [SnippetsDeleted(deleted_ids)]
+            + [TypeRemoved(snippet_type, archived) for snippet_type, archived in removed],
+            content_ids=deleted_ids,
+        )
+        return len(deleted)
+
+    def archive_snippets(self, snippet_ids) -> int:
+        """
+        Archives a set of snippets with a single statement.
+
+        Args:
+            snippet_ids (Iterable[int]): The ids of the snippets to archive.
+
+        Returns:
+            int: The number of snippets that were not archived yet.
+        """
+
+        return self._set_archived(snippet_ids, True)
+
+    def unarchive_snippets(self, snippet_ids) -> int:
+        """
+        Restores a set of archived snippets with a single statement.
+
+        Args:
+            snippet_ids (Iterable[int]): The ids of the snippets to restore.
+
+        Returns:
+            int: The number of snippets that were archived.
+        """
+
+        return self._set_archived(snippet_ids, False)
+
+    def retype_snippets(self, snippet_ids, snippet_type: str) -> int:
         """
+        Moves a set of snippets to another type with a single statement.
+
+        Args:
+            snippet_ids (Iterable[int]): The ids of the snippets to move.
+            snippet_type (str): The new type.
+
+        Returns:
+            int: The number of snippets whose type changed.
+        """
+
+        return self._update_snippets(snippet_ids, "type", snippet_type)
+
+    def change_extension(self, snippet_ids, extension: str) -> int:
+        """
+        Sets the file extension of a set of snippets with a single statement.
+
+        Args:
+            snippet_ids (Iterable[int]): The ids of the snippets to change.
+            extension (str): The new file extension.
+
+        Returns:
+            int: The number of snippets whose extension changed.
+        """
+
+        return self._update_snippets(snippet_ids, "extension", extension)
+
+    def _set_archived(self, snippet_ids, archived: bool) -> int:
+        ids = json.dumps(list(snippet_ids))
+        with self.db.connections.writer() as conn:
+            changed = [
+                row
+                for row in self._rows_of_ids(conn, ids)
+                if bool(row.archived) != archived
+            ]
+            if not changed:
+                return 0
+            added = self._missing_types(
+                conn, [row.replace(archived=archived) for row in changed]
+            )
+            for snippet_type in {row.type for row in changed}:
+                self._type_id(conn, snippet_type, archived, create=True)
+            conn.execute(
+                QueryManager.move_snippets_to_archived(),
+                (int(archived), int(archived), ids),
+            )
+            removed = self._missing_types(conn, changed)
+
+        self._after_write(
+            {row.type for row in changed},
+            [TypeAdded(snippet_type, flag) for snippet_type, flag in added]
+            + [SnippetsArchived([row.id for row in changed], archived)]
+            + [TypeRemoved(snippet_type, flag) for snippet_type, flag in removed],
+        )
+        return len(changed)
+
+    def _update_snippets(self, snippet_ids, column: str, value: str) -> int:
+        """Set one listing column of a set of snippets, publishing the type changes it causes"""
+        ids = json.dumps(list(snippet_ids))
+        with self.db.connections.writer() as conn:
+            changed = [
+                row for row in self._rows_of_ids(conn, ids) if getattr(row, column) != value
+            ]
+            if not changed:
+                return 0
+            changed_ids = json.dumps([row.id for row in changed])
+            added = []
+            if column == "type":
+                added = self._missing_types(
+                    conn, [row.replace(type=value) for row in changed]
+                )
+                for archived in {bool(row.archived) for row in changed}:
+                    self._type_id(conn, value, archived, create=True)
+                conn.execute(QueryManager.retype_snippets(), (value, changed_ids))
+            else:
+                conn.execute(
+                    QueryManager.update_query(
+                        "snippets", column, QueryManager.ids_condition()
+                    ),
+                    (value, changed_ids),
+                )
+            updated = self._rows_of_ids(conn, changed_ids)
+            removed = self._missing_types(conn, changed) if column == "type" else []
+
+        snippet_types = {row.type for row in changed} | {row.type for row in updated}
+        self._after_write(
+            snippet_types,
+            [TypeAdded(snippet_type, archived) for snippet_type, archived in added]
+            + [SnippetsUpdated(updated, [column])]
+            + [TypeRemoved(snippet_type, archived) for snippet_type, archived in removed],
+        )
+        return len(changed)
+
+    @staticmethod
+    def _rows_of_ids(conn, ids: str) -> List:
+        """Listing rows, with the archived flag, of the ids in a JSON array"""
+        cursor = conn.execute(
+            f"SELECT {QueryManager.listing_columns()}, t.archived "
+            f"FROM {QueryManager.SNIPPET_SOURCE} WHERE {QueryManager.ids_condition('s.id')}",
+            (ids,),
+        )
+        return [Snippet.row_factory(cursor, row) for row in cursor.fetchall()]
 
-        self.db.delete_data("snippets", f"id = {snippet_id}")
+    def _missing_types(self, conn, rows) -> List:
+        """The distinct (type, archived) pairs of rows that currently have no snippets"""
+        pairs = {(row.type, bool(row.archived)) for row in rows}
+        return sorted(
+            (pair for pair in pairs if not self._has_type(conn, *pair)),
+            key=lambda pair: (pair[0].casefold(), pair[1]),
+        )
 
     # =========== VS CODE INTEGRATION BELOW ===========
     # TODO:
@@ -0,0 +1,110 @@
+import json
+import math
+import threading
+import time
+from .database_manager import DatabaseManager
+from .query_manager import QueryManager
+
+
+class UsageTracker:
+    """
+    Write-behind buffer of snippet usage.
+
+    Recording a copy or an edit only touches an in-memory dict. flush writes everything
+    buffered since the last flush in one transaction: the usage counters in snippet_usage
+    and the frecency key of each snippet, which listings and searches are ordered by.
+
+    Frecency is usage decayed with a half life. Stored as the base 2 log of the decayed
+    weights scaled to the epoch, it only grows with new uses, and ordering by it orders
+    by the current decayed score without ever rewriting untouched rows.
+    """
+
+    HALF_LIFE = 7 * 24 * 60 * 60  # seconds for a use to count half as much
+    WEIGHTS = {"copy": 1.0, "edit": 0.5}
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+        self._pending = {}  # {snippet_id: [uses, weight, last used]}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(self, snippet_id: int, kind: str = "copy", used_at: float = None) -> None:
+        """Buffer one use of a snippet, nothing is written until the next flush"""
+        used_at = time.time() if used_at is None else used_at
+        # Each use adds its weight scaled to the epoch, summed in the log domain
+        weight = math.log2(self.WEIGHTS.get(kind, 1.0)) + used_at / self.HALF_LIFE
+        with self._lock:
+            self._merge(snippet_id, 1, weight, used_at)
+
+    def _merge(self, snippet_id: int, uses: int, weight: float, used_at: float) -> None:
+        entry = self._pending.get(snippet_id)
+        if entry is None:
+            self._pending[snippet_id] = [uses, weight, used_at]
+            return
+        entry[0] += uses
+        entry[1] = self.log_add(entry[1], weight)
+        entry[2] = max(entry[2], used_at)
+
+    def flush(self) -> list:
+        """
+        Write the buffered usage in a single transaction.
+
+        Returns:
+            list: The ids of the snippets whose usage was written. Buffered uses of
+                snippets deleted in the meantime are dropped.
+        """
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return []
+
+        try:
+            with self.db.connections.writer() as conn:
+                frecency = dict(
+                    conn.execute(
+                        QueryManager.frecency_of_ids(), (json.dumps(list(pending)),)
+                    ).fetchall()
+                )
+                conn.executemany(
+                    QueryManager.record_usage(),
+                    (
+                        (snippet_id, pending[snippet_id][0], pending[snippet_id][2])
+                        for snippet_id in frecency
+                    ),
+                )
+                conn.executemany(
+                    QueryManager.update_query("snippets", "frecency", "id = ?"),
+                    (
+                        (self.log_add(key, pending[snippet_id][1]), snippet_id)
+                        for snippet_id, key in frecency.items()
+                    ),
+                )
+        except Exception:
+            # Keep the uses for the next flush
+            with self._lock:
+                for snippet_id, entry in pending.items():
+                    self._merge(snippet_id, *entry)
+            raise
+        return list(frecency)
+
+    @classmethod
+    def key_at(cls, score: float, now: float = None) -> float:
+        """
+        The frecency key of snippets whose decayed usage is 2**score at a point in time,
+        a single use right now scores 0.
+        """
+        now = time.time() if now is None else now
+        return score + now / cls.HALF_LIFE
+
+    @staticmethod
+    def log_add(a: float, b: float) -> float:
+        """log2(2**a + 2**b) without overflowing, None stands for no usage"""
+        if a is None:
+            return b
+        if b is None:
+            return a
+        high, low = (a, b) if a >= b else (b, a)
+        return high + math.log2(1 + 2 ** (low - high))
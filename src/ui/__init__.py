@@ -1,4 +1,3 @@
 from src.ui.themes import acorn, dracula, matcha, themes_manager
 from src.data import database_manager
 from src.utils import utils
-from src.ui.highlighters.syntax_manager import PythonHighlighter
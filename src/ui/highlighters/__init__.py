@@ -1,5 +1,4 @@
 from src.ui.highlighters.syntax_manager import (
-    PythonHighlighter,
-    SQLHighlighter,
+    GenericSyntaxHighlighter,
     HighlighterManager,
 )
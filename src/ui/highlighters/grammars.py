@@ -0,0 +1,399 @@
+"""
+The grammars of the languages snippets can be highlighted in, declared as data.
+
+Each entry maps a file extension to the arguments of a Grammar: rules are (role, pattern)
+pairs tried in their listed order, a list of words instead of a pattern matches any of
+them as a keyword, and spans are (role, open, close) delimiters that can run over several
+lines. This module is only imported by HighlighterManager the first time a snippet needs
+highlighting.
+"""
+
+NUMBER = ("number", r"\b[0-9]+(?:\.[0-9]+)?\b")
+HEX_NUMBER = ("number", r"\b0[xX][0-9a-fA-F]+\b|\b[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?\b")
+FUNCTION = ("function", r"\b\w+(?=\()")
+CLASS_NAME = ("class", r"(?<=\bclass )\w+")
+DOUBLE_QUOTED = ("string", r'"(?:[^"\\]|\\.)*"')
+SINGLE_QUOTED = ("string", r"'(?:[^'\\]|\\.)*'")
+CHAR = ("string", r"'(?:[^'\\]|\\.)'")
+LINE_COMMENT = ("comment", r"//.*")
+HASH_COMMENT = ("comment", r"#.*")
+BLOCK_COMMENT = ("comment", "/*", "*/")
+
+PYTHON_KEYWORDS = """
+    and assert break class continue def del elif else except exec finally for from global
+    if import in is lambda not or pass print raise return try while yield None True False
+""".split()
+
+SQL_KEYWORDS = (
+    # SQL Commands
+    "SELECT INSERT UPDATE DELETE CREATE ALTER DROP TRUNCATE GRANT REVOKE COMMIT ROLLBACK "
+    "SAVEPOINT "
+    # Clauses
+    "FROM WHERE GROUP BY HAVING ORDER LIMIT OFFSET JOIN INNER OUTER LEFT RIGHT FULL CROSS "
+    "UNION ALL "
+    # Operators and conditionals
+    "AND OR NOT IN BETWEEN LIKE IS NULL AS ON CASE WHEN THEN ELSE END EXISTS ANY SOME WITH "
+    # Data types
+    "INT INTEGER SMALLINT TINYINT MEDIUMINT BIGINT DECIMAL NUMERIC FLOAT DOUBLE REAL DATE "
+    "DATETIME TIMESTAMP TIME YEAR CHAR VARCHAR TEXT TINYTEXT MEDIUMTEXT LONGTEXT BINARY "
+    "VARBINARY BLOB TINYBLOB MEDIUMBLOB LONGBLOB ENUM SET BOOLEAN BOOL "
+    # Constraints and table definitions
+    "PRIMARY KEY FOREIGN REFERENCES UNIQUE CHECK DEFAULT AUTO_INCREMENT INDEX CONSTRAINT "
+    # Functions
+    "COUNT SUM AVG MIN MAX CURRENT_TIMESTAMP NOW CONCAT SUBSTRING TRIM LENGTH UPPER LOWER "
+    "COALESCE NULLIF"
+).split()
+
+JAVASCRIPT_KEYWORDS = """
+    async await break case catch class const continue debugger default delete do else
+    export extends false finally for from function get if import in instanceof let new null
+    of return set static super switch this throw true try typeof undefined var void while
+    with yield
+""".split()
+
+TYPESCRIPT_KEYWORDS = JAVASCRIPT_KEYWORDS + """
+    abstract any as boolean declare enum implements interface keyof namespace never number
+    private protected public readonly string symbol type unknown
+""".split()
+
+C_KEYWORDS = """
+    auto break case char const continue default do double else enum extern float for goto
+    if inline int long register restrict return short signed sizeof static struct switch
+    typedef union unsigned void volatile while NULL true false bool
+""".split()
+
+CPP_KEYWORDS = C_KEYWORDS + """
+    alignas alignof catch class constexpr consteval decltype delete explicit friend
+    mutable namespace new noexcept nullptr operator override private protected public
+    static_cast dynamic_cast reinterpret_cast const_cast template this throw try typename
+    using virtual final
+""".split()
+
+JAVA_KEYWORDS = """
+    abstract assert boolean break byte case catch char class const continue default do
+    double else enum extends final finally float for if implements import instanceof int
+    interface long native new package private protected public return short static super
+    switch synchronized this throw throws transient try var void volatile while record
+    true false null
+""".split()
+
+GO_KEYWORDS = """
+    break case chan const continue default defer else fallthrough for func go goto if
+    import interface map package range return select struct switch type var true false nil
+    iota bool byte rune string error int int8 int16 int32 int64 uint uint8 uint16 uint32
+    uint64 uintptr float32 float64 complex64 complex128 any
+""".split()
+
+RUST_KEYWORDS = """
+    as async await break const continue crate dyn else enum extern false fn for if impl in
+    let loop match mod move mut pub ref return self Self static struct super trait true
+    type unsafe use where while i8 i16 i32 i64 i128 isize u8 u16 u32 u64 u128 usize f32
+    f64 bool char str
+""".split()
+
+PHP_KEYWORDS = """
+    abstract and array as break callable case catch class clone const continue declare
+    default do echo else elseif empty enddeclare endfor endforeach endif endswitch endwhile
+    enum extends final finally fn for foreach function global goto if implements include
+    include_once instanceof insteadof interface isset list match namespace new or print
+    private protected public readonly require require_once return static switch throw
+    trait try unset use var while xor yield true false null
+""".split()
+
+RUBY_KEYWORDS = """
+    BEGIN END alias and begin break case class def defined do else elsif end ensure false
+    for if in module next nil not or redo rescue retry return self super then true undef
+    unless until when while yield require attr_accessor attr_reader attr_writer
+""".split()
+
+SHELL_KEYWORDS = """
+    if then else elif fi case esac for select while until do done in function return
+    local export readonly declare unset shift break continue exit source echo set
+""".split()
+
+POWERSHELL_KEYWORDS = """
+    begin break catch class continue data do dynamicparam else elseif end enum exit filter
+    finally for foreach function if in param process return switch throw trap try until
+    using while
+""".split()
+
+POWERSHELL_OPERATORS = """
+    eq ne gt ge lt le like notlike match notmatch contains notcontains in notin replace
+    and or not xor is isnot as band bor f split join
+""".split()
+
+DOCKERFILE_INSTRUCTIONS = """
+    FROM RUN CMD LABEL MAINTAINER EXPOSE ENV ADD COPY ENTRYPOINT VOLUME USER WORKDIR ARG
+    ONBUILD STOPSIGNAL HEALTHCHECK SHELL AS
+""".split()
+
+CSS_KEYWORDS = """
+    inherit initial unset revert auto none solid dashed dotted block inline flex grid
+    absolute relative fixed sticky bold normal italic transparent
+""".split()
+
+GRAMMARS = {
+    ".py": {
+        "spans": [("string", "'''", "'''"), ("string", '"""', '"""')],
+        "rules": [
+            HASH_COMMENT,
+            SINGLE_QUOTED,
+            DOUBLE_QUOTED,
+            CLASS_NAME,
+            ("keyword", PYTHON_KEYWORDS),
+            FUNCTION,
+            NUMBER,
+        ],
+    },
+    ".sql": {
+        "spans": [BLOCK_COMMENT],
+        "rules": [
+            ("comment", r"--.*"),
+            ("string", r"'[^']*'"),
+            ("string", r'"[^"]*"'),
+            # Table/column identifiers (backticks in MySQL)
+            ("function", r"`[^`]*`"),
+            ("keyword", SQL_KEYWORDS),
+            NUMBER,
+            # Parentheses and brackets
+            ("function", r"[()\[\]{}]"),
+            # Operators
+            ("keyword", r"[=<>!]+"),
+        ],
+        "ignore_case": True,
+    },
+    ".js": {
+        "spans": [BLOCK_COMMENT, ("string", "`", "`")],
+        "rules": [
+            LINE_COMMENT,
+            SINGLE_QUOTED,
+            DOUBLE_QUOTED,
+            CLASS_NAME,
+            ("keyword", JAVASCRIPT_KEYWORDS),
+            FUNCTION,
+            HEX_NUMBER,
+        ],
+    },
+    ".ts": {
+        "spans": [BLOCK_COMMENT, ("string", "`", "`")],
+        "rules": [
+            LINE_COMMENT,
+            SINGLE_QUOTED,
+            DOUBLE_QUOTED,
+            CLASS_NAME,
+            ("keyword", TYPESCRIPT_KEYWORDS),
+            FUNCTION,
+            HEX_NUMBER,
+        ],
+    },
+    ".html": {
+        "spans": [("comment", "<!--", "-->")],
+        "rules": [
+            # Tag names
+            ("keyword", r"</?[A-Za-z][\w-]*|/?>"),
+            # Attribute names
+            ("function", r"\b[\w-]+(?==)"),
+            DOUBLE_QUOTED,
+            SINGLE_QUOTED,
+            # Character references
+            ("number", r"&#?\w+;"),
+        ],
+    },
+    ".css": {
+        "spans": [BLOCK_COMMENT],
+        "rules": [
+            DOUBLE_QUOTED,
+            SINGLE_QUOTED,
+            # At-rules and !important
+            ("keyword", r"@[\w-]+|!important\b"),
+            # Colors, then numbers with their unit
+            ("number", r"#[0-9a-fA-F]{3,8}\b"),
+            ("number", r"-?\b[0-9]+(?:\.[0-9]+)?(?:%|[a-z]+\b)?"),
+            # Properties
+            ("function", r"[\w-]+(?=\s*:)"),
+            # Class and id selectors
+            ("class", r"[.#][A-Za-z_][\w-]*"),
+            ("keyword", CSS_KEYWORDS),
+        ],
+    },
+    ".json": {
+        "rules": [
+            # Keys
+            ("function", r'"(?:[^"\\]|\\.)*"(?=\s*:)'),
+            DOUBLE_QUOTED,
+            ("keyword", ["true", "false", "null"]),
+            ("number", r"-?\b[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?\b"),
+        ],
+    },
+    ".md": {
+        "spans": [("string", "```", "```")],
+        "rules": [
+            # Headings, quotes and list markers
+            ("keyword", r"^#{1,6}\s.*"),
+            ("comment", r"^>.*"),
+            ("number", r"^\s*(?:[-*+]|[0-9]+\.)(?=\s)"),
+            ("string", r"`[^`]*`"),
+            ("class", r"\*\*[^*]+\*\*|__[^_]+__"),
+            # Links and images
+            ("function", r"!?\[[^\]]*\]\([^)]*\)"),
+        ],
+    },
+    ".yml": {
+        "rules": [
+            DOUBLE_QUOTED,
+            SINGLE_QUOTED,
+            ("comment", r"(?:^|(?<=\s))#.*"),
+            # Document markers and keys
+            ("keyword", r"^(?:---|\.\.\.)$"),
+            ("function", r"[\w.-]+(?=\s*:(?:\s|$))"),
+            # Anchors, aliases and tags
+            ("class", r"[&*][\w-]+|!!?\w+"),
+            ("keyword", ["true", "false", "null", "yes", "no", "on", "off"]),
+            NUMBER,
+        ],
+    },
+    ".dockerfile": {
+        "rules": [
+            HASH_COMMENT,
+            DOUBLE_QUOTED,
+            SINGLE_QUOTED,
+            ("keyword", DOCKERFILE_INSTRUCTIONS),
+            # Variables
+            ("class", r"\$\{[^}]*\}|\$\w+"),
+            NUMBER,
+        ],
+        "ignore_case": True,
+    },
+    ".sh": {
+        "rules": [
+            ("comment", r"(?:^|(?<=\s))#.*"),
+            DOUBLE_QUOTED,
+            ("string", r"'[^']*'"),
+            # Variables
+            ("class", r"\$\{[^}]*\}|\$[\w@#?$!*-]"),
+            ("keyword", SHELL_KEYWORDS),
+            ("function", r"\b[\w-]+(?=\s*\(\))"),
+            NUMBER,
+        ],
+    },
+    ".ps1": {
+        "spans": [
+            ("comment", "<#", "#>"),
+            ("string", '@"', '"@'),
+            ("string", "@'", "'@"),
+        ],
+        "rules": [
+            HASH_COMMENT,
+            DOUBLE_QUOTED,
+            ("string", r"'[^']*'"),
+            # Variables
+            ("class", r"\$[\w:]+"),
+            # Cmdlets, verb-noun
+            ("function", r"\b[A-Za-z]+-[A-Za-z]\w*\b"),
+            ("keyword", r"(?i:-(?:" + "|".join(POWERSHELL_OPERATORS) + r")\b)"),
+            ("keyword", POWERSHELL_KEYWORDS),
+            NUMBER,
+        ],
+        "ignore_case": True,
+    },
+    ".rs": {
+        "spans": [BLOCK_COMMENT],
+        "rules": [
+            LINE_COMMENT,
+            DOUBLE_QUOTED,
+            CHAR,
+            # Macros
+            ("function", r"\b\w+!"),
+            ("keyword", RUST_KEYWORDS),
+            # Types
+            ("class", r"\b[A-Z]\w*"),
+            FUNCTION,
+            HEX_NUMBER,
+        ],
+    },
+    ".go": {
+        "spans": [BLOCK_COMMENT, ("string", "`", "`")],
+        "rules": [
+            LINE_COMMENT,
+            DOUBLE_QUOTED,
+            CHAR,
+            ("keyword", GO_KEYWORDS),
+            FUNCTION,
+            HEX_NUMBER,
+        ],
+    },
+    ".cpp": {
+        "spans": [BLOCK_COMMENT],
+        "rules": [
+            LINE_COMMENT,
+            # Preprocessor directives
+            ("keyword", r"^\s*#\s*\w+"),
+            DOUBLE_QUOTED,
+            CHAR,
+            CLASS_NAME,
+            ("keyword", CPP_KEYWORDS),
+            FUNCTION,
+            HEX_NUMBER,
+        ],
+    },
+    ".c": {
+        "spans": [BLOCK_COMMENT],
+        "rules": [
+            LINE_COMMENT,
+            # Preprocessor directives
+            ("keyword", r"^\s*#\s*\w+"),
+            DOUBLE_QUOTED,
+            CHAR,
+            ("keyword", C_KEYWORDS),
+            FUNCTION,
+            HEX_NUMBER,
+        ],
+    },
+    ".java": {
+        "spans": [BLOCK_COMMENT],
+        "rules": [
+            LINE_COMMENT,
+            DOUBLE_QUOTED,
+            CHAR,
+            # Annotations
+            ("class", r"@\w+"),
+            CLASS_NAME,
+            ("keyword", JAVA_KEYWORDS),
+            FUNCTION,
+            HEX_NUMBER,
+        ],
+    },
+    ".php": {
+        "spans": [BLOCK_COMMENT],
+        "rules": [
+            ("keyword", r"<\?(?:php)?|\?>"),
+            LINE_COMMENT,
+            HASH_COMMENT,
+            SINGLE_QUOTED,
+            DOUBLE_QUOTED,
+            # Variables
+            ("class", r"\$\w+"),
+            CLASS_NAME,
+            ("keyword", PHP_KEYWORDS),
+            FUNCTION,
+            HEX_NUMBER,
+        ],
+        "ignore_case": True,
+    },
+    ".rb": {
+        "spans": [("comment", "=begin", "=end")],
+        "rules": [
+            HASH_COMMENT,
+            SINGLE_QUOTED,
+            DOUBLE_QUOTED,
+            # Symbols, instance and class variables
+            ("number", r"(?<!:):\w+"),
+            ("class", r"@{1,2}\w+"),
+            ("keyword", RUBY_KEYWORDS),
+            # Constants
+            ("class", r"\b[A-Z]\w*"),
+            FUNCTION,
+            NUMBER,
+        ],
+    },
+}
@@ -1,310 +1,310 @@
-from PyQt6.QtCore import QRegularExpression
+from functools import cached_property
+from itertools import accumulate
+import time
+import re
+import weakref
+
+from PyQt6 import sip
+from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QColor, QTextCharFormat, QFont, QSyntaxHighlighter, QPalette
 from PyQt6.QtWidgets import QApplication
 
 
-class GenericSyntaxHighlighter(QSyntaxHighlighter):
-    """Base class for all syntax highlighters"""
+def keywords_pattern(keywords, ignore_case: bool = False) -> str:
+    """Pattern matching any of the words, longest first"""
+    words = "|".join(sorted(keywords, key=len, reverse=True))
+    return rf"(?i:\b(?:{words})\b)" if ignore_case else rf"\b(?:{words})\b"
 
-    def __init__(self, document):
-        super().__init__(document)
 
-        # Get colors from application palette
-        app = QApplication.instance()
-        if app:
-            palette = app.palette()
-            self.keyword_color = palette.color(
-                QPalette.ColorRole.Base
-            ).name()
-            self.string_color = palette.color(QPalette.ColorRole.Link).name()
-            self.comment_color = palette.color(
-                QPalette.ColorRole.AlternateBase
-            ).name()
-            self.function_color = palette.color(QPalette.ColorRole.BrightText).name()
-            self.text_color = palette.color(QPalette.ColorRole.Text).name()
-
-        # Initialize empty rules list
-        self.highlighting_rules = []
+class Grammar:
+    """
+    The token rules of a language, compiled once per process into a single alternation.
 
-    def highlightBlock(self, text):
-        """Apply highlighting to the given text block"""
-        for pattern, format in self.highlighting_rules:
-            match_iterator = pattern.globalMatch(text)
-            while match_iterator.hasNext():
-                match = match_iterator.next()
-                self.setFormat(match.capturedStart(), match.capturedLength(), format)
+    Rules are (role, pattern) pairs, patterns may only use non-capturing groups, and a list
+    of words in place of a pattern matches any of them, ignoring case if ignore_case is
+    set. Spans are (role, open, close) delimiters such as block comments that can run over
+    several lines. At any position the spans are tried first, then the rules in their
+    listed order, and the leftmost match wins.
+    """
 
+    def __init__(self, rules, spans=(), ignore_case: bool = False):
+        self.rules = [
+            (role, keywords_pattern(pattern, ignore_case))
+            if isinstance(pattern, list)
+            else (role, pattern)
+            for role, pattern in rules
+        ]
+        self.spans = list(spans)
 
-class HighlighterManager:
-    def __init__(self):
-        self.highlighters = {
-            ".py": PythonHighlighter,
-            ".sql": SQLHighlighter,
-        }
+    @cached_property
+    def pattern(self) -> re.Pattern:
+        """The combined alternation, group n matches the n-th span or rule"""
+        alternatives = [re.escape(open_) for _, open_, _ in self.spans] + [
+            pattern for _, pattern in self.rules
+        ]
+        return re.compile("|".join(f"({alternative})" for alternative in alternatives))
 
+    @cached_property
+    def roles(self) -> tuple:
+        """The role of each group of pattern, indexed by group number"""
+        return (None,) + tuple(role for role, *_ in self.spans + self.rules)
 
-class PythonHighlighter(GenericSyntaxHighlighter):
-    """Python-specific syntax highlighter"""
+    @cached_property
+    def closers(self) -> tuple:
+        """The compiled closing delimiter of each span, indexed by span state"""
+        return (None,) + tuple(re.compile(re.escape(close)) for *_, close in self.spans)
 
-    def __init__(self, document):
-        super().__init__(document)
 
-        # Set up highlighting rules
-        # Keywords
-        keyword_format = QTextCharFormat()
-        keyword_format.setForeground(QColor(self.keyword_color))
-        keyword_format.setFontWeight(QFont.Weight.Bold)
-
-        keywords = [
-            "and",
-            "assert",
-            "break",
-            "class",
-            "continue",
-            "def",
-            "del",
-            "elif",
-            "else",
-            "except",
-            "exec",
-            "finally",
-            "for",
-            "from",
-            "global",
-            "if",
-            "import",
-            "in",
-            "is",
-            "lambda",
-            "not",
-            "or",
-            "pass",
-            "print",
-            "raise",
-            "return",
-            "try",
-            "while",
-            "yield",
-            "None",
-            "True",
-            "False",
-        ]
+class GenericSyntaxHighlighter(QSyntaxHighlighter):
+    """
+    Syntax highlighter of every language, driven by the Grammar it is given.
 
-        for word in keywords:
-            pattern = QRegularExpression("\\b" + word + "\\b")
-            self.highlighting_rules.append((pattern, keyword_format))
-
-        # Strings
-        string_format = QTextCharFormat()
-        string_format.setForeground(QColor(self.string_color))
-
-        # Single-quoted strings
-        self.highlighting_rules.append((QRegularExpression("'[^']*'"), string_format))
-        # Double-quoted strings
-        self.highlighting_rules.append((QRegularExpression('"[^"]*"'), string_format))
-
-        # Functions
-        function_format = QTextCharFormat()
-        function_format.setForeground(QColor(self.function_color))
-        self.highlighting_rules.append(
-            (QRegularExpression("\\b[A-Za-z0-9_]+(?=\\()"), function_format)
-        )
-
-        # Comments
-        comment_format = QTextCharFormat()
-        comment_format.setForeground(QColor(self.comment_color))
-        self.highlighting_rules.append((QRegularExpression("#[^\n]*"), comment_format))
-
-        # Numbers
-        number_format = QTextCharFormat()
-        number_format.setForeground(QColor(self.string_color))
-        self.highlighting_rules.append(
-            (QRegularExpression("\\b[0-9]+\\b"), number_format)
-        )
-
-        # Class names
-        class_format = QTextCharFormat()
-        class_format.setForeground(QColor(self.function_color))
-        class_format.setFontWeight(QFont.Weight.Bold)
-        self.highlighting_rules.append(
-            (QRegularExpression("\\bclass\\s+([A-Za-z0-9_]+)"), class_format)
-        )
-
-
-class SQLHighlighter(GenericSyntaxHighlighter):
-    """SQL syntax highlighter implementation"""
-
-    def __init__(self, document):
+    Each block is scanned once, left to right, with the grammar of its language. The block
+    state is 0 outside a span and the 1-based index of the span a block ends in otherwise,
+    so a block comment or string opened on one line carries over to the next ones.
+
+    Documents larger than DEFERRED_SIZE characters that are shown in an editor are not
+    highlighted up front. The blocks in view are highlighted first, then the rest of the
+    document in time slices on the event loop, and above VIEWPORT_ONLY_SIZE only the blocks
+    scrolled into view are. A block that was never highlighted keeps the state -1.
+    """
+
+    DEFERRED_SIZE = 100_000
+    VIEWPORT_ONLY_SIZE = 2_000_000
+    SLICE_MS = 10
+
+    # Shared by every highlighter, rebuilt from the palette by refresh_theme
+    _formats = None
+    _instances = weakref.WeakSet()
+
+    def __init__(self, document, grammar: Grammar, editor=None):
         super().__init__(document)
+        self.grammar = grammar
+        GenericSyntaxHighlighter._instances.add(self)
+        self.editor = None
+        self.deferred = False
+        if editor is not None and document.characterCount() > self.DEFERRED_SIZE:
+            self._defer(editor)
+
+    def _defer(self, editor) -> None:
+        """Highlight the document of editor progressively, starting with the visible blocks"""
+        self.editor = editor
+        self.deferred = True
+        self.viewport_only = self.document().characterCount() > self.VIEWPORT_ONLY_SIZE
+        self._wanted = range(0)  # block numbers highlightBlock may format for the first time
+        self._next_block = 0
+        self._slice_blocks = 8
+
+        self._viewport_timer = QTimer(self)
+        self._viewport_timer.setSingleShot(True)
+        self._viewport_timer.timeout.connect(self._highlight_viewport)
+        self._slice_timer = QTimer(self)
+        self._slice_timer.timeout.connect(self._highlight_slice)
+
+        scroll_bar = editor.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self._schedule_viewport)
+        scroll_bar.rangeChanged.connect(self._schedule_viewport)
+        self.document().contentsChange.connect(self._schedule_viewport)
+        self._viewport_timer.start(0)
+        if not self.viewport_only:
+            self._slice_timer.start(0)
+
+    def _schedule_viewport(self, *_args) -> None:
+        self._viewport_timer.start(0)
+
+    def _highlight_from(self, block, count: int) -> None:
+        """
+        Highlight count blocks from block in a single pass. Qt carries on to the next block
+        while the state of a block changes, which a block highlighted for the first time
+        always does, and highlightBlock stops the pass at the first block not wanted.
+        """
+        number = block.blockNumber()
+        self._wanted = range(number, number + count)
+        try:
+            self.rehighlightBlock(block)
+        finally:
+            self._wanted = range(0)
+
+    def _highlight_viewport(self) -> None:
+        """Highlight the blocks in view that were never highlighted"""
+        if not self.deferred:
+            return
+        viewport = self.editor.viewport().rect()
+        first = self.editor.cursorForPosition(viewport.topLeft()).block()
+        last = self.editor.cursorForPosition(viewport.bottomRight()).blockNumber()
+        block = first
+        while block.isValid() and block.blockNumber() <= last:
+            if block.userState() < 0:
+                self._highlight_from(block, last + 1 - block.blockNumber())
+            block = block.next()
+
+    def _highlight_slice(self) -> None:
+        """Highlight the next blocks of the document, sized to take about SLICE_MS"""
+        block = self.document().findBlockByNumber(self._next_block)
+        while block.isValid() and block.userState() >= 0:
+            block = block.next()
+        if not block.isValid():
+            self._slice_timer.stop()
+            self.deferred = False
+            return
+
+        started = time.perf_counter()
+        self._highlight_from(block, self._slice_blocks)
+        elapsed = (time.perf_counter() - started) * 1000
+        self._next_block = block.blockNumber()
+        # Keep the slices close to SLICE_MS whatever the length of the lines
+        if elapsed < self.SLICE_MS / 2:
+            self._slice_blocks *= 2
+        elif elapsed > self.SLICE_MS * 2:
+            self._slice_blocks = max(1, self._slice_blocks // 2)
+
+    def refresh(self) -> None:
+        """Re-highlight with the current formats, a deferred document starts over"""
+        if self.editor is None:
+            self.rehighlight()
+            return
+        block = self.document().firstBlock()
+        while block.isValid():
+            block.setUserState(-1)
+            block = block.next()
+        self.deferred = True
+        self._next_block = 0
+        self._highlight_viewport()
+        if not self.viewport_only:
+            self._slice_timer.start(0)
+
+    @classmethod
+    def formats(cls) -> dict:
+        """The character format of each role, from the current application palette"""
+        if GenericSyntaxHighlighter._formats is None:
+            palette = QApplication.instance().palette()
+            colors = {
+                "keyword": palette.color(QPalette.ColorRole.Base),
+                "string": palette.color(QPalette.ColorRole.Link),
+                "number": palette.color(QPalette.ColorRole.Link),
+                "comment": palette.color(QPalette.ColorRole.AlternateBase),
+                "function": palette.color(QPalette.ColorRole.BrightText),
+                "class": palette.color(QPalette.ColorRole.BrightText),
+            }
+            formats = {}
+            for role, color in colors.items():
+                text_format = QTextCharFormat()
+                text_format.setForeground(QColor(color))
+                if role in ("keyword", "class"):
+                    text_format.setFontWeight(QFont.Weight.Bold)
+                formats[role] = text_format
+            GenericSyntaxHighlighter._formats = formats
+        return GenericSyntaxHighlighter._formats
+
+    @classmethod
+    def refresh_theme(cls) -> None:
+        """Rebuild the formats from the palette of a newly applied theme and re-highlight"""
+        GenericSyntaxHighlighter._formats = None
+        for highlighter in list(GenericSyntaxHighlighter._instances):
+            if not sip.isdeleted(highlighter):
+                highlighter.refresh()
 
-        # Keyword format
-        keyword_format = QTextCharFormat()
-        keyword_format.setForeground(QColor(self.keyword_color))
-        keyword_format.setFontWeight(QFont.Weight.Bold)
-
-        # SQL keywords
-        keywords = [
-            # SQL Commands
-            "SELECT",
-            "INSERT",
-            "UPDATE",
-            "DELETE",
-            "CREATE",
-            "ALTER",
-            "DROP",
-            "TRUNCATE",
-            "GRANT",
-            "REVOKE",
-            "COMMIT",
-            "ROLLBACK",
-            "SAVEPOINT",
-            # Clauses
-            "FROM",
-            "WHERE",
-            "GROUP",
-            "BY",
-            "HAVING",
-            "ORDER",
-            "LIMIT",
-            "OFFSET",
-            "JOIN",
-            "INNER",
-            "OUTER",
-            "LEFT",
-            "RIGHT",
-            "FULL",
-            "CROSS",
-            "UNION",
-            "ALL",
-            # Operators and conditionals
-            "AND",
-            "OR",
-            "NOT",
-            "IN",
-            "BETWEEN",
-            "LIKE",
-            "IS",
-            "NULL",
-            "AS",
-            "ON",
-            "CASE",
-            "WHEN",
-            "THEN",
-            "ELSE",
-            "END",
-            "EXISTS",
-            "ANY",
-            "SOME",
-            "WITH",
-            # Data types
-            "INT",
-            "INTEGER",
-            "SMALLINT",
-            "TINYINT",
-            "MEDIUMINT",
-            "BIGINT",
-            "DECIMAL",
-            "NUMERIC",
-            "FLOAT",
-            "DOUBLE",
-            "REAL",
-            "DATE",
-            "DATETIME",
-            "TIMESTAMP",
-            "TIME",
-            "YEAR",
-            "CHAR",
-            "VARCHAR",
-            "TEXT",
-            "TINYTEXT",
-            "MEDIUMTEXT",
-            "LONGTEXT",
-            "BINARY",
-            "VARBINARY",
-            "BLOB",
-            "TINYBLOB",
-            "MEDIUMBLOB",
-            "LONGBLOB",
-            "ENUM",
-            "SET",
-            "BOOLEAN",
-            "BOOL",
-            # Constraints and table definitions
-            "PRIMARY",
-            "KEY",
-            "FOREIGN",
-            "REFERENCES",
-            "UNIQUE",
-            "CHECK",
-            "DEFAULT",
-            "AUTO_INCREMENT",
-            "INDEX",
-            "CONSTRAINT",
-            # Functions
-            "COUNT",
-            "SUM",
-            "AVG",
-            "MIN",
-            "MAX",
-            "CURRENT_TIMESTAMP",
-            "NOW",
-            "CONCAT",
-            "SUBSTRING",
-            "TRIM",
-            "LENGTH",
-            "UPPER",
-            "LOWER",
-            "COALESCE",
-            "NULLIF",
-        ]
+    def highlightBlock(self, text):
+        """Apply highlighting to the given text block"""
+        if self.deferred:
+            block = self.currentBlock()
+            if block.userState() < 0 and block.blockNumber() not in self._wanted:
+                return
+
+        grammar = self.grammar
+        formats = self.formats()
+        roles = grammar.roles
+        spans = len(grammar.spans)
+        # Qt positions count UTF-16 code units, which differ from str indices only
+        # when the block has characters outside the BMP
+        units = None
+        if not text.isascii() and max(text) > "\uffff":
+            units = list(
+                accumulate((2 if char > "\uffff" else 1 for char in text), initial=0)
+            )
+
+        def set_format(start, end, role):
+            if units is not None:
+                start, end = units[start], units[end]
+            self.setFormat(start, end - start, formats[role])
+
+        position = 0
+        state = self.previousBlockState()
+        if state > 0:
+            close = grammar.closers[state].search(text)
+            if close is None:
+                set_format(0, len(text), roles[state])
+                self.setCurrentBlockState(state)
+                return
+            set_format(0, close.end(), roles[state])
+            position = close.end()
+
+        self.setCurrentBlockState(0)
+        search = grammar.pattern.search
+        while match := search(text, position):
+            group = match.lastindex
+            end = match.end()
+            if group <= spans:
+                close = grammar.closers[group].search(text, end)
+                if close is None:
+                    set_format(match.start(), len(text), roles[group])
+                    self.setCurrentBlockState(group)
+                    return
+                end = close.end()
+            set_format(match.start(), end, roles[group])
+            position = end
 
-        # Add SQL keywords (case-insensitive)
-        for keyword in keywords:
-            pattern = QRegularExpression(
-                "\\b(?i)" + keyword + "\\b"
-            )  # (?i) makes it case-insensitive
-            self.highlighting_rules.append((pattern, keyword_format))
-
-        # String format
-        string_format = QTextCharFormat()
-        string_format.setForeground(QColor(self.string_color))
-
-        # String literals - single quotes
-        self.highlighting_rules.append((QRegularExpression("'[^']*'"), string_format))
-        # String literals - double quotes
-        self.highlighting_rules.append((QRegularExpression('"[^"]*"'), string_format))
-
-        # Number format
-        number_format = QTextCharFormat()
-        number_format.setForeground(QColor(self.string_color))
-        # Integers
-        self.highlighting_rules.append(
-            (QRegularExpression("\\b[0-9]+\\b"), number_format)
-        )
-        # Decimals
-        self.highlighting_rules.append(
-            (QRegularExpression("\\b[0-9]+\\.[0-9]+\\b"), number_format)
-        )
-
-        # Comment format
-        comment_format = QTextCharFormat()
-        comment_format.setForeground(QColor(self.comment_color))
-        # Single line comments (--)
-        self.highlighting_rules.append((QRegularExpression("--[^\n]*"), comment_format))
-        # Multi-line comments (/* */)
-        self.highlighting_rules.append(
-            (QRegularExpression("/\\*[^*]*\\*+(?:[^/*][^*]*\\*+)*/"), comment_format)
-        )
-
-        # Table/column identifiers format (for backticks in MySQL)
-        function_format = QTextCharFormat()
-        function_format.setForeground(QColor(self.function_color))
-        self.highlighting_rules.append((QRegularExpression("`[^`]*`"), function_format))
-
-        # Parentheses and brackets
-        self.highlighting_rules.append(
-            (QRegularExpression("[\\(\\)\\[\\]\\{\\}]"), function_format)
-        )
-
-        # Operators
-        self.highlighting_rules.append((QRegularExpression("[=<>!]+"), keyword_format))
+
+class HighlighterManager:
+    """
+    Registry of the grammars of every extension that can be highlighted.
+
+    The grammars are declared as data in the grammars module, which is only imported the
+    first time a snippet is highlighted. The Grammar of an extension is built on its first
+    request and kept for the rest of the process, its pattern compiles on first use.
+    """
+
+    _grammars = {}
+
+    @classmethod
+    def grammar(cls, extension: str) -> Grammar:
+        """
+        The grammar of a file extension.
+
+        Args:
+            extension (str): File extension including the dot, such as ".py".
+
+        Returns:
+            Grammar: The grammar, or None when the extension has none.
+        """
+        grammar = cls._grammars.get(extension)
+        if grammar is None:
+            from src.ui.highlighters.grammars import GRAMMARS
+
+            spec = GRAMMARS.get(extension)
+            if spec is None:
+                return None
+            grammar = cls._grammars[extension] = Grammar(**spec)
+        return grammar
+
+    @classmethod
+    def highlighter(
+        cls, document, extension: str, editor=None
+    ) -> GenericSyntaxHighlighter:
+        """
+        Highlight a document with the grammar of a file extension.
+
+        Args:
+            document (QTextDocument): Document to highlight.
+            extension (str): File extension including the dot.
+            editor (QTextEdit): Editor showing the document, lets large documents be
+                highlighted progressively.
+
+        Returns:
+            GenericSyntaxHighlighter: The highlighter, or None when the extension has no
+                grammar.
+        """
+        grammar = cls.grammar(extension)
+        if grammar is None:
+            return None
+        return GenericSyntaxHighlighter(document, grammar, editor)
@@ -13,6 +13,8 @@ from PyQt6.QtWidgets import (
     QDialog,
     QStyle,
     QPushButton,
+    QFileDialog,
+    QInputDialog,
 )
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QTextCursor, QIcon, QBrush, QFont, QTextCharFormat, QCursor
@@ -23,7 +25,18 @@ from src.ui.title_bar import CustomTitleBar
 # from src.ui.snippet_popup import SnippetPopupManager
 from src.ui.popup_manager import PopupManager
 from src.ui.ui_factory import UIFactory
+from src.ui.snippet_list import SnippetListModel, SnippetDelegate, SnippetListView
 from src.data.snippet_manager import SnippetManager
+from src.data.data_worker import DataWorker
+from src.data.snippet_importer import SnippetImporter
+from src.data.change_bus import (
+    SnippetsInserted,
+    SnippetsUpdated,
+    SnippetsDeleted,
+    SnippetsArchived,
+    TypeAdded,
+    TypeRemoved,
+)
 from src.utils.utils import UtilityManager
 from functools import partial
 
@@ -91,11 +104,12 @@ class BaseWindow(QMainWindow):
 
 
 class QtManager(BaseWindow):
+    USAGE_FLUSH_INTERVAL = 30000  # ms
+
     def __init__(self, kb_handler, updater):
         super().__init__()
         self.selected_snippet_type = None
         self.default_view = False
-        self.snippets_refreshed = False
         self._initalize_managers(kb_handler, updater)
         self.ui = UIComponents(self, updater)
         self.ui._setup_main_ui()
@@ -103,11 +117,28 @@ class QtManager(BaseWindow):
         self.keyboard_manager.enter_key_pressed.connect(
             self.search_manager.perform_search
         )
+        # Build the snippet editor once the event loop is idle, so opening it is instant
+        QTimer.singleShot(0, self.content_manager.prepare_popup)
+
+    def _shutdown_data_worker(self):
+        """Queue the last usage flush behind the pending requests, then stop the worker"""
+        self.usage_timer.stop()
+        self.data_worker.submit(self.snippet_manager.flush_usage)
+        self.data_worker.shutdown()
 
     def _initalize_managers(self, kb_handler, updater):
         self.keyboard_manager = kb_handler
         self.update_manager = updater
         self.snippet_manager = SnippetManager()
+        self.data_worker = DataWorker()
+        # Buffered usage is written in the background, and once more on quit
+        self.usage_timer = QTimer(self)
+        self.usage_timer.timeout.connect(
+            lambda: self.data_worker.submit(self.snippet_manager.flush_usage)
+        )
+        self.usage_timer.start(self.USAGE_FLUSH_INTERVAL)
+        QApplication.instance().aboutToQuit.connect(self._shutdown_data_worker)
+        self.snippet_importer = SnippetImporter(self.snippet_manager)
         self.theme_manager = ThemeManager()
         self.content_manager = ContentManager(
             self,
@@ -115,6 +146,7 @@ class QtManager(BaseWindow):
             self.theme_manager,
         )
         self.search_manager = SearchManager(self)
+        self.reconciler = ChangeReconciler(self)
 
     def show_hide_window(self):
         """Show or hide the main application window based on its current state."""
@@ -157,7 +189,9 @@ class QtManager(BaseWindow):
         parent_layout.addWidget(label)
 
     def refresh_app(self, archived=False):
-        """Re-focus the selected snippet type button after a snippet is created or edited."""
+        """Rebuild the window and re-focus the selected snippet type button.
+        Only needed to switch between the default and the full layout, other changes go through the reconciler."""
+        self.search_manager.last_search = None
         self.ui._setup_main_ui(archived)
 
         if (
@@ -169,15 +203,24 @@ class QtManager(BaseWindow):
             button.setFocus()
             button.click()
 
+    def copy_snippet(self, snippet_id, position=None):
+        """Load the snippet content on demand and copy it to the clipboard."""
+
+        self.snippet_manager.record_usage(snippet_id)
+        self.copy_to_clipboard(
+            self.snippet_manager.get_snippet_content(snippet_id), position
+        )
+
     # TODO: Move to ClipboardManager
-    def copy_to_clipboard(self, text):
-        """Copy the snippet content to the clipboard and show a tooltip."""
+    def copy_to_clipboard(self, text, position=None):
+        """Copy the snippet content to the clipboard and show a tooltip at position, or on the sending button."""
 
         QApplication.clipboard().setText(text)
 
-        button = self.sender()
-        button_pos = button.mapToGlobal(button.rect().center())
-        QToolTip.showText(button_pos, "Copied!", button)
+        if position is None:
+            button = self.sender()
+            position = button.mapToGlobal(button.rect().center())
+        QToolTip.showText(position, "Copied!")
         QTimer.singleShot(1500, QToolTip.hideText)
 
 
@@ -190,131 +233,197 @@ class ContentManager:
         self.search_results = []
         self.copy_icon = UtilityManager.get_resource_path("imgs/copy-solid.svg")
         self.edit_icon = UtilityManager.get_resource_path("imgs/edit.png")
-        self.file_extension = None
         self.archived = None
         self.archive_status = False
+        self.import_count = 0
         self.check_current_release()
 
     def clear_search(self):
         self.parent.ui.search_bar.clear()
 
-    def clear_content(self):
-        """Clear the search bar and search results, and remove all snippets from the content area."""
-
-        self.clear_layout(self.parent.ui.content_layout)
-
-    def clear_layout(self, layout):
-        """Clear the layout of all widgets."""
+    def clear_content(self, message=""):
+        """Remove all snippets from the content area, showing message in their place."""
 
-        while layout.count():
-            child = layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-            elif child.layout():
-                self.clear_layout(child.layout())
+        self.parent.ui.snippet_model.set_snippets([])
+        self.parent.ui.snippet_list.set_placeholder_text(message)
 
     # TODO:
     # def edit_snippet(self):
     # self.snippet_manager.edit_in_vscode(snippet_id)
 
+    def prepare_popup(self):
+        """Build the snippet editor ahead of its first use, every edit reuses it"""
+        if self.popup is None:
+            self.popup = PopupManager.create_snippet_popup(self.parent)
+
     def create_and_edit_snippet_popup(self, snippet=None):
-        if not hasattr(self, "popup") or self.popup is None:
-            self.popup = PopupManager.create_snippet_popup(
-                self.parent,
-                snippet,
-                self.file_extension,
-                self.archived,
+        self.prepare_popup()
+        if self.popup.isVisible():
+            return
+        if snippet is not None and "content" not in snippet:
+            # Bodies can be megabytes, the editor opens once the worker has read it
+            self.parent.data_worker.submit(
+                self.snippet_manager.get_snippet_content,
+                snippet.id,
+                callback=lambda content: self.open_snippet_popup(
+                    snippet.replace(content=content)
+                ),
+                channel="editor",
             )
-            self.popup.closed.connect(self.on_popup_closed)
-            self.popup.show()
-
-    def on_popup_closed(self):
-        if self.popup:
-            self.popup = None
+            return
+        self.open_snippet_popup(snippet)
 
-            if not self.parent.snippets_refreshed:
-                self.display_snippets(self.parent.selected_snippet_type)
-            self.parent.snippets_refreshed = False
+    def open_snippet_popup(self, snippet):
+        """Show the editor bound to the snippet, which holds its content, or a new one"""
+        if self.popup.isVisible():
+            return
+        self.popup.bind_snippet(
+            snippet,
+            self.default_extension() if snippet is None else None,
+            self.archived,
+        )
+        self.popup.show()
+        self.popup.raise_()
+        self.popup.activateWindow()
+
+    def load_content_preview(self, snippet_id, length, callback):
+        """Read the start of a snippet's content on the data worker for its tooltip"""
+        self.parent.data_worker.submit(
+            self.snippet_manager.get_content_preview,
+            snippet_id,
+            length,
+            callback=callback,
+            channel="preview",
+        )
 
-    def display_snippets(self, snippet_type=None, search_results=None):
+    def display_snippets(self, snippet_type=None, search_results=None, fetch_more=None):
         """Display snippets based on the snippet_type selected or search results."""
 
         self.parent.selected_snippet_type = snippet_type
         # self.archived = self.snippet_manager.check_archive_status(snippet_type)
 
-        self.clear_content()
+        if search_results:
+            self.render_snippets(search_results, fetch_more)
+            return
 
-        filtered_content = search_results or self.parent.snippet_manager.get_snippets(
-            snippet_type, archived=self.archive_status
+        # Listings and searches share a channel so the latest request always wins
+        load_page = partial(
+            self.snippet_manager.list_page, snippet_type, archived=self.archive_status
         )
-
-        self.file_extension = sorted(
-            [str(item["extension"]) for item in filtered_content]
+        self.parent.data_worker.submit(
+            load_page,
+            channel="content",
+            callback=lambda page: self.render_snippets(
+                page[0], self.page_fetcher(load_page, page[1])
+            ),
         )
 
-        sorted_content = sorted(filtered_content, key=lambda x: x["name"])
+    def render_snippets(self, filtered_content, fetch_more=None):
+        """
+        Replace the content area with the given snippets, in the order they were read.
+        fetch_more requests the snippets after them once the list is scrolled to its end.
+        """
 
-        for item in sorted_content:
-            row_layout = QHBoxLayout()
+        self.parent.ui.snippet_list.set_placeholder_text("")
+        self.parent.ui.snippet_model.set_snippets(filtered_content, fetch_more)
 
-            highlight_color = self.parent.theme_manager.get_theme_color(
-                "Highlight"
-            ).name()  # Get color as hex
-            formatted_text = f'<span style="color:{highlight_color}; font-weight:bold; font-size:18px;">{item["name"]}:</span> {item["description"]}'
+    def page_fetcher(self, load_page, cursor, on_page=None):
+        """
+        Build the fetch_more of the snippet list for a paged listing or search.
 
-            text_area = UIFactory.create_QLabel(
-                text=formatted_text,
-                tooltip=item["content"],
-                object_name="SnippetTextArea",
-                read_only=True,
-            )
+        Args:
+            load_page: SnippetManager.list_page or search_page with the arguments bound.
+            cursor (tuple): The cursor of the next page, None after the last page.
+            on_page: Called with each fetched page before it is shown.
 
-            copy_button = UIFactory.create_QPushButton(
-                "",
-                partial(self.parent.copy_to_clipboard, item["content"]),
-                "copyButton",
-                shadow=True,
-            )
-            copy_button.setIcon(QIcon(str(self.copy_icon)))
-            copy_button.setToolTip("Copy Snippet")
-
-            # TODO: Add back for VsCode support
-            edit_button = UIFactory.create_QPushButton(
-                "",
-                partial(
-                    # self.snippet_manager.edit_in_vscode,
-                    self.parent.content_manager.create_and_edit_snippet_popup,
-                    snippet=item,
-                    # snippet_id=item["id"],
-                ),
-                "editButton",
-                shadow=True,
+        Returns:
+            callable: Requests the next page in the background, None when there is none.
+        """
+
+        if cursor is None:
+            return None
+
+        def show_page(page):
+            if on_page:
+                on_page(page)
+            self.parent.ui.snippet_model.append_snippets(
+                page[0], self.page_fetcher(load_page, page[1], on_page)
             )
-            edit_button.setIcon(QIcon(str(self.edit_icon)))
-            edit_button.setToolTip("Edit Snippet")
 
-            delete_button = UIFactory.create_QPushButton(
-                "X",
-                partial(self.delete_snippet, item),
-                "deleteButton",
-                shadow=True,
+        return partial(
+            self.parent.data_worker.submit,
+            load_page,
+            cursor=cursor,
+            channel="content",
+            callback=show_page,
+        )
+
+    def import_snippets(self, folder=False):
+        """Import the snippets of a file or folder picked by the user in the background."""
+
+        if folder:
+            path = QFileDialog.getExistingDirectory(self.parent, "Import Snippet Folder")
+        else:
+            path, _ = QFileDialog.getOpenFileName(
+                self.parent, "Import Snippets", "", SnippetImporter.file_filter()
             )
-            delete_button.setToolTip("Delete Snippet")
+        if not path:
+            return
 
-            row_layout.addWidget(delete_button)
-            row_layout.addWidget(text_area)
-            row_layout.addWidget(copy_button)
-            row_layout.addWidget(edit_button)
+        button = self.parent.ui.import_button
+        button.setEnabled(False)
+        button.setText("Importing...")
+        importer = self.parent.snippet_importer
+        self.import_count = 0
+        importer.progress.connect(self.on_import_progress)
+        # The window refreshes from the change events each committed chunk publishes
+        self.parent.data_worker.submit(
+            importer.import_path,
+            path,
+            callback=self.on_import_finished,
+            error_callback=self.on_import_failed,
+        )
 
-            self.parent.ui.content_layout.addLayout(row_layout)
-            self.parent.ui.content_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+    def on_import_progress(self, count):
+        # Every chunk commits on its own, count is what the vault holds so far
+        self.import_count = count
+        self.parent.ui.import_button.setText(f"Imported {count}")
+
+    def on_import_finished(self, count):
+        self.parent.snippet_importer.progress.disconnect(self.on_import_progress)
+        button = self.parent.ui.import_button
+        button.setEnabled(True)
+        button.setText("Import")
+        QToolTip.showText(
+            button.mapToGlobal(button.rect().center()),
+            f"Imported {count} snippets",
+            button,
+        )
 
-    def delete_snippet(self, snippet):
+    def on_import_failed(self, error):
+        self.on_import_finished(self.import_count)
+        PopupManager.create_generic_popup(
+            parent=self.parent,
+            title="Import Failed",
+            window_size=(400, 200),
+            message=f"The import stopped after {self.import_count} snippets: {error}",
+        ).show()
+
+    def default_extension(self):
+        """The extension new snippets of the selected type start with."""
+
+        if self.parent.selected_snippet_type is None:
+            return None
+        return self.snippet_manager.default_extension(
+            self.parent.selected_snippet_type, self.archive_status
+        )
+
+    def confirm_deletion(self, message: str) -> bool:
         popup = PopupManager.create_generic_popup(
             parent=self.parent,
             title="Confirm Deletion",
             window_size=(200, 100),
-            message="Delete Snippet?",
+            message=message,
             close_button_txt="No",
             additional_button="Yes",
             message_object_name="deleteConfirmationLabel",
@@ -323,13 +432,100 @@ class ContentManager:
         )
 
         popup.show()
-        result = popup.exec()
-        if result == QDialog.DialogCode.Accepted:
-            self.snippet_manager.delete_snippet(snippet["id"])
-        self.parent.refresh_app()
+        return popup.exec() == QDialog.DialogCode.Accepted
+
+    def delete_snippet(self, snippet):
+        if self.confirm_deletion("Delete Snippet?"):
+            self.parent.data_worker.submit(
+                self.snippet_manager.delete_snippet,
+                snippet.id,
+            )
+
+    def show_snippet_menu(self, position):
+        """Context menu of the snippet list, acting on every selected snippet at once."""
+
+        snippet_list = self.parent.ui.snippet_list
+        index = snippet_list.indexAt(position)
+        if not index.isValid():
+            return
+        if not snippet_list.selectionModel().isSelected(index):
+            snippet_list.setCurrentIndex(index)
+
+        snippets = snippet_list.selected_snippets()
+        count = f" {len(snippets)} Snippets" if len(snippets) > 1 else ""
+        archive = (
+            (f"Unarchive{count}", self.snippet_manager.unarchive_snippets)
+            if self.archive_status
+            else (f"Archive{count}", self.snippet_manager.archive_snippets)
+        )
+        UIFactory.show_context_menu(
+            snippet_list.viewport(),
+            position,
+            {
+                archive[0]: partial(self.submit_bulk, archive[1], snippets),
+                "Change Type...": partial(self.change_snippets_type, snippets),
+                "Change Extension...": partial(
+                    self.change_snippets_extension, snippets
+                ),
+                f"Delete{count or ' Snippet'}": partial(
+                    self.delete_snippets, snippets
+                ),
+            },
+        )
+
+    def submit_bulk(self, action, snippets, *args):
+        """Run a SnippetManager bulk action over snippets on the data worker."""
+
+        self.parent.data_worker.submit(
+            action, [snippet.id for snippet in snippets], *args
+        )
+
+    def delete_snippets(self, snippets):
+        if len(snippets) == 1:
+            self.delete_snippet(snippets[0])
+        elif snippets and self.confirm_deletion(f"Delete {len(snippets)} Snippets?"):
+            self.submit_bulk(self.snippet_manager.delete_snippets, snippets)
+
+    def change_snippets_type(self, snippets):
+        types = self.snippet_manager.get_snippet_types(self.archive_status)
+        current = snippets[0].type
+        snippet_type, accepted = QInputDialog.getItem(
+            self.parent,
+            "Change Type",
+            "Snippet type:",
+            types,
+            types.index(current) if current in types else 0,
+            editable=True,
+        )
+        if accepted and snippet_type.strip():
+            self.submit_bulk(
+                self.snippet_manager.retype_snippets, snippets, snippet_type.strip()
+            )
+
+    def change_snippets_extension(self, snippets):
+        extensions = sorted(
+            {
+                extension
+                for extension in self.snippet_manager.extension_map.values()
+                if extension
+            }
+        )
+        current = snippets[0].extension
+        extension, accepted = QInputDialog.getItem(
+            self.parent,
+            "Change Extension",
+            "File extension:",
+            extensions,
+            extensions.index(current) if current in extensions else 0,
+            editable=True,
+        )
+        if accepted and extension.strip():
+            self.submit_bulk(
+                self.snippet_manager.change_extension, snippets, extension.strip()
+            )
 
     def check_current_release(self):
-        db_version = self.snippet_manager.db_release.item()
+        db_version = self.snippet_manager.db_release
         if db_version != self.parent.update_manager.get_current_version():
             self.display_release_notes(db_version)
 
@@ -369,28 +565,316 @@ class ContentManager:
 
 
 class SearchManager:
+    DEBOUNCE_MS = 150
+    # Larger result sets are re-queried in the background rather than refined on the GUI thread
+    REFINE_LIMIT = 5000
+
     def __init__(self, parent):
         self.parent = parent
+        self.search_results = []
+        self.last_search = None  # (query, archived, fuzzy) the search_results belong to
+        self.more_results = False  # search_results is one or more pages of the results
+        self.restore_type = None
+        self.fuzzy = False
+
+        self.debounce_timer = QTimer(parent)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(self.DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.perform_search)
+
+    def on_text_changed(self, _text):
+        """Restart the debounce window on every keystroke."""
+
+        self.debounce_timer.start()
+
+    def set_fuzzy(self, state):
+        """Switch between fuzzy and full text matching and re-run the current search."""
+
+        self.fuzzy = bool(state)
+        self.perform_search()
 
     def perform_search(self):
         """Search for snippets based on the query in the search bar."""
 
+        self.debounce_timer.stop()
         if self.parent.isActiveWindow() and self.parent.isVisible():
             if self.parent.default_view is False:
                 query = self.parent.ui.search_bar.text()
-                self.search_results = self.parent.snippet_manager.perform_search(
-                    query, archived_status=self.parent.content_manager.archive_status
-                )
-                self.parent.content_manager.clear_content()
-                if self.search_results:
-                    self.parent.content_manager.display_snippets(
-                        search_results=self.search_results
+                archived = self.parent.content_manager.archive_status
+
+                if not query:
+                    self.clear_results()
+                    return
+
+                if self.last_search is None and self.parent.selected_snippet_type:
+                    self.restore_type = self.parent.selected_snippet_type
+
+                # Narrowing a name/description search only needs the previous results
+                if self.can_refine(query, archived):
+                    self.parent.data_worker.cancel("content")
+                    self.last_search = (query, archived, self.fuzzy)
+                    self.display_results(
+                        self.parent.snippet_manager.refine_search(
+                            self.search_results, query
+                        )
                     )
+                    return
+
+                # Submitting supersedes, and interrupts, the in-flight search
+                self.submit_search(query, archived, self.fuzzy)
+
+    def submit_search(self, query, archived, fuzzy):
+        """Read the first page of a search in the background, the rest follows on scroll."""
+
+        load_page = partial(
+            self.parent.snippet_manager.search_page,
+            query,
+            archived_status=archived,
+            fuzzy=fuzzy,
+        )
+        self.parent.data_worker.submit(
+            load_page,
+            channel="content",
+            callback=partial(self.on_search_finished, query, archived, fuzzy, load_page),
+        )
+
+    def refresh(self):
+        """Re-run the search that produced the current results after the snippets changed."""
+
+        if self.last_search is None:
+            return
+        self.submit_search(*self.last_search)
+
+    def reset(self):
+        """Forget the current search and empty the search bar without searching again."""
+
+        self.debounce_timer.stop()
+        self.parent.data_worker.cancel("content")
+        self.search_results = []
+        self.more_results = False
+        self.last_search = None
+        self.restore_type = None
+        search_bar = self.parent.ui.search_bar
+        search_bar.blockSignals(True)
+        search_bar.clear()
+        search_bar.blockSignals(False)
+
+    def can_refine(self, query, archived):
+        """Check whether the query only narrows the search that produced the current results."""
+
+        # Fuzzy results are ranked, so a longer query can reorder them
+        if self.last_search is None or "*" in query or self.fuzzy:
+            return False
+        last_query, last_archived, last_fuzzy = self.last_search
+        return (
+            archived == last_archived
+            and not last_fuzzy
+            and "*" not in last_query
+            and query.startswith(last_query)
+            and not self.more_results
+            and len(self.search_results) <= self.REFINE_LIMIT
+        )
+
+    def clear_results(self):
+        """Drop the search state and return to the type shown before searching."""
+
+        self.parent.data_worker.cancel("content")
+        self.search_results = []
+        self.more_results = False
+        self.last_search = None
+        restore_type, self.restore_type = self.restore_type, None
+        if restore_type:
+            self.parent.content_manager.display_snippets(restore_type)
+        else:
+            self.parent.content_manager.clear_content()
+
+    def on_search_finished(self, query, archived, fuzzy, load_page, page):
+        self.last_search = (query, archived, fuzzy)
+        search_results, cursor = page
+        self.display_results(
+            search_results,
+            self.parent.content_manager.page_fetcher(
+                load_page, cursor, self.on_more_results
+            ),
+        )
+
+    def on_more_results(self, page):
+        """Keep the pages fetched while scrolling the results, for refine_search"""
+        self.search_results.extend(page[0])
+        self.more_results = page[1] is not None
+
+    def display_results(self, search_results, fetch_more=None):
+        """Show the search results, or a message when nothing matched."""
+
+        self.search_results = list(search_results)
+        self.more_results = fetch_more is not None
+        if self.search_results:
+            self.parent.content_manager.display_snippets(
+                search_results=self.search_results, fetch_more=fetch_more
+            )
+        else:
+            self.parent.content_manager.clear_content("No snippets found")
+
+
+class ChangeReconciler:
+    """
+    Applies the change events published by the SnippetManager to the widgets showing them,
+    one row or one type button at a time, instead of rebuilding the window.
+    """
+
+    # Batches touching more snippets re-list the selected type in the background instead
+    ROW_DELTA_LIMIT = 50
+    ROW_EVENTS = (SnippetsInserted, SnippetsUpdated, SnippetsDeleted, SnippetsArchived)
+
+    def __init__(self, parent):
+        self.parent = parent
+        parent.snippet_manager.changes.changed.connect(self.apply_changes)
+
+    @staticmethod
+    def sort_key(snippet):
+        """Type listings are sorted most used first, then by name, see SnippetManager.LISTING_ORDER"""
+        frecency = snippet.frecency
+        return (frecency is None, -(frecency or 0), snippet.name.casefold())
+
+    def apply_changes(self, events):
+        """
+        Reconcile the type buttons and the listed rows with a batch of change events.
+
+        Args:
+            events (List[ChangeEvent]): The changes, in the order they were committed.
+        """
+
+        parent = self.parent
+        content_manager = parent.content_manager
+
+        # The first snippet or the last one going away switches between the default and
+        # the full layout, which is the only case that rebuilds the window
+        if any(isinstance(event, self.ROW_EVENTS) for event in events):
+            has_snippets = parent.snippet_manager.has_snippets()
+            if parent.default_view == has_snippets:
+                inserted = [e for e in events if isinstance(e, SnippetsInserted)]
+                parent.selected_snippet_type = (
+                    inserted[0].snippets[0].type if inserted else None
+                )
+                parent.refresh_app(content_manager.archive_status)
+                return
+        if parent.default_view:
+            return
+
+        self._apply_type_changes(events)
+
+        search_manager = parent.search_manager
+        if search_manager.last_search is not None:
+            self._apply_to_search(events)
+            return
+        if parent.selected_snippet_type is None:
+            return
+
+        touched = sum(
+            len(event.snippet_ids)
+            for event in events
+            if isinstance(event, self.ROW_EVENTS)
+        )
+        reload = touched > self.ROW_DELTA_LIMIT
+        if not reload:
+            reload = self._apply_row_changes(events)
+        if reload:
+            content_manager.display_snippets(parent.selected_snippet_type)
+
+    def _apply_type_changes(self, events):
+        parent = self.parent
+        archived = parent.content_manager.archive_status
+        for event in events:
+            if isinstance(event, TypeAdded) and event.archived == archived:
+                parent.ui.add_type_button(event.snippet_type)
+            elif isinstance(event, TypeRemoved) and event.archived == archived:
+                parent.ui.remove_type_button(event.snippet_type)
+                if parent.selected_snippet_type == event.snippet_type:
+                    parent.selected_snippet_type = None
+                    parent.content_manager.clear_content()
+
+    def _apply_to_search(self, events):
+        """Re-run the search when snippets may have started or stopped matching, drop deleted rows."""
+
+        search_manager = self.parent.search_manager
+        if any(not isinstance(event, SnippetsDeleted) for event in events):
+            search_manager.refresh()
+            return
+
+        deleted = {
+            snippet_id
+            for event in events
+            if isinstance(event, SnippetsDeleted)
+            for snippet_id in event.snippet_ids
+        }
+        for snippet_id in deleted:
+            self.parent.ui.snippet_model.remove_snippet(snippet_id)
+        search_manager.search_results = [
+            item for item in search_manager.search_results if item.id not in deleted
+        ]
+
+    def _apply_row_changes(self, events) -> bool:
+        """Apply the events to the rows of the selected type, returns True when it must be re-listed."""
+
+        parent = self.parent
+        model = parent.ui.snippet_model
+        archived = parent.content_manager.archive_status
+        for event in events:
+            if isinstance(event, (SnippetsInserted, SnippetsUpdated)):
+                for snippet in event.snippets:
+                    if (
+                        snippet.type == parent.selected_snippet_type
+                        and bool(snippet.archived) == archived
+                    ):
+                        if not model.update_snippet(snippet, self.sort_key):
+                            model.insert_snippet(snippet, self.sort_key)
+                    else:
+                        model.remove_snippet(snippet.id)
+            elif isinstance(event, SnippetsDeleted):
+                for snippet_id in event.snippet_ids:
+                    model.remove_snippet(snippet_id)
+            elif isinstance(event, SnippetsArchived):
+                if event.archived != archived:
+                    for snippet_id in event.snippet_ids:
+                        model.remove_snippet(snippet_id)
                 else:
-                    label = QLabel("No snippets found")
-                    label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    label.setStyleSheet("font-size: 18px")
-                    self.parent.ui.content_layout.addWidget(label)
+                    # Only the ids are known, the restored rows may belong to this type
+                    return True
+        return False
+
+    def follow_snippet(self, snippet):
+        """Show the type of a created or edited snippet, unless a search is displayed."""
+
+        parent = self.parent
+        if (
+            snippet is None
+            or parent.default_view
+            or parent.search_manager.last_search is not None
+            or bool(snippet.archived) != parent.content_manager.archive_status
+            or snippet.type == parent.selected_snippet_type
+        ):
+            return
+        parent.content_manager.display_snippets(snippet.type)
+        button = parent.ui.active_buttons.get(snippet.type)
+        if button:
+            button.setFocus()
+
+    def archive_view_changed(self, archived):
+        """Swap the type buttons between active and archived snippets, keeping the selected type."""
+
+        parent = self.parent
+        parent.content_manager.archive_status = archived
+        parent.ui.archive_status = archived
+        parent.search_manager.reset()
+        parent.ui.populate_type_buttons()
+
+        snippet_type = parent.selected_snippet_type
+        if snippet_type in parent.ui.active_buttons:
+            parent.content_manager.display_snippets(snippet_type)
+            parent.ui.active_buttons[snippet_type].setFocus()
+        else:
+            parent.selected_snippet_type = None
+            parent.content_manager.clear_content()
 
 
 class UIComponents:
@@ -444,11 +928,12 @@ class UIComponents:
             self.create_snippets_button,
         ]
 
-        if not self.parent.snippet_manager.get_snippets(columns="id"):
+        if not self.parent.snippet_manager.has_snippets():
             self.parent.default_view = True
             self.parent.missing_schema_default_layout(main_layout)
             self.create_snippets_button(main_layout)
         else:
+            self.parent.default_view = False
             for element in main_elements:
                 element(main_layout)
 
@@ -493,20 +978,39 @@ class UIComponents:
         parent_layout.addLayout(layout)
 
     def add_content_area(self, parent_layout):
-        """Add a scrollable area to display the snippets, but remove it if no snippets are found."""
-
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setObjectName("contentScrollArea")
+        """Add the virtualized list that displays the snippets."""
 
-        self.content_widget = QWidget()
-        self.content_widget.setObjectName("contentWidget")
+        content_manager = self.parent.content_manager
+        self.snippet_model = SnippetListModel(
+            preview_loader=content_manager.load_content_preview
+        )
+        delegate = SnippetDelegate(
+            self.parent.theme_manager,
+            content_manager.copy_icon,
+            content_manager.edit_icon,
+        )
 
-        self.content_layout = QVBoxLayout(self.content_widget)
-        self.content_layout.setObjectName("contentLayout")
+        self.snippet_list = SnippetListView(self.snippet_model, delegate)
+        delegate.setParent(self.snippet_list)
+        self.snippet_model.setParent(self.snippet_list)
+        self.snippet_list.setObjectName("contentScrollArea")
+        self.snippet_list.copy_requested.connect(
+            lambda snippet, position: self.parent.copy_snippet(snippet.id, position)
+        )
+        self.snippet_list.edit_requested.connect(
+            lambda snippet: content_manager.create_and_edit_snippet_popup(
+                snippet=snippet
+            )
+        )
+        self.snippet_list.delete_requested.connect(content_manager.delete_snippet)
+        self.snippet_list.delete_selected_requested.connect(
+            content_manager.delete_snippets
+        )
+        self.snippet_list.customContextMenuRequested.connect(
+            content_manager.show_snippet_menu
+        )
 
-        scroll_area.setWidget(self.content_widget)
-        parent_layout.addWidget(scroll_area)
+        parent_layout.addWidget(self.snippet_list)
 
     def add_search_bar(self, parent_layout):
         """Add a search bar to the main layout to filter snippets."""
@@ -516,6 +1020,7 @@ class UIComponents:
         self.search_bar.setPlaceholderText("Search snippets...")
         self.search_bar.setFixedHeight(35)
         self.search_bar.setObjectName("searchBar")
+        self.search_bar.textChanged.connect(self.parent.search_manager.on_text_changed)
 
         search_btn = UIFactory.create_QPushButton(
             "Search",
@@ -529,8 +1034,15 @@ class UIComponents:
             "clearButton",
             shadow=True,
         )
+        fuzzy_checkbox = UIFactory.create_QCheckBox(
+            text="Fuzzy",
+            callback=self.parent.search_manager.set_fuzzy,
+            checked=self.parent.search_manager.fuzzy,
+            object_name="fuzzyCheckbox",
+        )
 
         layout.addWidget(self.search_bar)
+        layout.addWidget(fuzzy_checkbox)
         layout.addWidget(search_btn)
         layout.addWidget(clear_btn)
         parent_layout.addLayout(layout)
@@ -550,12 +1062,7 @@ class UIComponents:
         return text_area
 
     def archive_state_change(self, state):
-        if state == 2:  # Checked
-            self.parent.content_manager.archive_status = True
-            self.parent.refresh_app(archived=True)
-        else:
-            self.parent.content_manager.archive_status = False
-            self.parent.refresh_app(archived=False)
+        self.parent.reconciler.archive_view_changed(state == 2)  # 2 is Checked
 
     def archive_and_release_notes(self, parent_layout):
         layout = QHBoxLayout()
@@ -600,12 +1107,55 @@ class UIComponents:
             "createButton",
             shadow=True,
         )
+        self.import_button = UIFactory.create_QPushButton(
+            "Import",
+            self.parent.content_manager.import_snippets,
+            "createButton",
+            width=120,
+            shadow=True,
+            context_menu={
+                "Import Folder": partial(
+                    self.parent.content_manager.import_snippets, folder=True
+                )
+            },
+        )
+        self.import_button.setToolTip("Import snippet files, right click to import a folder")
         layout.addWidget(create_button)
+        layout.addWidget(self.import_button)
         parent_layout.addLayout(layout)
 
     def archive_snippet_type(self, snippet_type: str) -> None:
-        self.parent.snippet_manager.archive_snippet_type(snippet_type)
-        self.parent.refresh_app()
+        self.parent.data_worker.submit(
+            self.parent.snippet_manager.archive_snippet_type,
+            snippet_type,
+        )
+
+    def rename_snippet_type(self, snippet_type: str) -> None:
+        new_name, accepted = QInputDialog.getText(
+            self.parent, "Rename Type", "New name:", text=snippet_type
+        )
+        if not accepted or not new_name.strip():
+            return
+        self.parent.data_worker.submit(
+            self.parent.snippet_manager.rename_snippet_type,
+            snippet_type,
+            new_name,
+            self.parent.content_manager.archive_status,
+            callback=partial(
+                self.on_type_renamed,
+                new_name.strip(),
+                self.parent.selected_snippet_type == snippet_type,
+            ),
+        )
+
+    def on_type_renamed(self, new_name: str, was_selected: bool, renamed: int) -> None:
+        """Keep showing the snippets of a selected type under its new name."""
+
+        if renamed and was_selected:
+            self.parent.content_manager.display_snippets(new_name)
+            button = self.active_buttons.get(new_name)
+            if button:
+                button.setFocus()
 
     def add_type_buttons(self, parent_layout):
         """Add buttons to filter snippets by snippet_type to the main layout. Remove them if no snippets are found."""
@@ -619,49 +1169,10 @@ class UIComponents:
         button_widget = QWidget()
         button_widget.setObjectName("typeWidget")
 
-        button_layout = QHBoxLayout(button_widget)
-
-        for snippet_type in self.parent.snippet_manager.get_snippet_types(
-            self.archive_status
-        ):
-            # Create a function that returns the lambda for the context menu
-            def make_archive_action(type_name):
-                return lambda: self.archive_snippet_type(type_name)
-
-            # Create a function that returns the lambda for the button click
-            def make_display_action(type_name):
-                return lambda: self.parent.content_manager.display_snippets(type_name)
-
-            if self.parent.content_manager.archive_status:
-                button = UIFactory.create_QPushButton(
-                    snippet_type,
-                    make_display_action(
-                        snippet_type
-                    ),  # Use the function to create the click callback
-                    "typeButtonArchived",
-                    shadow=True,
-                )
-            else:
-                # Create the button with the specific actions for this snippet_type
-                button = UIFactory.create_QPushButton(
-                    snippet_type,
-                    make_display_action(
-                        snippet_type
-                    ),  # Use the function to create the click callback
-                    "typeButton",
-                    shadow=True,
-                    context_menu={
-                        "Archive": make_archive_action(
-                            snippet_type
-                        )  # Use the function to create the menu callback
-                    },
-                )
-
-            self.active_buttons[snippet_type] = button
-
-            button_layout.addWidget(button)
-            button_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-            button_layout.setContentsMargins(10, 10, 10, 0)
+        self.type_button_layout = QHBoxLayout(button_widget)
+        self.type_button_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        self.type_button_layout.setContentsMargins(10, 10, 10, 0)
+        self.populate_type_buttons()
 
         scroll_area.setWidget(button_widget)
 
@@ -669,3 +1180,65 @@ class UIComponents:
         scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         parent_layout.addWidget(scroll_area)
+
+    def populate_type_buttons(self):
+        """Replace the type buttons with those of the snippet types in the current archive view."""
+
+        for button in self.active_buttons.values():
+            self.type_button_layout.removeWidget(button)
+            button.deleteLater()
+        self.active_buttons = {}
+
+        for snippet_type in self.parent.snippet_manager.get_snippet_types(
+            self.archive_status
+        ):
+            self.active_buttons[snippet_type] = self.create_type_button(snippet_type)
+            self.type_button_layout.addWidget(self.active_buttons[snippet_type])
+
+    def create_type_button(self, snippet_type):
+        """Create the button that displays the snippets of a type."""
+
+        # Bind the type now, the button outlives the loop that creates it
+        def display_action():
+            self.parent.content_manager.display_snippets(snippet_type)
+
+        rename_action = partial(self.rename_snippet_type, snippet_type)
+        if self.parent.content_manager.archive_status:
+            return UIFactory.create_QPushButton(
+                snippet_type,
+                display_action,
+                "typeButtonArchived",
+                shadow=True,
+                context_menu={"Rename": rename_action},
+            )
+        return UIFactory.create_QPushButton(
+            snippet_type,
+            display_action,
+            "typeButton",
+            shadow=True,
+            context_menu={
+                "Archive": lambda: self.archive_snippet_type(snippet_type),
+                "Rename": rename_action,
+            },
+        )
+
+    def add_type_button(self, snippet_type):
+        """Add the button of a type at its sorted position."""
+
+        if snippet_type in self.active_buttons:
+            return
+        button = self.create_type_button(snippet_type)
+        # Buttons follow the order of get_snippet_types
+        position = sum(
+            1
+            for other in self.active_buttons
+            if other.casefold() < snippet_type.casefold()
+        )
+        self.active_buttons[snippet_type] = button
+        self.type_button_layout.insertWidget(position, button)
+
+    def remove_type_button(self, snippet_type):
+        button = self.active_buttons.pop(snippet_type, None)
+        if button is not None:
+            self.type_button_layout.removeWidget(button)
+            button.deleteLater()
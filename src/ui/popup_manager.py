@@ -14,11 +14,12 @@ class PopupManager:
     ):
         """
         Creates the popup window when editing or creating new snippets for the application.
+        The popup is hidden on close and can be rebound to another snippet with bind_snippet.
 
         Args:
             parent: Parent class
-            snippet: Dictionary of snippet content to be edited.
-            file_extension: File extension for filling the combobox should it be a new snippet that does not have these values.
+            snippet: The Snippet to be edited, with its content.
+            file_extension: Extension preselected in the combobox should it be a new snippet that does not have these values.
 
         Returns:
             QDialog Object
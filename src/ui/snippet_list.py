@@ -0,0 +1,439 @@
+from bisect import bisect_right
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QToolTip
+from PyQt6.QtCore import (
+    Qt,
+    QAbstractListModel,
+    QModelIndex,
+    QRect,
+    QSize,
+    QEvent,
+    pyqtSignal,
+)
+from PyQt6.QtGui import QIcon, QFont, QPainter, QPen, QColor, QCursor
+
+from src.data.snippet import Snippet
+from src.ui.ui_factory import UIFactory
+
+
+class SnippetListModel(QAbstractListModel):
+    """
+    List model over the snippet rows shown in the content area.
+
+    Rows are the listing Snippet records returned by the SnippetManager, without their
+    content. The start of a snippet's content is only read, through preview_loader, when
+    the view first asks for its tooltip, one character past the tooltip length so a
+    longer body is still marked. The loader hands the preview to a callback later on and
+    preview_loaded tells the view it can be shown. Listings are shown a page at a time,
+    the view asks for the next one as it is scrolled to the end.
+    """
+
+    preview_loaded = pyqtSignal(int)  # snippet id
+
+    SnippetRole = Qt.ItemDataRole.UserRole + 1
+    DescriptionRole = Qt.ItemDataRole.UserRole + 2
+
+    def __init__(self, preview_loader=None, parent=None):
+        super().__init__(parent)
+        self.preview_loader = preview_loader
+        self.previews = {}  # {snippet_id: start of the content}
+        self.snippets = []
+        # Requests the next page while the listing has more rows, see append_snippets
+        self.fetch_more = None
+        self.fetching = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.snippets)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        snippet = self.snippets[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return snippet.name
+        if role == self.DescriptionRole:
+            return snippet.description
+        if role == self.SnippetRole:
+            return snippet
+        if role == Qt.ItemDataRole.ToolTipRole and self.preview_loader:
+            if snippet.id in self.previews:
+                return UIFactory.truncate_tooltip(self.previews[snippet.id])
+            self.preview_loader(
+                snippet.id,
+                UIFactory.TOOLTIP_LENGTH + 1,
+                lambda preview, snippet_id=snippet.id: self.set_preview(
+                    snippet_id, preview
+                ),
+            )
+        return None
+
+    def set_preview(self, snippet_id: int, preview: str) -> None:
+        """Keep a loaded content preview for the tooltips of the snippet's row"""
+        if self.row_of(snippet_id) >= 0:
+            self.previews[snippet_id] = preview
+            self.preview_loaded.emit(snippet_id)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.fetch_more is not None and not self.fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self.fetching = True
+            self.fetch_more()
+
+    def set_snippets(self, snippets, fetch_more=None):
+        """
+        Replace every row of the model.
+
+        Args:
+            snippets (list): The rows, the first page of the listing.
+            fetch_more (callable): Requests the next page, which is handed to
+                append_snippets. None when the rows are the whole listing.
+        """
+        self.beginResetModel()
+        self.snippets = list(snippets)
+        self.previews.clear()
+        self.fetch_more = fetch_more
+        self.fetching = False
+        self.endResetModel()
+
+    def append_snippets(self, snippets, fetch_more=None):
+        """Add a fetched page after the rows, fetch_more requests the page after it"""
+        listed = {snippet.id for snippet in self.snippets}
+        # Rows inserted since the previous page was read can come again
+        snippets = [snippet for snippet in snippets if snippet.id not in listed]
+        if snippets:
+            first = len(self.snippets)
+            self.beginInsertRows(QModelIndex(), first, first + len(snippets) - 1)
+            self.snippets.extend(snippets)
+            self.endInsertRows()
+        self.fetch_more = fetch_more
+        self.fetching = False
+
+    def snippet(self, row):
+        return self.snippets[row]
+
+    def row_of(self, snippet_id: int) -> int:
+        """Row of the snippet with the given id, -1 when it is not listed"""
+        for row, snippet in enumerate(self.snippets):
+            if snippet.id == snippet_id:
+                return row
+        return -1
+
+    def insert_snippet(self, snippet: Snippet, sort_key=None) -> None:
+        """
+        Insert a row, at its sorted position when sort_key is given, otherwise at the end.
+        A row sorted after the loaded pages is left to the page that will list it.
+        """
+        row = (
+            bisect_right(self.snippets, sort_key(snippet), key=sort_key)
+            if sort_key
+            else len(self.snippets)
+        )
+        if row == len(self.snippets) and self.fetch_more is not None:
+            return
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.snippets.insert(row, snippet)
+        self.endInsertRows()
+
+    def update_snippet(self, snippet: Snippet, sort_key=None) -> bool:
+        """Replace the row of the snippet in place, moving it if its sorted position changed"""
+        row = self.row_of(snippet.id)
+        if row < 0:
+            return False
+
+        if sort_key and sort_key(self.snippets[row]) != sort_key(snippet):
+            self.remove_snippet(snippet.id)
+            self.insert_snippet(snippet, sort_key)
+            return True
+
+        self.snippets[row] = snippet
+        self.previews.pop(snippet.id, None)
+        self.dataChanged.emit(self.index(row), self.index(row))
+        return True
+
+    def remove_snippet(self, snippet_id: int) -> bool:
+        row = self.row_of(snippet_id)
+        if row < 0:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.snippets[row]
+        self.previews.pop(snippet_id, None)
+        self.endRemoveRows()
+        return True
+
+
+class SnippetDelegate(QStyledItemDelegate):
+    """
+    Paints a snippet row: a delete button, the name and description, and the copy and
+    edit buttons. Nothing is allocated per row, the buttons are painted and hit tested.
+    """
+
+    ROW_HEIGHT = 40
+    MARGIN = 5
+    DELETE_SIZE = 16
+    BUTTON_SIZE = 24
+    SPACING = 8
+    BUTTON_TOOLTIPS = {
+        "delete": "Delete Snippet",
+        "copy": "Copy Snippet",
+        "edit": "Edit Snippet",
+    }
+
+    def __init__(self, theme_manager, copy_icon, edit_icon, parent=None):
+        super().__init__(parent)
+        self.theme_manager = theme_manager
+        self.copy_icon = QIcon(str(copy_icon))
+        self.edit_icon = QIcon(str(edit_icon))
+        self.hovered = (-1, None)  # (row, button) under the mouse
+
+        self.name_font = QFont("Helvetica")
+        self.name_font.setPixelSize(18)
+        self.name_font.setBold(True)
+        self.description_font = QFont("Helvetica")
+        self.description_font.setPixelSize(14)
+        self.delete_font = QFont("Helvetica")
+        self.delete_font.setPixelSize(11)
+        self.delete_hover_font = QFont(self.delete_font)
+        self.delete_hover_font.setBold(True)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def button_rects(self, rect: QRect) -> dict:
+        """The rects of the row buttons, keyed by the action they trigger"""
+        middle = rect.center().y()
+        right = rect.right() - self.MARGIN
+        edit = QRect(
+            right - self.BUTTON_SIZE,
+            middle - self.BUTTON_SIZE // 2,
+            self.BUTTON_SIZE,
+            self.BUTTON_SIZE,
+        )
+        copy = edit.translated(-(self.BUTTON_SIZE + self.SPACING), 0)
+        delete = QRect(
+            rect.left() + self.MARGIN,
+            middle - self.DELETE_SIZE // 2,
+            self.DELETE_SIZE,
+            self.DELETE_SIZE,
+        )
+        return {"delete": delete, "copy": copy, "edit": edit}
+
+    def button_at(self, rect: QRect, position) -> str:
+        """Name of the button of the row in rect under position, None between buttons"""
+        for button, button_rect in self.button_rects(rect).items():
+            if button_rect.contains(position):
+                return button
+        return None
+
+    def text_rect(self, rect: QRect) -> QRect:
+        buttons = self.button_rects(rect)
+        left = buttons["delete"].right() + self.SPACING
+        return QRect(
+            left,
+            rect.top() + self.MARGIN,
+            buttons["copy"].left() - self.SPACING - left,
+            rect.height() - 2 * self.MARGIN,
+        )
+
+    def color(self, element: str) -> QColor:
+        return self.theme_manager.get_snippet_list_color(element)
+
+    def paint(self, painter: QPainter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        rect = option.rect
+        hovered_row, hovered_button = self.hovered
+        hovered_button = hovered_button if hovered_row == index.row() else None
+        buttons = self.button_rects(rect)
+
+        # Name and description
+        text_rect = self.text_rect(rect)
+        painter.setPen(QPen(self.color("border")))
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(text_rect, self.color("selected"))
+        elif option.state & QStyle.StateFlag.State_MouseOver:
+            painter.fillRect(text_rect, self.color("hover_row"))
+        painter.drawRect(text_rect.adjusted(0, 0, -1, -1))
+
+        text_area = text_rect.adjusted(self.SPACING, 0, -self.SPACING, 0)
+        name = f"{index.data(Qt.ItemDataRole.DisplayRole)}:"
+        painter.setFont(self.name_font)
+        name = painter.fontMetrics().elidedText(
+            name, Qt.TextElideMode.ElideRight, text_area.width()
+        )
+        name_width = painter.fontMetrics().horizontalAdvance(name)
+        painter.setPen(self.theme_manager.get_theme_color("Highlight"))
+        painter.drawText(
+            text_area,
+            Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft,
+            name,
+        )
+
+        description_area = text_area.adjusted(name_width + self.SPACING, 0, 0, 0)
+        if description_area.width() > 0:
+            painter.setFont(self.description_font)
+            painter.setPen(self.color("text"))
+            painter.drawText(
+                description_area,
+                Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft,
+                painter.fontMetrics().elidedText(
+                    str(index.data(SnippetListModel.DescriptionRole) or ""),
+                    Qt.TextElideMode.ElideRight,
+                    description_area.width(),
+                ),
+            )
+
+        # Buttons
+        painter.setPen(Qt.PenStyle.NoPen)
+        for button in ("copy", "edit"):
+            painter.setBrush(
+                self.color("hover" if hovered_button == button else button)
+            )
+            painter.drawRoundedRect(buttons[button], 8, 8)
+        self.copy_icon.paint(painter, buttons["copy"].adjusted(5, 5, -5, -5))
+        self.edit_icon.paint(painter, buttons["edit"].adjusted(5, 5, -5, -5))
+
+        painter.setBrush(self.color("delete"))
+        painter.drawEllipse(buttons["delete"])
+        if hovered_button == "delete":
+            painter.setFont(self.delete_hover_font)
+            painter.setPen(self.color("delete_hover"))
+        else:
+            painter.setFont(self.delete_font)
+            painter.setPen(self.color("text"))
+        painter.drawText(buttons["delete"], Qt.AlignmentFlag.AlignCenter, "X")
+
+        painter.restore()
+
+    def helpEvent(self, event, view, option, index):
+        """Name the button under the mouse, otherwise show the snippet content"""
+        if event.type() == QEvent.Type.ToolTip and index.isValid():
+            button = self.button_at(option.rect, event.pos())
+            if button:
+                QToolTip.showText(event.globalPos(), self.BUTTON_TOOLTIPS[button], view)
+                return True
+        return super().helpEvent(event, view, option, index)
+
+
+class SnippetListView(QListView):
+    """
+    Virtualized list of snippets. Only the visible rows are painted, and clicks on the
+    painted buttons are hit tested and re-emitted with the snippet of the row. Rows can be
+    multi-selected with Ctrl and Shift clicks for the bulk actions of the context menu.
+    """
+
+    # Snippet records are not dicts, the signals carry them as objects
+    copy_requested = pyqtSignal(object, object)  # snippet, global position of the click
+    edit_requested = pyqtSignal(object)
+    delete_requested = pyqtSignal(object)
+    delete_selected_requested = pyqtSignal(list)  # snippets
+
+    def __init__(self, model, delegate, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setItemDelegate(delegate)
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
+        self.setFocusPolicy(Qt.FocusPolicy.ClickFocus)
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.placeholder_text = ""
+        model.preview_loaded.connect(self.show_preview)
+
+    def set_placeholder_text(self, text: str) -> None:
+        """Text painted in place of the rows while the model is empty"""
+        self.placeholder_text = text
+        self.viewport().update()
+
+    def selected_snippets(self) -> list:
+        """The snippets of the selected rows, in list order"""
+        return [
+            index.data(SnippetListModel.SnippetRole)
+            for index in sorted(self.selectedIndexes(), key=lambda index: index.row())
+        ]
+
+    def _button_at(self, position):
+        index = self.indexAt(position)
+        if not index.isValid():
+            return index, None
+        return index, self.itemDelegate().button_at(self.visualRect(index), position)
+
+    def mouseMoveEvent(self, event):
+        index, button = self._button_at(event.position().toPoint())
+        hovered = (index.row(), button)
+        delegate = self.itemDelegate()
+        if hovered != delegate.hovered:
+            previous_row = delegate.hovered[0]
+            delegate.hovered = hovered
+            for row in {previous_row, index.row()}:
+                if row >= 0:
+                    self.viewport().update(self.visualRect(self.model().index(row)))
+        self.viewport().setCursor(
+            Qt.CursorShape.PointingHandCursor if button else Qt.CursorShape.ArrowCursor
+        )
+        super().mouseMoveEvent(event)
+
+    def show_preview(self, snippet_id: int) -> None:
+        """Show the tooltip of a loaded preview while the mouse still rests on its row"""
+        row = self.model().row_of(snippet_id)
+        if row < 0 or self.itemDelegate().hovered != (row, None):
+            return
+        index = self.model().index(row)
+        QToolTip.showText(
+            QCursor.pos(),
+            index.data(Qt.ItemDataRole.ToolTipRole),
+            self.viewport(),
+            self.visualRect(index),
+        )
+
+    def leaveEvent(self, event):
+        previous_row = self.itemDelegate().hovered[0]
+        self.itemDelegate().hovered = (-1, None)
+        if previous_row >= 0:
+            self.viewport().update(self.visualRect(self.model().index(previous_row)))
+        super().leaveEvent(event)
+
+    def mousePressEvent(self, event):
+        # Pressing a row button triggers it on release without touching the selection
+        if self._button_at(event.position().toPoint())[1]:
+            event.accept()
+            return
+        super().mousePressEvent(event)
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key.Key_Delete and self.selectionModel().hasSelection():
+            self.delete_selected_requested.emit(self.selected_snippets())
+            return
+        super().keyPressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            index, button = self._button_at(event.position().toPoint())
+            if button:
+                snippet = index.data(SnippetListModel.SnippetRole)
+                if button == "copy":
+                    self.copy_requested.emit(snippet, event.globalPosition().toPoint())
+                elif button == "edit":
+                    self.edit_requested.emit(snippet)
+                else:
+                    self.delete_requested.emit(snippet)
+                return
+        super().mouseReleaseEvent(event)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.placeholder_text and self.model().rowCount() == 0:
+            painter = QPainter(self.viewport())
+            font = QFont(self.font())
+            font.setPixelSize(18)
+            painter.setFont(font)
+            painter.setPen(self.palette().color(self.foregroundRole()))
+            painter.drawText(
+                self.viewport().rect(),
+                Qt.AlignmentFlag.AlignCenter,
+                self.placeholder_text,
+            )
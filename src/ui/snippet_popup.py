@@ -3,43 +3,52 @@ from PyQt6.QtWidgets import (
     QDialog,
     QVBoxLayout,
     QTextEdit,
+    QPlainTextEdit,
+    QPlainTextDocumentLayout,
+    QStackedWidget,
     QLabel,
     QLineEdit,
     QComboBox,
     QApplication,
+    QWidget,
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer
-from PyQt6.QtGui import QIcon, QCursor
+from PyQt6.QtCore import Qt, pyqtSignal, QEvent, QTimer
+from PyQt6.QtGui import QIcon, QCursor, QTextCursor, QTextDocument
 
 from src.ui.ui_factory import UIFactory
 from src.ui.title_bar import CustomTitleBar
-from src.ui.highlighters.syntax_manager import (
-    PythonHighlighter,
-    SQLHighlighter,
-    HighlighterManager,
-)
+from src.ui.highlighters.syntax_manager import HighlighterManager
 from src.utils.utils import UtilityManager
 
 
 class SnippetPopupManager(QDialog):
     closed = pyqtSignal()
 
+    MODIFIER_KEYS = {
+        Qt.Key.Key_Control: Qt.KeyboardModifier.ControlModifier,
+        Qt.Key.Key_Shift: Qt.KeyboardModifier.ShiftModifier,
+    }
+
+    LARGE_CONTENT_SIZE = 1_000_000  # characters, larger snippets open in a QPlainTextEdit
+    LOAD_CHUNK_SIZE = 500_000  # characters of a large snippet loaded per event loop turn
+
     def __init__(self, parent=None, snippet=None, file_extension=None, archived=None):
         super().__init__(parent)
         self.parent = parent
-        self.existing_snippet = snippet
-        self.extension = file_extension
+        self.existing_snippet = None
+        self.extension = None
         self.closed_emitted = False
-        self.highlighter_dict = HighlighterManager().highlighters
+        self.highlighter = None
 
         # Initialize window properties
         self.setup_window()
 
-        # Initialize tracking variables and timer
+        # Initialize move and resize tracking
         self.setup_tracking()
 
-        # Create and set up the UI components
-        self.setup_ui(snippet, archived)
+        # Create and set up the UI components, then fill them with the snippet
+        self.setup_ui()
+        self.bind_snippet(snippet, file_extension, archived)
 
     def setup_window(self):
         """Configure window properties"""
@@ -50,31 +59,27 @@ class SnippetPopupManager(QDialog):
         # Set window size
         self.min_width = 700
         self.min_height = 400
-        self.resize(self.min_width, self.min_height)
 
-        # Set window flags
+        # Set window flags, the window is hidden on close and reused for the next snippet
         self.setWindowFlag(Qt.WindowType.Window)  # Set top-level
         self.setWindowFlag(Qt.WindowType.FramelessWindowHint)
-        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
-
-        # Add offset to the window position
-        self.move(self.parent.x() + 120, self.parent.y() + 100)
 
         # Set dialog object name for styling
         self.setObjectName("Popup")
 
     def setup_tracking(self):
-        """Initialize window move and resize tracking"""
+        """
+        Initialize window move and resize tracking.
+
+        Holding Ctrl moves the window with the mouse and Ctrl+Shift resizes it. The
+        modifiers are followed from the key events of the popup and the mouse is grabbed
+        while a mode is active, so nothing runs while the editor sits idle.
+        """
         self.resize_tracking = False
         self.move_tracking = False
         self.last_pos = None
 
-        # Create timer for tracking mouse position
-        self.tracking_timer = QTimer(self)
-        self.tracking_timer.timeout.connect(self.check_state)
-        self.tracking_timer.start(50)  # Check every 50ms
-
-    def setup_ui(self, snippet, archived):
+    def setup_ui(self):
         """Set up the UI layout and components exactly matching original layout"""
         # Main layout setup
         layout = QVBoxLayout()
@@ -91,13 +96,139 @@ class SnippetPopupManager(QDialog):
         self.setLayout(title_bar_layout)
 
         # Create each UI section preserving exact layout
-        self.create_type_input(layout, snippet, archived)
-        self.create_name_input(layout, snippet)
-        self.create_description_input(layout, snippet)
-        self.create_text_area(layout, snippet)
+        self.create_type_input(layout)
+        self.create_name_input(layout)
+        self.create_description_input(layout)
+        self.create_text_area(layout)
         self.create_button_area(layout)
 
-    def create_type_input(self, parent_layout, snippet, archived):
+        # Key events go to the focused child, the filter sees them before it does
+        for widget in [self, *self.findChildren(QWidget)]:
+            widget.installEventFilter(self)
+
+    def bind_snippet(self, snippet=None, file_extension=None, archived=None):
+        """
+        Fill the editor with a snippet, or clear it for a new one.
+
+        The dialog is built once and rebound on every open: the fields are reset and the
+        text area gets a new document, highlighted for the snippet's extension.
+
+        Args:
+            snippet (Snippet): The snippet to edit, with its content. None for a new snippet.
+            file_extension (str): Extension preselected for a new snippet.
+            archived (bool): Whether the selected snippet type is archived.
+        """
+        self.existing_snippet = snippet
+        self.extension = file_extension
+        self.closed_emitted = False
+
+        # Set initial type
+        snippet_type = ""
+        if self.parent.selected_snippet_type and not archived:
+            snippet_type = self.parent.selected_snippet_type
+        if snippet:
+            snippet_type = snippet.type
+        self.type_input.setText(snippet_type)
+
+        # Set initial extension
+        self.file_extension_label.setCurrentIndex(0)
+        if self.extension and not snippet:
+            self.file_extension_label.setCurrentText(self.extension)
+        if snippet:
+            self.file_extension_label.setCurrentText(snippet.extension)
+
+        self.snippet_name_input.setText(snippet.name if snippet else "")
+        self.description_input.setText(snippet.description if snippet else "")
+        self.bind_document(snippet)
+
+        # Reset the size and add offset to the window position
+        self.resize(self.min_width, self.min_height)
+        self.move(self.parent.x() + 120, self.parent.y() + 100)
+
+    def bind_document(self, snippet):
+        """
+        Swap in a new document for the snippet. The previous document is deleted along
+        with its highlighter and undo history.
+
+        Snippets over LARGE_CONTENT_SIZE characters are edited in a QPlainTextEdit, which
+        lays out plain text without the rich text machinery, and are loaded in chunks.
+        """
+        self.stop_loading()
+        content = snippet.content if snippet else ""
+        large = len(content) > self.LARGE_CONTENT_SIZE
+        if large and self.plain_text_area is None:
+            self.plain_text_area = self.create_editor(QPlainTextEdit())
+            self.plain_text_area.installEventFilter(self)
+        editor = self.plain_text_area if large else self.rich_text_area
+
+        document = self.new_document(editor)
+        if not large:
+            document.setPlainText(content)
+            document.setModified(False)
+        self.set_document(editor, document)
+        self.snippet_text_area = editor
+        self.editor_stack.setCurrentWidget(editor)
+
+        # The other editor lets go of the previous snippet
+        for area in (self.rich_text_area, self.plain_text_area):
+            if area is not None and area is not editor:
+                self.set_document(area, self.new_document(area))
+
+        self.highlighter = None
+        if large:
+            self.loading = [document, content, 0, snippet.extension]
+            editor.setReadOnly(True)
+            self.save_button.setEnabled(False)
+            self.load_timer.start()
+        elif snippet:
+            self.highlight(document, snippet.extension)
+
+    def highlight(self, document, extension):
+        """Apply syntax highlighting for the snippet's language"""
+        self.highlighter = HighlighterManager.highlighter(
+            document, extension, self.snippet_text_area
+        )
+
+    def load_chunk(self):
+        """Append the next chunk of the large snippet being loaded"""
+        document, content, position, extension = self.loading
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(content[position : position + self.LOAD_CHUNK_SIZE])
+        self.loading[2] = position = position + self.LOAD_CHUNK_SIZE
+        if position >= len(content):
+            self.stop_loading()
+            document.setModified(False)
+            self.highlight(document, extension)
+
+    def stop_loading(self):
+        """End the load of a large snippet, making the editor editable again"""
+        self.load_timer.stop()
+        if self.loading is not None:
+            self.loading[0].setUndoRedoEnabled(True)
+            self.loading = None
+        self.snippet_text_area.setReadOnly(False)
+        self.save_button.setEnabled(True)
+
+    def new_document(self, editor) -> QTextDocument:
+        """An empty document for editor, undo is enabled once its content is in"""
+        document = QTextDocument(editor)
+        if isinstance(editor, QPlainTextEdit):
+            document.setDocumentLayout(QPlainTextDocumentLayout(document))
+            document.setUndoRedoEnabled(False)
+        document.setDefaultFont(editor.font())
+        return document
+
+    @staticmethod
+    def set_document(editor, document):
+        """Show document in editor, the editor only deletes a document it created itself"""
+        previous = editor.document()
+        owned = previous.parent() is editor
+        editor.setDocument(document)
+        if owned:
+            previous.deleteLater()
+
+    def create_type_input(self, parent_layout):
         """Create the snippet type input section"""
         type_layout = QHBoxLayout()
 
@@ -115,12 +246,6 @@ class SnippetPopupManager(QDialog):
         self.type_input = QLineEdit(maxLength=25)
         self.type_input.setObjectName("TypeInputField")
 
-        # Set initial value
-        if self.parent.selected_snippet_type and not archived:
-            self.type_input.setText(self.parent.selected_snippet_type)
-        if snippet:
-            self.type_input.setText(snippet["type"])
-
         # File extension dropdown
         self.file_extension_label = QComboBox()
         self.file_extension_label.addItems(
@@ -128,12 +253,6 @@ class SnippetPopupManager(QDialog):
         )
         self.file_extension_label.setObjectName("fileExtensionCombo")
 
-        # Set initial extension
-        if self.extension and not snippet:
-            self.file_extension_label.setCurrentText(self.extension[0])
-        if snippet:
-            self.file_extension_label.setCurrentText(snippet["extension"])
-
         self.file_extension_label.setPlaceholderText("File Ext")
         self.file_extension_label.setFixedWidth(60)
 
@@ -144,7 +263,7 @@ class SnippetPopupManager(QDialog):
 
         parent_layout.addLayout(type_layout)
 
-    def create_name_input(self, parent_layout, snippet):
+    def create_name_input(self, parent_layout):
         """Create the snippet name input section"""
         snippet_name_layout = QHBoxLayout()
 
@@ -157,13 +276,11 @@ class SnippetPopupManager(QDialog):
         # Name input field
         self.snippet_name_input = QLineEdit()
         self.snippet_name_input.setObjectName("InputField")
-        if snippet:
-            self.snippet_name_input.setText(snippet["name"])
 
         snippet_name_layout.addWidget(self.snippet_name_input)
         parent_layout.addLayout(snippet_name_layout)
 
-    def create_description_input(self, parent_layout, snippet):
+    def create_description_input(self, parent_layout):
         """Create the description input section"""
         description_layout = QHBoxLayout()
 
@@ -176,29 +293,33 @@ class SnippetPopupManager(QDialog):
         # Description input field
         self.description_input = QLineEdit()
         self.description_input.setObjectName("InputField")
-        if snippet:
-            self.description_input.setText(snippet["description"])
 
         description_layout.addWidget(self.description_input)
         parent_layout.addLayout(description_layout)
 
-    def create_text_area(self, parent_layout, snippet):
-        """Create the snippet text area"""
-        self.snippet_text_area = QTextEdit(acceptRichText=False)
-        self.snippet_text_area.setObjectName("snippetTextArea")
-        self.snippet_text_area.setPlaceholderText("Type your snippet here...")
-
-        # Set content if editing existing snippet
-        if snippet:
-            self.snippet_text_area.setPlainText(snippet.get("content", ""))
-
-            # Apply syntax highlighting for Python files
-            extension = snippet.get("extension", "")
-            highlighter = self.highlighter_dict.get(extension, None)
-            if highlighter:
-                self.highlighter = highlighter(self.snippet_text_area.document())
-
-        parent_layout.addWidget(self.snippet_text_area)
+    def create_text_area(self, parent_layout):
+        """
+        Create the snippet text area. snippet_text_area is the editor of the bound snippet,
+        the QPlainTextEdit for large snippets is only created once one is opened.
+        """
+        self.editor_stack = QStackedWidget()
+        self.rich_text_area = self.create_editor(QTextEdit(acceptRichText=False))
+        self.plain_text_area = None
+        self.snippet_text_area = self.rich_text_area
+
+        # Large snippets are loaded a chunk per timeout
+        self.loading = None  # [document, content, position, extension]
+        self.load_timer = QTimer(self)
+        self.load_timer.timeout.connect(self.load_chunk)
+
+        parent_layout.addWidget(self.editor_stack)
+
+    def create_editor(self, editor):
+        """Set up an editor of the text area and add it to the stack"""
+        editor.setObjectName("snippetTextArea")
+        editor.setPlaceholderText("Type your snippet here...")
+        self.editor_stack.addWidget(editor)
+        return editor
 
     def create_button_area(self, parent_layout):
         """Create the button area with save and close buttons"""
@@ -218,10 +339,35 @@ class SnippetPopupManager(QDialog):
 
         parent_layout.addLayout(button_layout)
 
-    def check_state(self):
-        """Check for keyboard modifiers and update tracking state"""
-        # Get current modifiers
-        modifiers = QApplication.keyboardModifiers()
+    def eventFilter(self, watched, event):
+        """Follow the modifiers from the key events of the popup and its children"""
+        event_type = event.type()
+        if event_type in (QEvent.Type.KeyPress, QEvent.Type.KeyRelease):
+            modifiers = event.modifiers()
+            # The event of a modifier key may not count the key itself yet
+            modifier = self.MODIFIER_KEYS.get(event.key())
+            if modifier is not None:
+                if event_type == QEvent.Type.KeyPress:
+                    modifiers |= modifier
+                else:
+                    modifiers &= ~modifier
+            self.check_state(modifiers)
+        elif event_type == QEvent.Type.WindowDeactivate and watched is self:
+            self.check_state(Qt.KeyboardModifier.NoModifier)
+        return False
+
+    def mouseMoveEvent(self, event):
+        # Only delivered while tracking grabs the mouse or a button is held
+        position = event.globalPosition().toPoint()
+        if self.resize_tracking:
+            self.process_resize(position)
+        elif self.move_tracking:
+            self.process_move(position)
+        else:
+            super().mouseMoveEvent(event)
+
+    def check_state(self, modifiers):
+        """Update the tracking state from the keyboard modifiers"""
         ctrl_pressed = bool(modifiers & Qt.KeyboardModifier.ControlModifier)
         shift_pressed = bool(modifiers & Qt.KeyboardModifier.ShiftModifier)
 
@@ -230,33 +376,31 @@ class SnippetPopupManager(QDialog):
             # Start resize tracking
             self.resize_tracking = True
             self.move_tracking = False
-            self.last_pos = QCursor.pos()
+            self.start_tracking()
 
         # Check for Ctrl only (move mode)
         elif ctrl_pressed and not shift_pressed and not self.move_tracking:
             # Start move tracking
             self.move_tracking = True
             self.resize_tracking = False
-            self.last_pos = QCursor.pos()
+            self.start_tracking()
 
-        # If no modifiers or wrong combination, stop tracking
-        elif not ctrl_pressed or (not self.resize_tracking and not self.move_tracking):
-            # Stop tracking
-            if self.resize_tracking or self.move_tracking:
-                self.resize_tracking = False
-                self.move_tracking = False
-                self.last_pos = None
+        # If no modifiers, stop tracking
+        elif not ctrl_pressed and (self.resize_tracking or self.move_tracking):
+            self.resize_tracking = False
+            self.move_tracking = False
+            self.last_pos = None
+            self.setMouseTracking(False)
+            self.releaseMouse()
 
-        # Process mouse movement based on active mode
-        if self.resize_tracking:
-            self.process_resize()
-        elif self.move_tracking:
-            self.process_move()
+    def start_tracking(self):
+        """Receive every mouse move, with or without a button held, until tracking stops"""
+        self.last_pos = QCursor.pos()
+        self.setMouseTracking(True)
+        self.grabMouse()
 
-    def process_resize(self):
+    def process_resize(self, current_pos):
         """Handle window resizing when in resize mode"""
-        current_pos = QCursor.pos()
-
         if self.last_pos is None:
             self.last_pos = current_pos
             return
@@ -288,10 +432,8 @@ class SnippetPopupManager(QDialog):
         # Update last position
         self.last_pos = current_pos
 
-    def process_move(self):
+    def process_move(self, current_pos):
         """Handle window movement when in move mode"""
-        current_pos = QCursor.pos()
-
         if self.last_pos is None:
             self.last_pos = current_pos
             return
@@ -320,17 +462,11 @@ class SnippetPopupManager(QDialog):
             self.closed_emitted = True  # Set flag to prevent further emissions
         self.close()
 
-    def delete_snippet(self):
-        self.parent.snippet_manager.delete_snippet(self.existing_snippet)
-        self.snippet_changed.emit()
-        self.close()
-
     def save_snippet(self):
         # Retrieve input values
         snippet_name = self.snippet_name_input.text()
         snippet_type = self.type_input.text()
         description = self.description_input.text()
-        snippet_content = self.snippet_text_area.toPlainText()
         snippet_extension = self.file_extension_label.currentText()
 
         # Create the new snippet entry
@@ -338,22 +474,43 @@ class SnippetPopupManager(QDialog):
             "Name": f"""{snippet_name}""",
             "Type": f"""{snippet_type}""",
             "Description": f"""{description}""",
-            "Content": f"""{snippet_content}""",
             "Extension": f"""{snippet_extension}""",
         }
-
+        # Unchanged content is not read back from the editor nor written
+        if (
+            self.existing_snippet is None
+            or self.snippet_text_area.document().isModified()
+        ):
+            new_snippet["Content"] = self.snippet_text_area.toPlainText()
+
+        # The window is updated from the change events, afterwards it shows the snippet's type.
+        # The popup is rebound to the next snippet, so the callback is bound to the main window.
+        follow_snippet = self.parent.reconciler.follow_snippet
         if self.existing_snippet is None:
-            self.parent.snippet_manager.save_snippet(new_snippet)
+            self.parent.data_worker.submit(
+                self.parent.snippet_manager.save_snippet,
+                new_snippet,
+                callback=follow_snippet,
+            )
         else:
-            self.parent.snippet_manager.update_existing_snippet(
-                new_snippet, self.existing_snippet
+            snippet_manager = self.parent.snippet_manager
+
+            def follow_edit(snippet):
+                # Opening the editor is not an edit, a saved change counts towards usage
+                if snippet is not None:
+                    snippet_manager.record_usage(snippet.id, "edit")
+                follow_snippet(snippet)
+
+            self.parent.data_worker.submit(
+                snippet_manager.update_existing_snippet,
+                new_snippet,
+                self.existing_snippet,
+                callback=follow_edit,
             )
-        self.parent.selected_snippet_type = snippet_type
-        self.parent.snippets_refreshed = True
-        self.parent.refresh_app()
         self.close()
 
     def closeEvent(self, event):
+        self.check_state(Qt.KeyboardModifier.NoModifier)
         if not self.closed_emitted:
             self.closed.emit()
             self.closed_emitted = True
@@ -17,6 +17,17 @@ colors = {
     "highlight_2": "#D4AF37",  # Burnt Orange
     "highlight_3": "#D4AF37",  # Gold
     "label": "#8BA888",
+    "snippet_list": {
+        "text": "text",
+        "border": "light_gray",
+        "hover_row": "background",
+        "selected": "main",
+        "copy": "light_main",
+        "edit": "light_main",
+        "hover": "alt_text",
+        "delete": "highlight",
+        "delete_hover": "foreground",
+    },
     "palette": {
         "Window": "light_main",
         "WindowText": "text",
@@ -76,7 +87,7 @@ qss = """
 		border-radius: 10px;
 		border: 1px solid {main};
 	}}
-    QTextEdit QScrollBar:vertical {{
+    QTextEdit QScrollBar:vertical, QPlainTextEdit QScrollBar:vertical {{
 		background-color: {foreground};
         color: {text};
 		width: 20px;
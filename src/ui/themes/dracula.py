@@ -10,6 +10,17 @@ colors = {
     "purple": "#bd93f9",
     "red": "#ff5555",
     "yellow": "#f1fa8c",
+    "snippet_list": {
+        "text": "foreground",
+        "border": "comment",
+        "hover_row": "current_line",
+        "selected": "comment",
+        "copy": "green",
+        "edit": "pink",
+        "hover": "purple",
+        "delete": "red",
+        "delete_hover": "background",
+    },
     "palette": {
         "Window": "background",
         "WindowText": "foreground",
@@ -51,7 +62,7 @@ qss = """
         padding: 0px;
         margin: 0px;
     }}
-    QTextEdit {{
+    QTextEdit, QPlainTextEdit {{
         background-color: {background};
         color: {foreground};
         border: 1px solid {comment};
@@ -80,7 +91,7 @@ qss = """
         border: 1px solid {comment};
         padding: 5px;
     }}
-    QTextEdit {{
+    QTextEdit, QPlainTextEdit {{
         background-color: {background};
         color: {foreground};
         border: 1px solid {comment};
@@ -17,6 +17,17 @@ colors = {
     "highlight_2": "#d26b5b",  # Red
     "highlight_3": "#F5E2A1",  # Orange
     "label": "#8BA888",
+    "snippet_list": {
+        "text": "text",
+        "border": "light_gray",
+        "hover_row": "background",
+        "selected": "dark_main",
+        "copy": "highlight_3",
+        "edit": "light_main",
+        "hover": "alt_text",
+        "delete": "highlight_2",
+        "delete_hover": "foreground",
+    },
     "palette": {
         "Window": "background",
         "WindowText": "text",
@@ -76,7 +87,7 @@ qss = """
 		border-radius: 10px;
 		border: 1px solid {main};
 	}}
-    QTextEdit QScrollBar:vertical {{
+    QTextEdit QScrollBar:vertical, QPlainTextEdit QScrollBar:vertical {{
 		background-color: {foreground};
         color: {text};
 		width: 20px;
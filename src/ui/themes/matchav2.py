@@ -16,6 +16,17 @@ colors = {
     "orange": "#ffb86f",
     "red": "#c83e4d",
     "label": "#8BA888",
+    "snippet_list": {
+        "text": "text",
+        "border": "green_border",
+        "hover_row": "background",
+        "selected": "green_border",
+        "copy": "green",
+        "edit": "text",
+        "hover": "alt_text",
+        "delete": "red",
+        "delete_hover": "foreground",
+    },
     "palette": {
         "Window": "background",
         "WindowText": "foreground",
@@ -2,7 +2,7 @@ from PyQt6.QtGui import QColor, QPalette
 from PyQt6.QtWidgets import QApplication, QTextEdit
 from src.ui.themes import acorn, dracula, matcha, matchav2
 from src.data.database_manager import DatabaseManager
-from src.ui.highlighters.syntax_manager import PythonHighlighter
+from src.ui.highlighters.syntax_manager import GenericSyntaxHighlighter
 from typing import Dict
 
 
@@ -11,7 +11,6 @@ class ThemeManager:
 
     def __init__(self):
         self.themes = {theme.name: theme for theme in all_themes}
-        self.highlighters = []
         default_theme = self.get_default_theme()
         self.current_theme = default_theme
 
@@ -39,18 +38,16 @@ class ThemeManager:
             self._current_theme = self.themes[theme_name]
             self._current_theme.apply()
 
-        for highlighter in self.highlighters:
-            highlighter.refresh_theme()
+        GenericSyntaxHighlighter.refresh_theme()
 
     def get_theme_names(self) -> Dict:
         return list(self.themes.keys())
 
     def get_default_theme(self) -> str:
         """Get the default theme from the database"""
-        default_theme = DatabaseManager().read_database(
+        return DatabaseManager().read_value(
             "default_theme", "theme", conditions="id = 1"
         )
-        return default_theme["theme"][0]
 
     def update_default_theme(self, theme_name: str) -> None:
         """Update the default theme in the database"""
@@ -64,6 +61,12 @@ class ThemeManager:
             return self._current_theme.get_theme_color(role)
         return QColor()
 
+    def get_snippet_list_color(self, element: str) -> QColor:
+        """Retrieve the color of a painted snippet list element from the current theme."""
+        if self._current_theme:
+            return self._current_theme.get_snippet_list_color(element)
+        return QColor()
+
 
 class Theme:
     def __init__(self, name: str, colors: Dict, stylesheet: str):
@@ -95,6 +98,13 @@ class Theme:
             return QColor(color_value)
         return QColor()
 
+    def get_snippet_list_color(self, element: str) -> QColor:
+        """Retrieve the color of a painted snippet list element."""
+        color_name = self.colors.get("snippet_list", {}).get(element, None)
+        if color_name:
+            return QColor(self.colors[color_name])
+        return QColor()
+
 
 # Define themes
 
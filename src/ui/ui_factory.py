@@ -12,6 +12,8 @@ from PyQt6.QtCore import Qt
 
 
 class UIFactory(QWidget):
+    TOOLTIP_LENGTH = 400  # characters shown of a tooltip
+
     def __init__(self):
         super().__init__()
 
@@ -102,17 +104,28 @@ class UIFactory(QWidget):
         text_area.ensureCursorVisible()
         return text_area
 
+    @staticmethod
+    def truncate_tooltip(tooltip):
+        length = UIFactory.TOOLTIP_LENGTH
+        return tooltip[:length] + "\n..." if len(tooltip) > length else tooltip
+
     @staticmethod
     def create_QLabel(
-        text, tooltip=None, object_name=None, read_only=False, fixed_height=None
+        text,
+        tooltip=None,
+        object_name=None,
+        read_only=False,
+        fixed_height=None,
     ):
+        """Generic create label factory method."""
+
         label = QLabel(text)
         label.setTextInteractionFlags(
             Qt.TextInteractionFlag.TextSelectableByMouse
         )  # Allow text selection
 
         if tooltip:
-            label.setToolTip(tooltip[:400] + "\n..." if len(tooltip) > 400 else tooltip)
+            label.setToolTip(UIFactory.truncate_tooltip(tooltip))
 
         if object_name:
             label.setObjectName(object_name)
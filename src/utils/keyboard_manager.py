@@ -13,7 +13,7 @@ class KeyboardManager(QObject):
     def __init__(self):
         super().__init__()
         self.db = DatabaseManager()
-        self._hotkey_config = self.db.read_database("hotkeys", "hotkey")["hotkey"][0]
+        self._hotkey_config = self.db.read_value("hotkeys", "hotkey")
         self.is_active = False  # Track whether the window is active
         self.setup_hotkey_listener()
         self.setup_enter_listener()
@@ -0,0 +1,27 @@
+import os
+import pytest
+from PyQt6.QtWidgets import QApplication
+from src import DatabaseManager, ConfigurationManager, SnippetManager
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    db_path = tmp_path / "acorn.db"
+    monkeypatch.setattr(DatabaseManager, "get_db_path", staticmethod(lambda: db_path))
+    yield DatabaseManager()
+    DatabaseManager.close_connections()
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def snippet_manager(temp_db):
+    # Skip ConfigurationManager.__init__ as it checks GitHub for the current release
+    config = ConfigurationManager.__new__(ConfigurationManager)
+    config.current_version = "0.0.0"
+    config.configure_database()
+    return SnippetManager()
@@ -0,0 +1,11 @@
+def make_snippet(
+    name, snippet_type="SQL", description="", content="", extension=".sql"
+):
+    """Build the dict a snippet is saved from, as the snippet editor submits it"""
+    return {
+        "Name": name,
+        "Type": snippet_type,
+        "Description": description,
+        "Content": content,
+        "Extension": extension,
+    }
@@ -0,0 +1,70 @@
+import pytest
+from tests.helpers import make_snippet
+from src.data.change_bus import (
+    ChangeBus,
+    SnippetsInserted,
+    SnippetsDeleted,
+    SnippetsUpdated,
+    TypeAdded,
+    TypeRemoved,
+)
+
+
+def collect(bus):
+    batches = []
+    bus.changed.connect(batches.append)
+    return batches
+
+
+def test_events_are_coalesced(qapp):
+    bus = ChangeBus()
+    batches = collect(bus)
+
+    bus.publish(SnippetsDeleted([1]))
+    bus.publish(SnippetsDeleted([2]), TypeRemoved("SQL", False))
+    bus.publish(SnippetsDeleted([3]))
+    assert batches == []
+
+    qapp.processEvents()
+    assert len(batches) == 1
+    assert [type(event) for event in batches[0]] == [
+        SnippetsDeleted,
+        TypeRemoved,
+        SnippetsDeleted,
+    ]
+    assert batches[0][0].snippet_ids == [1, 2]
+
+
+def test_writes_publish_after_commit(snippet_manager, qapp):
+    batches = collect(snippet_manager.changes)
+
+    with snippet_manager.db.connections.writer():
+        snippet_manager.save_snippet(make_snippet("a", snippet_type="Go"))
+        snippet_manager.save_snippet(make_snippet("b", snippet_type="Go"))
+        qapp.processEvents()
+        assert batches == []
+    qapp.processEvents()
+
+    (events,) = batches
+    assert isinstance(events[0], TypeAdded) and events[0].snippet_type == "Go"
+    assert [s["name"] for s in events[1].snippets] == ["a", "b"]
+
+    snippet = events[1].snippets[0]
+    snippet_manager.update_existing_snippet({"Type": "Rust"}, snippet)
+    qapp.processEvents()
+    updated = batches[-1]
+    assert [type(event) for event in updated] == [TypeAdded, SnippetsUpdated]
+    assert updated[1].fields == {"type"}
+
+
+def test_rolled_back_writes_publish_nothing(snippet_manager, qapp):
+    batches = collect(snippet_manager.changes)
+
+    with pytest.raises(RuntimeError):
+        with snippet_manager.db.connections.writer():
+            snippet_manager.save_snippet(make_snippet("a"))
+            raise RuntimeError
+    qapp.processEvents()
+
+    assert batches == []
+    assert snippet_manager.get_snippets() == []
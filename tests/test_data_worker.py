@@ -0,0 +1,57 @@
+import threading
+import pytest
+from PyQt6.QtCore import QEventLoop, QTimer
+from src.data.data_worker import DataWorker
+
+
+@pytest.fixture
+def worker(qapp):
+    worker = DataWorker()
+    yield worker
+    worker.shutdown()
+
+
+def wait_for(worker, ms=1000):
+    loop = QEventLoop()
+    worker.request_finished.connect(lambda *_: QTimer.singleShot(0, loop.quit))
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+def test_runs_off_the_gui_thread(worker):
+    results = []
+    worker.submit(threading.get_ident, callback=results.append)
+    wait_for(worker)
+    assert results and results[0] != threading.get_ident()
+
+
+def test_superseded_results_are_dropped(worker):
+    release = threading.Event()
+    results = []
+    worker.submit(release.wait, channel="search", callback=results.append)
+    worker.submit(lambda: "stale", channel="search", callback=results.append)
+    worker.submit(lambda: "latest", channel="search", callback=results.append)
+    release.set()
+    for _ in range(3):
+        wait_for(worker)
+    assert results == ["latest"]
+
+
+def test_superseded_query_is_interrupted(worker, temp_db):
+    started = threading.Event()
+
+    def slow_query():
+        started.set()
+        with temp_db.connections.reader() as conn:
+            return conn.execute(
+                "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+                "SELECT count(*) FROM n"
+            ).fetchone()
+
+    results = []
+    worker.submit(slow_query, channel="search", callback=results.append)
+    started.wait(1)
+    worker.submit(lambda: "latest", channel="search", callback=results.append)
+    for _ in range(2):
+        wait_for(worker)
+    assert results == ["latest"]
@@ -0,0 +1,43 @@
+import pytest
+import sqlite3
+from src import DatabaseManager
+
+
+def test_connection_is_reused(temp_db):
+    with temp_db.connections.reader() as first:
+        pass
+    with DatabaseManager().connections.reader() as second:
+        pass
+    assert first is second
+
+    # Managers survive closing their connections and reconnect on next use
+    DatabaseManager.close_connections()
+    assert temp_db.connections is DatabaseManager().connections
+    with temp_db.connections.reader() as conn:
+        assert conn is not first and conn.execute("SELECT 1").fetchone() == (1,)
+
+
+def test_wal_mode(temp_db):
+    with temp_db.connections.reader() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_parameterized_delete(temp_db):
+    temp_db.create_table("hotkeys", "id INTEGER PRIMARY KEY, hotkey TEXT NOT NULL")
+    temp_db.insert_data("hotkeys", ["hotkey"], ("a",))
+    temp_db.insert_data("hotkeys", ["hotkey"], ("b",))
+    temp_db.delete_data("hotkeys", "id = ?", params=(1,))
+    assert temp_db.read_database("hotkeys", "hotkey")["hotkey"].to_list() == ["b"]
+
+
+def test_stream_rows_batches_with_row_factory(temp_db):
+    temp_db.create_table("hotkeys", "id INTEGER PRIMARY KEY, hotkey TEXT NOT NULL")
+    for hotkey in "abcde":
+        temp_db.insert_data("hotkeys", ["hotkey"], (hotkey,))
+
+    rows = temp_db.stream_rows(
+        "hotkeys", "*", order="id", row_factory=sqlite3.Row, batch_size=2
+    )
+    assert [row["hotkey"] for row in rows] == list("abcde")
+    assert temp_db.read_value("hotkeys", "hotkey", "id = ?", params=(3,)) == "c"
+    assert temp_db.read_value("hotkeys", "hotkey", "id = ?", params=(9,)) is None
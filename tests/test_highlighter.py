@@ -0,0 +1,59 @@
+from PyQt6.QtGui import QTextDocument
+from PyQt6.QtWidgets import QTextEdit
+from src.ui.highlighters.syntax_manager import (
+    GenericSyntaxHighlighter,
+    HighlighterManager,
+)
+
+
+def highlighted(extension, text):
+    document = QTextDocument()
+    document.setPlainText(text)
+    highlighter = HighlighterManager.highlighter(document, extension)
+    highlighter.rehighlight()
+    blocks = [document.findBlockByNumber(n) for n in range(document.blockCount())]
+    return [
+        (block.userState(), [(r.start, r.length) for r in block.layout().formats()])
+        for block in blocks
+    ]
+
+
+def test_block_comments_span_lines(qapp):
+    blocks = highlighted(".sql", "select 1 /* a\nselect\nb */ from t")
+    assert blocks == [
+        (1, [(0, 6), (7, 1), (9, 4)]),
+        (1, [(0, 6)]),
+        (0, [(0, 4), (5, 4)]),
+    ]
+
+
+def test_python_strings_and_positions(qapp):
+    blocks = highlighted(".py", "s = '''\n'''  # 😀 x\nclass A(B): pass")
+    # The emoji takes two UTF-16 units
+    assert blocks == [
+        (1, [(4, 3)]),
+        (0, [(0, 3), (5, 6)]),
+        (0, [(0, 5), (6, 1), (12, 4)]),
+    ]
+
+
+def test_large_documents_are_deferred(qapp, monkeypatch):
+    monkeypatch.setattr(GenericSyntaxHighlighter, "DEFERRED_SIZE", 1_000)
+    editor = QTextEdit()
+    editor.setPlainText("\n".join(["select 1 from t"] * 200))
+    highlighter = HighlighterManager.highlighter(editor.document(), ".sql", editor)
+    assert highlighter.deferred
+    assert editor.document().lastBlock().userState() == -1
+
+    while highlighter.deferred:
+        qapp.processEvents()
+    assert editor.document().lastBlock().userState() == 0
+    assert editor.document().lastBlock().layout().formats()
+
+
+def test_every_extension_has_a_grammar(qapp, snippet_manager):
+    for extension in filter(None, snippet_manager.extension_map.values()):
+        grammar = HighlighterManager.grammar(extension)
+        assert grammar.pattern.groups == len(grammar.spans) + len(grammar.rules)
+        assert HighlighterManager.grammar(extension) is grammar
+    assert HighlighterManager.grammar(".txt") is None
@@ -0,0 +1,66 @@
+import pytest
+from src.data.migration_manager import MigrationManager
+from src.data.query_manager import QueryManager
+
+
+def test_legacy_vault_is_migrated(temp_db):
+    # Layout written by releases before extension/archived existed
+    temp_db.create_table(
+        "snippets",
+        "id INTEGER PRIMARY KEY, name TEXT NOT NULL, type TEXT NOT NULL, description TEXT NOT NULL, content TEXT NOT NULL",
+    )
+    temp_db.insert_data(
+        "snippets", ["name", "type", "description", "content"], ("a", "SQL", "", "x")
+    )
+
+    migrations = MigrationManager(temp_db, "0.0.0")
+    assert migrations.migrate() == migrations.latest_version
+    assert migrations.migrate() == migrations.latest_version
+
+    row = temp_db.read_rows(QueryManager.SNIPPET_SOURCE, QueryManager.snippet_columns())[0]
+    assert row["type"] == "SQL" and row["archived"] == 0
+    assert row["created_at"] and row["updated_at"]
+    assert temp_db.read_value("release", "release") == "0.0.0"
+    assert temp_db.read_value("hotkeys", "hotkey") == "<alt>+<shift>+p"
+    assert temp_db.has_search_index()
+
+
+def test_archived_flag_is_normalized(temp_db):
+    temp_db.create_table(
+        "snippets",
+        "id INTEGER PRIMARY KEY, name TEXT NOT NULL, type TEXT NOT NULL, description TEXT NOT NULL, content TEXT NOT NULL, extension TEXT, archived TEXT",
+    )
+    for archived in ("Y", "N", None):
+        temp_db.insert_data(
+            "snippets",
+            ["name", "type", "description", "content", "archived"],
+            ("a", "SQL", "", "", archived),
+        )
+
+    MigrationManager(temp_db).migrate()
+    rows = temp_db.read_rows(QueryManager.SNIPPET_SOURCE, "t.archived", order="s.id")
+    assert [row["archived"] for row in rows] == [1, 0, 0]
+    counts = temp_db.read_rows("snippet_types", "archived, snippet_count", order="archived")
+    assert [(row["archived"], row["snippet_count"]) for row in counts] == [(0, 2), (1, 1)]
+
+
+def test_fresh_vault_schema(temp_db):
+    MigrationManager(temp_db, "0.0.0").migrate()
+
+    with temp_db.connections.reader() as conn:
+        indexes = [
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' "
+                "AND name LIKE 'idx_%' ORDER BY name"
+            )
+        ]
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(snippets)")]
+    assert indexes == [
+        "idx_snippet_types_order",
+        "idx_snippets_description_key",
+        "idx_snippets_name_key",
+        "idx_snippets_type_extension",
+        "idx_snippets_type_rank_key",
+    ]
+    assert columns[-3:] == ["frecency", "name_key", "description_key"]
@@ -0,0 +1,33 @@
+from src.data.search_index import FuzzySearchIndex
+
+
+def test_subsequence_ranking():
+    index = FuzzySearchIndex()
+    index.load(
+        [
+            (1, "select_users", "", "SQL", 0),
+            (2, "sort elements", "useful", "Python", 0),
+            (3, "scripts", "", "Bash", 0),
+            (4, "select users", "", "SQL", 1),
+        ]
+    )
+
+    assert index.search("selus") == [1, 2]
+    assert index.search("selus", archived=True) == [4]
+    assert index.search("zz") == []
+
+
+def test_updates_and_compaction():
+    index = FuzzySearchIndex()
+    index.load(
+        [(snippet_id, f"name {snippet_id}", "", "SQL", 0) for snippet_id in range(10)]
+    )
+
+    for snippet_id in range(8):
+        index.remove(snippet_id)
+    index.upsert(9, "copied", "", "SQL")
+    index.upsert(10, "new name", "", "SQL")
+
+    assert len(index) == 3
+    assert index.search("name") == [8, 10]
+    assert index.search("copied") == [9]
@@ -0,0 +1,100 @@
+import json
+import pytest
+from src.data.snippet_importer import (
+    JsonSnippetReader,
+    SnippetImporter,
+    SnippetReader,
+)
+from tests.helpers import make_snippet
+
+
+def test_reads_vscode_snippets_with_comments(snippet_manager, tmp_path):
+    path = tmp_path / "team.code-snippets"
+    path.write_text(
+        """{
+            // Comments and trailing commas are allowed
+            "Print": {"scope": "python", "prefix": ["pr"], "body": ["print('//')", "x"],},
+            "Select": {"scope": "sql,mysql", "body": "SELECT 1", "description": "query"},
+        }"""
+    )
+
+    snippets = list(SnippetImporter(snippet_manager).read(path))
+    assert snippets[0] == {
+        "name": "Print",
+        "type": "python",
+        "description": "pr",
+        "content": "print('//')\nx",
+        "extension": ".py",
+    }
+    assert (snippets[1]["type"], snippets[1]["extension"]) == ("sql", ".sql")
+
+
+def test_streams_json_arrays(snippet_manager, tmp_path, monkeypatch):
+    monkeypatch.setattr(JsonSnippetReader, "READ_SIZE", 8)
+    records = [
+        {"name": f"n{i}", "language": "Go", "body": "}],[" * i} for i in range(20)
+    ]
+    path = tmp_path / "snippets.json"
+    path.write_text(json.dumps(records, indent=2))
+
+    snippets = SnippetImporter(snippet_manager).read(path)
+    assert next(snippets)["name"] == "n0"
+    assert [s["content"] for s in snippets] == ["}],[" * i for i in range(1, 20)]
+
+    path.write_text('[{"name": "a"} {"name": "b"}]')
+    with pytest.raises(json.JSONDecodeError):
+        list(SnippetImporter(snippet_manager).read(path))
+
+
+def test_imports_csv_in_chunks(snippet_manager, tmp_path, qapp, monkeypatch):
+    path = tmp_path / "snippets.csv"
+    rows = "\n".join(f"n{i},Go,d{i},c{i}" for i in range(5))
+    path.write_text(f"Name,Type,Description,Content\n{rows}\n")
+
+    importer = SnippetImporter(snippet_manager)
+    importer.CHUNK_SIZE = 2
+    progress, published = [], []
+    importer.progress.connect(progress.append)
+    monkeypatch.setattr(
+        snippet_manager.changes, "publish", lambda *events: published.append(events)
+    )
+
+    assert importer.import_path(path) == 5
+    assert progress == [2, 4, 5]
+    # Each chunk publishes its own events as it commits
+    assert [[type(event).__name__ for event in events] for events in published] == [
+        ["TypeAdded", "SnippetsInserted"],
+        ["SnippetsInserted"],
+        ["SnippetsInserted"],
+    ]
+    assert [len(events[-1].snippets) for events in published] == [2, 2, 1]
+    listed = snippet_manager.list_snippets("Go")
+    assert len(listed) == 5 and listed[0]["extension"] == ".go"
+
+
+def test_imports_directory_tree(snippet_manager, tmp_path):
+    snippet_manager.save_snippet(make_snippet("hi", snippet_type="Python"))
+    first, second = tmp_path / "first", tmp_path / "second"
+    (first / "Queries").mkdir(parents=True)
+    (first / "Queries" / "users.sql").write_text("SELECT * FROM users")
+    (first / "hello.py").write_text("print('hi')")
+    (first / "notes.txt").write_text("skipped")
+    (second / "queries").mkdir(parents=True)
+    (second / "queries" / "orders.sql").write_text("SELECT * FROM orders")
+    (second / "main.go").write_text("package main")
+
+    importer = SnippetImporter(snippet_manager)
+    assert importer.import_path(first) == 2
+    assert importer.import_path(second) == 2
+    # Types are matched regardless of case, new ones keep the casing they were read with
+    assert snippet_manager.get_snippet_types() == ["go", "Python", "Queries"]
+    assert len(snippet_manager.list_snippets("Python")) == 2
+    assert len(snippet_manager.list_snippets("Queries")) == 2
+
+
+def test_readers_must_implement_read(snippet_manager):
+    class UnfinishedReader(SnippetReader):
+        suffixes = (".txt",)
+
+    with pytest.raises(TypeError):
+        UnfinishedReader(snippet_manager.extension_map)
@@ -0,0 +1,101 @@
+from PyQt6.QtCore import Qt, QRect, QPoint
+from PyQt6.QtTest import QTest
+from src.data.snippet import Snippet
+from src.ui.snippet_list import SnippetListModel, SnippetDelegate, SnippetListView
+from src.ui.themes.themes_manager import ThemeManager
+
+
+def test_model_loads_content_only_for_tooltips(qapp):
+    loaded, shown = [], []
+    model = SnippetListModel(
+        preview_loader=lambda snippet_id, length, callback: loaded.append(
+            (snippet_id, length, callback)
+        )
+    )
+    model.preview_loaded.connect(shown.append)
+    model.set_snippets([Snippet(id=1, name="a", description="b")])
+
+    index = model.index(0)
+    assert model.rowCount() == 1
+    assert model.data(index) == "a"
+    assert loaded == []
+
+    # The preview is read in the background and kept once it arrives
+    assert model.data(index, Qt.ItemDataRole.ToolTipRole) is None
+    assert [request[:2] for request in loaded] == [(1, 401)]
+    loaded[0][2]("x")
+    assert shown == [1]
+    assert model.data(index, Qt.ItemDataRole.ToolTipRole) == "x"
+    assert len(loaded) == 1
+
+    model.update_snippet(Snippet(id=1, name="a", description="c"))
+    assert model.data(index, Qt.ItemDataRole.ToolTipRole) is None
+    assert len(loaded) == 2
+
+
+def test_delegate_hit_testing(qapp):
+    delegate = SnippetDelegate(ThemeManager.__new__(ThemeManager), "", "")
+    row = QRect(0, 40, 600, SnippetDelegate.ROW_HEIGHT)
+    buttons = delegate.button_rects(row)
+
+    assert delegate.button_at(row, buttons["copy"].center()) == "copy"
+    assert delegate.button_at(row, buttons["edit"].center()) == "edit"
+    assert delegate.button_at(row, buttons["delete"].center()) == "delete"
+    assert delegate.button_at(row, QPoint(300, 60)) is None
+    assert delegate.text_rect(row).contains(QPoint(300, 60))
+
+
+def test_model_applies_row_deltas(qapp):
+    def by_name(snippet):
+        return snippet.name
+
+    model = SnippetListModel()
+    model.set_snippets([Snippet(id=1, name="a"), Snippet(id=3, name="c")])
+
+    model.insert_snippet(Snippet(id=2, name="b"), by_name)
+    assert [s.id for s in model.snippets] == [1, 2, 3]
+
+    assert model.update_snippet(Snippet(id=1, name="d"), by_name)
+    assert [s.name for s in model.snippets] == ["b", "c", "d"]
+
+    assert model.remove_snippet(3)
+    assert not model.remove_snippet(3)
+    assert [s.id for s in model.snippets] == [2, 1]
+
+
+def test_model_fetches_pages(qapp):
+    requested = []
+    model = SnippetListModel()
+    model.set_snippets([Snippet(id=1, name="a")], lambda: requested.append(True))
+
+    assert model.canFetchMore()
+    model.fetchMore()
+    assert requested == [True] and not model.canFetchMore()
+
+    # Rows sorting after the loaded pages come with a later page
+    model.insert_snippet(Snippet(id=9, name="z"), lambda snippet: snippet.name)
+    model.append_snippets([Snippet(id=1, name="a"), Snippet(id=2, name="b")])
+    assert [s.id for s in model.snippets] == [1, 2]
+    assert not model.canFetchMore()
+
+
+def test_view_emits_clicked_snippet_records(qapp):
+    model = SnippetListModel()
+    model.set_snippets([Snippet(id=1, name="a", description="b")])
+    delegate = SnippetDelegate(ThemeManager.__new__(ThemeManager), "", "")
+    view = SnippetListView(model, delegate)
+    view.resize(600, 200)
+    requested = []
+    view.copy_requested.connect(lambda snippet, position: requested.append(snippet))
+    view.edit_requested.connect(requested.append)
+    view.delete_requested.connect(requested.append)
+
+    rect = view.visualRect(model.index(0))
+    for button in ("copy", "edit", "delete"):
+        QTest.mouseClick(
+            view.viewport(),
+            Qt.MouseButton.LeftButton,
+            pos=delegate.button_rects(rect)[button].center(),
+        )
+    assert [type(snippet) for snippet in requested] == [Snippet] * 3
+    assert [snippet.id for snippet in requested] == [1, 1, 1]
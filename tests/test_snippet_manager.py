@@ -1,5 +1,7 @@
 import pytest
 from src import DatabaseManager, SnippetManager
+from src.data.query_manager import QueryManager
+from tests.helpers import make_snippet
 import polars as pl
 
 
@@ -13,3 +15,203 @@ def test_get_snippets():
     sm = SnippetManager()
     results = sm.get_snippets()
     assert len(results) > 0
+
+
+def test_search_ranks_name_matches_first(snippet_manager):
+    snippet_manager.save_snippet(make_snippet("notes", description="select helpers"))
+    snippet_manager.save_snippet(make_snippet("select users"))
+    snippet_manager.save_snippet(make_snippet("other", content="SELECT 1"))
+
+    results = snippet_manager.perform_search("select")
+    assert [r["name"] for r in results] == ["select users", "notes"]
+
+    results = snippet_manager.perform_search("*select")
+    assert [r["name"] for r in results][-1] == "other"
+
+
+def test_cache_invalidated_per_type(snippet_manager):
+    snippet_manager.save_snippet(make_snippet("a", snippet_type="SQL"))
+    snippet_manager.save_snippet(make_snippet("b", snippet_type="Python"))
+    python_snippets = snippet_manager.get_snippets("Python")
+    sql_snippets = snippet_manager.get_snippets("SQL")
+    assert snippet_manager.get_snippets("Python") is python_snippets
+
+    snippet_manager.save_snippet(make_snippet("c", snippet_type="SQL"))
+    assert snippet_manager.get_snippets("Python") is python_snippets
+    assert len(snippet_manager.get_snippets("SQL")) == len(sql_snippets) + 1
+
+    snippet_manager.archive_snippet_type("SQL")
+    assert snippet_manager.get_snippet_types() == ["Python"]
+    assert snippet_manager.get_snippet_types(archived=True) == ["SQL"]
+
+
+def test_listing_excludes_content(snippet_manager):
+    snippet_manager.save_snippet(make_snippet("a", content="SELECT 1"))
+    listed = snippet_manager.list_snippets("SQL")[0]
+    assert "content" not in listed
+    assert listed["content_length"] == len("SELECT 1")
+
+    assert snippet_manager.get_snippet_content(listed["id"]) == "SELECT 1"
+    snippet_manager.update_existing_snippet({"Content": "SELECT 2"}, listed)
+    assert snippet_manager.get_snippet_content(listed["id"]) == "SELECT 2"
+
+    # Tooltip previews read a prefix and leave the content cache alone
+    snippet_manager.update_existing_snippet({"Content": "SELECT 3"}, listed)
+    assert snippet_manager.get_content_preview(listed["id"], 4) == "SELE"
+    assert listed["id"] not in snippet_manager._content_cache
+    assert snippet_manager.get_content_preview(-1, 4) == ""
+
+
+def test_fuzzy_search_follows_writes(snippet_manager):
+    snippet_manager.save_snippet(make_snippet("get_user_by_id"))
+    snippet_manager.save_snippet(make_snippet("gather unused bits", snippet_type="Python"))
+    assert snippet_manager.perform_search("gubi", fuzzy=True)[0]["name"] == (
+        "get_user_by_id"
+    )
+
+    # Writes after the index is built are applied to it
+    snippet_manager.save_snippet(make_snippet("group by", snippet_type="Python"))
+    assert [r["name"] for r in snippet_manager.perform_search("grpby", fuzzy=True)] == [
+        "group by"
+    ]
+
+    snippet_manager.archive_snippet_type("SQL")
+    assert snippet_manager.perform_search("gubi", fuzzy=True)[0]["type"] == "Python"
+    assert [
+        r["name"]
+        for r in snippet_manager.perform_search("gubi", archived_status=True, fuzzy=True)
+    ] == ["get_user_by_id"]
+
+
+def test_bulk_operations(snippet_manager):
+    ids = [
+        snippet_manager.save_snippet(make_snippet(name))["id"]
+        for name in ("a", "b", "c")
+    ]
+    python_id = snippet_manager.save_snippet(
+        make_snippet("d", snippet_type="Python")
+    )["id"]
+
+    assert snippet_manager.retype_snippets(ids[:2] + [python_id], "Python") == 2
+    assert [s["name"] for s in snippet_manager.get_snippets("Python")] == ["a", "b", "d"]
+
+    assert snippet_manager.archive_snippets(ids) == 3
+    assert snippet_manager.get_snippet_types() == ["Python"]
+    assert snippet_manager.get_snippet_types(archived=True) == ["Python", "SQL"]
+    assert snippet_manager.archive_snippets(ids) == 0
+
+    assert snippet_manager.change_extension(ids, ".txt") == 3
+    assert snippet_manager.unarchive_snippets(ids[2:]) == 1
+    assert snippet_manager.get_snippet(ids[2])["extension"] == ".txt"
+
+    assert snippet_manager.delete_snippets(ids + [python_id]) == 4
+    assert snippet_manager.get_snippet_types() == []
+    assert snippet_manager.get_snippet_types(archived=True) == []
+
+
+def test_type_rows_follow_writes(snippet_manager):
+    def type_rows():
+        return [
+            (row["name"], row["archived"], row["snippet_count"])
+            for row in snippet_manager.db.read_rows(
+                "snippet_types", "*", order="name, archived"
+            )
+        ]
+
+    first = snippet_manager.save_snippet(make_snippet("a"))
+    snippet_manager.save_snippet(make_snippet("b"))
+    snippet_manager.save_snippet(make_snippet("c", snippet_type="Python"))
+    assert type_rows() == [("Python", 0, 1), ("SQL", 0, 2)]
+
+    # Archiving a type flips its row, the snippets keep their type_id
+    snippet_manager.archive_snippet_type("SQL")
+    assert type_rows() == [("Python", 0, 1), ("SQL", 1, 2)]
+    assert snippet_manager.get_snippet(first["id"])["archived"] == 1
+
+    # Renaming onto an existing type merges the rows
+    snippet_manager.unarchive_snippets([first["id"]])
+    assert snippet_manager.rename_snippet_type("SQL", "Python") == 1
+    assert type_rows() == [("Python", 0, 2), ("SQL", 1, 1)]
+    assert snippet_manager.rename_snippet_type("SQL", "Queries", archived=True) == 1
+    assert snippet_manager.get_snippet_types(archived=True) == ["Queries"]
+
+    snippet_manager.update_existing_snippet({"Type": "Go"}, first)
+    snippet_manager.delete_snippet(first["id"])
+    assert type_rows() == [("Python", 0, 1), ("Queries", 1, 1)]
+    assert snippet_manager.has_snippets() and snippet_manager.has_snippets(True)
+
+
+def test_search_keys_order_and_match(snippet_manager):
+    for name, snippet_type, extension in (
+        ("Zeta", "go", ".go"),
+        ("alpha", "SQL", ".txt"),
+        ("Beta_1", "SQL", ".sql"),
+        ("ÉCLAIR", "Python", ".py"),
+    ):
+        snippet_manager.save_snippet(
+            make_snippet(name, snippet_type=snippet_type, extension=extension)
+        )
+
+    assert snippet_manager.get_snippet_types() == ["go", "Python", "SQL"]
+    assert [s["name"] for s in snippet_manager.list_snippets("SQL")] == ["alpha", "Beta_1"]
+    assert snippet_manager.default_extension("SQL") == ".sql"
+    assert snippet_manager.default_extension("Rust") is None
+
+    # Short queries match name and description prefixes, wildcards are literal
+    assert [s["name"] for s in snippet_manager.perform_search("b")] == ["Beta_1"]
+    assert [s["name"] for s in snippet_manager.perform_search("é")] == ["ÉCLAIR"]
+    assert snippet_manager.perform_search("_") == []
+    snippet_manager.save_snippet(make_snippet("Omega", description="Bravo"))
+    assert [s["name"] for s in snippet_manager.perform_search("b")] == ["Beta_1", "Omega"]
+    with snippet_manager.db.connections.reader() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT s.id "
+            f"FROM {QueryManager.prefix_match_source()} WHERE t.archived = 0",
+            ("b%", "b%"),
+        ).fetchall()
+    assert "idx_snippets_name_key" in str(plan)
+    assert "idx_snippets_description_key" in str(plan)
+
+
+def test_keyset_pages(snippet_manager):
+    snippet_manager.insert_snippets(
+        ((f"select {i % 4}", "SQL", "", "", ".sql") for i in range(30)),
+        ("name", "type", "description", "content", "extension"),
+    )
+    for snippet_id in (3, 9, 9, 20):
+        snippet_manager.record_usage(snippet_id)
+    snippet_manager.flush_usage()
+
+    def read_pages(load_page):
+        snippets, cursor = load_page(page_size=7)
+        while cursor is not None:
+            page, cursor = load_page(cursor=cursor, page_size=7)
+            snippets += page
+        return [snippet["id"] for snippet in snippets]
+
+    listed = [snippet["id"] for snippet in snippet_manager.list_snippets("SQL")]
+    assert listed[:3] == [9, 20, 3]
+    assert read_pages(lambda **page: snippet_manager.list_page("SQL", **page)) == listed
+
+    for query, fuzzy in (("select", False), ("se", False), ("slct", True)):
+        searched = [s["id"] for s in snippet_manager.perform_search(query, fuzzy=fuzzy)]
+        assert len(searched) == 30
+        assert (
+            read_pages(
+                lambda **page: snippet_manager.search_page(query, fuzzy=fuzzy, **page)
+            )
+            == searched
+        )
+
+
+def test_snippet_records(snippet_manager):
+    saved = snippet_manager.save_snippet(make_snippet("a", description="d"))
+    snippet_manager.save_snippet(make_snippet("b"))
+    first, second = snippet_manager.list_snippets("SQL")
+
+    assert first.id == saved.id and first.name == "a" and first.description == "d"
+    assert first.type is second.type and first.extension is second.extension
+    assert first["name"] == "a" and "content" not in first
+    with pytest.raises(KeyError):
+        first["content"]
+    assert dict(first.replace(content="x")) == {**dict(first), "content": "x"}
@@ -0,0 +1,144 @@
+import time
+from PyQt6 import sip
+from PyQt6.QtCore import QEvent, QObject, Qt
+from PyQt6.QtGui import QKeyEvent
+from PyQt6.QtWidgets import QApplication, QPlainTextEdit, QWidget
+from src.data.snippet import Snippet
+from src.ui.snippet_popup import SnippetPopupManager
+
+
+class TimerCounter(QObject):
+    """Counts the timer events of a widget and its children"""
+
+    def __init__(self, widget):
+        super().__init__()
+        self.widget = widget
+        self.count = 0
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Timer:
+            while watched is not None:
+                if watched is self.widget:
+                    self.count += 1
+                    break
+                watched = watched.parent()
+        return False
+
+
+def open_popup(snippet_manager):
+    parent = QWidget()
+    parent.selected_snippet_type = None
+    parent.snippet_manager = snippet_manager
+    popup = SnippetPopupManager(parent)
+    popup.show()
+    return parent, popup
+
+
+def test_idle_popup_has_no_timers(qapp, snippet_manager):
+    flash_time = qapp.cursorFlashTime()
+    qapp.setCursorFlashTime(0)  # text cursors blink on a timer of their own
+    parent, popup = open_popup(snippet_manager)
+    counter = TimerCounter(popup)
+    qapp.installEventFilter(counter)
+    try:
+        deadline = time.monotonic() + 0.3
+        while time.monotonic() < deadline:
+            qapp.processEvents()
+            time.sleep(0.01)
+    finally:
+        qapp.removeEventFilter(counter)
+        qapp.setCursorFlashTime(flash_time)
+        popup.close()
+    assert counter.count == 0
+
+
+def test_modifiers_start_and_stop_tracking(qapp, snippet_manager):
+    parent, popup = open_popup(snippet_manager)
+    ctrl = Qt.KeyboardModifier.ControlModifier
+    shift = Qt.KeyboardModifier.ShiftModifier
+
+    # Key events reach the filter through the editor they are sent to
+    def key(event_type, key, modifiers):
+        QApplication.sendEvent(
+            popup.snippet_text_area, QKeyEvent(event_type, key, modifiers)
+        )
+
+    key(QEvent.Type.KeyPress, Qt.Key.Key_Control, Qt.KeyboardModifier.NoModifier)
+    assert popup.move_tracking and not popup.resize_tracking
+    key(QEvent.Type.KeyPress, Qt.Key.Key_Shift, ctrl)
+    assert popup.resize_tracking and not popup.move_tracking
+    key(QEvent.Type.KeyRelease, Qt.Key.Key_Shift, ctrl | shift)
+    assert popup.move_tracking
+    key(QEvent.Type.KeyRelease, Qt.Key.Key_Control, ctrl)
+    assert not popup.move_tracking and popup.last_pos is None
+
+    # Keys typed in the main window are not seen
+    QApplication.sendEvent(
+        parent,
+        QKeyEvent(QEvent.Type.KeyPress, Qt.Key.Key_Control, Qt.KeyboardModifier.NoModifier),
+    )
+    assert not popup.move_tracking
+    popup.close()
+
+
+def test_popup_is_rebound(qapp, snippet_manager):
+    parent, popup = open_popup(snippet_manager)
+    snippet = Snippet(
+        id=1, name="a", type="SQL", description="d", extension=".sql", content="select 1"
+    )
+    popup.bind_snippet(snippet)
+    document = popup.snippet_text_area.document()
+    assert popup.type_input.text() == "SQL"
+    assert popup.file_extension_label.currentText() == ".sql"
+    assert document.toPlainText() == "select 1"
+    assert popup.highlighter.document() is document
+
+    popup.close()
+    assert not sip.isdeleted(popup)
+    popup.bind_snippet(None, ".py")
+    assert popup.snippet_name_input.text() == ""
+    assert popup.file_extension_label.currentText() == ".py"
+    assert popup.snippet_text_area.document() is not document
+    assert popup.snippet_text_area.toPlainText() == ""
+    assert popup.highlighter is None
+    popup.close()
+
+
+def test_large_snippets_load_in_chunks(qapp, snippet_manager, monkeypatch):
+    monkeypatch.setattr(SnippetPopupManager, "LARGE_CONTENT_SIZE", 100)
+    monkeypatch.setattr(SnippetPopupManager, "LOAD_CHUNK_SIZE", 64)
+    parent, popup = open_popup(snippet_manager)
+    submitted = []
+    parent.reconciler = type("Reconciler", (), {"follow_snippet": None})
+    parent.data_worker = type(
+        "Worker", (), {"submit": lambda *args, **kwargs: submitted.append(args[1])}
+    )
+    content = "select 1;\n" * 30
+    snippet = Snippet(
+        id=1, name="a", type="SQL", description="", extension=".sql", content=content
+    )
+    popup.bind_snippet(snippet)
+    editor = popup.snippet_text_area
+    assert isinstance(editor, QPlainTextEdit)
+    assert editor.isReadOnly() and not popup.save_button.isEnabled()
+
+    while popup.loading is not None:
+        qapp.processEvents()
+    assert editor.toPlainText() == content
+    assert not editor.document().isModified()
+    assert popup.highlighter.document() is editor.document()
+
+    popup.save_snippet()
+    assert "Content" not in submitted[-1]
+
+    popup.bind_snippet(snippet)
+    while popup.loading is not None:
+        qapp.processEvents()
+    popup.snippet_text_area.appendPlainText("select 2;")
+    popup.save_snippet()
+    assert submitted[-1]["Content"] == content + "\nselect 2;"
+
+    popup.bind_snippet(snippet.replace(content="short"))
+    assert popup.snippet_text_area is popup.rich_text_area
+    assert popup.plain_text_area.toPlainText() == ""
+    popup.close()
@@ -0,0 +1,47 @@
+import pytest
+from src.data.usage_tracker import UsageTracker
+from tests.helpers import make_snippet
+
+
+def test_log_add_orders_like_decayed_usage():
+    day = 24 * 60 * 60
+    now = 100 * UsageTracker.HALF_LIFE
+
+    tracker = UsageTracker(None)
+    for used_at in (now - 30 * day, now - 29 * day, now - 28 * day):
+        tracker.record(1, used_at=used_at)
+    tracker.record(2, used_at=now - day)
+    old, recent = tracker._pending[1][1], tracker._pending[2][1]
+
+    # Three uses a month ago count for less than one yesterday
+    assert recent > old
+    assert recent == pytest.approx(UsageTracker.key_at(0, now - day))
+    assert UsageTracker.log_add(3.0, 3.0) == pytest.approx(4.0)
+
+
+def test_flushed_usage_orders_listings(snippet_manager):
+    ids = [
+        snippet_manager.save_snippet(make_snippet(name, content="select"))["id"]
+        for name in ("alpha", "beta", "gamma")
+    ]
+    snippet_manager.record_usage(ids[2])
+    snippet_manager.record_usage(ids[2])
+    snippet_manager.record_usage(ids[1], "edit")
+    snippet_manager.record_usage(ids[0])
+    snippet_manager.delete_snippet(ids[0])
+
+    # Nothing reaches the database before the flush
+    assert [s["name"] for s in snippet_manager.list_snippets("SQL")] == ["beta", "gamma"]
+    assert snippet_manager.flush_usage() == 2
+    assert len(snippet_manager.usage) == 0
+
+    assert [s["name"] for s in snippet_manager.list_snippets("SQL")] == ["gamma", "beta"]
+    assert [s["name"] for s in snippet_manager.perform_search("*select")] == [
+        "gamma",
+        "beta",
+    ]
+    usage = snippet_manager.db.read_rows("snippet_usage", "*", order="snippet_id")
+    assert [(row["snippet_id"], row["use_count"]) for row in usage] == [
+        (ids[1], 1),
+        (ids[2], 2),
+    ]